@@ -27,6 +27,7 @@ import yaml
 
 from babel.dates import format_date, format_datetime
 from datetime import datetime, timezone
+from hashlib import sha1
 from jinja2 import pass_context
 from jinja2.runtime import Context
 from mkdocs.config.defaults import MkDocsConfig
@@ -67,6 +68,16 @@ class BlogPlugin(BasePlugin[BlogConfig]):
         # Initialize temporary directory
         self.temp_dir = mkdtemp()
 
+        # Initialize caches for posts and readtime - the plugin is kept across
+        # rebuilds when serving, so only posts that changed since the previous
+        # build must be read and parsed again, keeping rebuilds snappy
+        self.cache: dict[str, tuple[tuple[int, int], tuple[str, dict]]] = {}
+        self.readtimes: dict[str, tuple[tuple[str, int], int]] = {}
+
+        # Initialize signatures of views, i.e., the posts and their versions,
+        # which are used to determine the views affected by a rebuild
+        self.signatures: dict[str, tuple] = {}
+
     # Determine whether we're serving the site
     def on_startup(self, *, command, dirty):
         self.is_serve = command == "serve"
@@ -156,6 +167,9 @@ class BlogPlugin(BasePlugin[BlogConfig]):
                 for page in self._generate_pages(view, config, files):
                     view.pages.append(page)
 
+        # Mark views that are affected by changed posts as modified
+        self._touch_views()
+
         # Ensure that entrypoint is always included in navigation
         self.blog.file.inclusion = InclusionLevel.INCLUDED
 
@@ -288,11 +302,21 @@ class BlogPlugin(BasePlugin[BlogConfig]):
         if page not in self.blog.posts:
             return
 
-        # Compute readtime of post, if enabled and not explicitly set
+        # Compute readtime of post, if enabled and not explicitly set - the
+        # readtime is cached, and only computed again if the HTML changed
         if self.config.post_readtime:
             words_per_minute = self.config.post_readtime_words_per_minute
             if not page.config.readtime:
-                page.config.readtime = readtime(html, words_per_minute)
+                key = sha1(html.encode("utf-8")).hexdigest(), words_per_minute
+
+                # Compute readtime, if not cached
+                entry = self.readtimes.get(page.file.abs_src_path)
+                if not entry or entry[0] != key:
+                    entry = key, readtime(html, words_per_minute)
+                    self.readtimes[page.file.abs_src_path] = entry
+
+                # Assign readtime to post
+                page.config.readtime = entry[1]
 
     # Register template filters for plugin
     def on_env(self, env, *, config, files):
@@ -401,7 +425,17 @@ class BlogPlugin(BasePlugin[BlogConfig]):
     # Resolve post - the caller must make sure that the given file points to an
     # actual post (and not a page), or behavior might be unpredictable
     def _resolve_post(self, file: File, config: MkDocsConfig):
-        post = Post(file, config)
+        stat = os.stat(file.abs_src_path)
+        stamp = stat.st_mtime_ns, stat.st_size
+
+        # Use cached contents and metadata, if the post didn't change since
+        # the previous build, and cache them otherwise
+        cached = self.cache.get(file.abs_src_path)
+        if cached and cached[0] == stamp:
+            post = Post(file, config, cached[1])
+        else:
+            post = Post(file, config)
+            self.cache[file.abs_src_path] = stamp, post.source
 
         # Compute path and create a temporary file for path resolution
         path = self._format_path_for_post(post, config)
@@ -429,10 +463,14 @@ class BlogPlugin(BasePlugin[BlogConfig]):
             os.makedirs(name, exist_ok = True)
 
         # Filter posts from pages
+        paths: set[str] = set()
         for file in files.documentation_pages():
             if not file.src_path.startswith(path):
                 continue
 
+            # Remember post, so we can remove deleted posts from the cache
+            paths.add(file.abs_src_path)
+
             # Temporarily remove post from navigation
             file.inclusion = InclusionLevel.EXCLUDED
 
@@ -444,6 +482,12 @@ class BlogPlugin(BasePlugin[BlogConfig]):
             if not self._is_excluded(post):
                 yield post
 
+        # Remove deleted posts from the caches
+        for path in set(self.cache) - paths:
+            del self.cache[path]
+        for path in set(self.readtimes) - paths:
+            del self.readtimes[path]
+
     # Resolve authors - check if there's an authors file at the configured
     # location, and if one was found, load and validate it
     def _resolve_authors(self, config: MkDocsConfig):
@@ -596,8 +640,11 @@ class BlogPlugin(BasePlugin[BlogConfig]):
                 files.append(file)
 
                 # Copy file to temporary directory  and temporarily remove
-                # from navigation, as we'll add it at a specific location
-                copy_file(view.file.abs_src_path, file.abs_src_path)
+                # from navigation, as we'll add it at a specific location -
+                # the file is only copied if the view changed, so it's not
+                # considered modified on every rebuild when serving
+                if self._is_outdated(file.abs_src_path, view.file.abs_src_path):
+                    copy_file(view.file.abs_src_path, file.abs_src_path)
                 file.inclusion = InclusionLevel.EXCLUDED
 
             # Create and yield view
@@ -609,6 +656,31 @@ class BlogPlugin(BasePlugin[BlogConfig]):
             file.page.pages = view.pages
             file.page.posts = view.posts
 
+    # Mark views as modified, if their posts changed since the previous build -
+    # files of views are only written when their contents change, so views that
+    # are not affected by changed posts are skipped on dirty rebuilds
+    def _touch_views(self):
+        signatures: dict[str, tuple] = {}
+        for view in self._resolve_views(self.blog):
+            signature = tuple(
+                (post.file.src_uri, self.cache[post.file.abs_src_path][0])
+                    for post in view.posts
+            )
+
+            # Mark view and its pages as modified, if the signature changed -
+            # note that the entrypoint is part of the docs directory
+            for page in view.pages or [view]:
+                path = page.file.abs_src_path
+                if self.signatures.get(path) != signature:
+                    if path.startswith(self.temp_dir):
+                        os.utime(path)
+
+                # Remember signature of view
+                signatures[path] = signature
+
+        # Replace signatures of previous build
+        self.signatures = signatures
+
     # -------------------------------------------------------------------------
 
     # Attach a list of pages to each other and to the given parent item without
@@ -681,9 +753,11 @@ class BlogPlugin(BasePlugin[BlogConfig]):
         # Return posts and pagination
         return posts, pagination
 
-    # Render excerpt in the context of the given view
+    # Render excerpt in the context of the given view - the excerpt is only
+    # rendered once, and then relocated to each view it's included in
     def _render_post(self, excerpt: Excerpt, view: View):
-        excerpt.render(view, self.config.post_excerpt_separator)
+        excerpt.render(self.config.post_excerpt_separator)
+        excerpt = excerpt.relocate(view)
 
         # Determine whether to add posts to the table of contents of the view -
         # note that those settings can be changed individually for each type of
@@ -846,8 +920,23 @@ class BlogPlugin(BasePlugin[BlogConfig]):
         # Return file
         return file
 
-    # Create a file with the given content on disk
+    # Check if the given file doesn't exist or is older than the given source
+    def _is_outdated(self, path: str, source: str):
+        if not os.path.isfile(path):
+            return True
+
+        # Compare modification times
+        return os.path.getmtime(path) < os.path.getmtime(source)
+
+    # Create a file with the given content on disk, if the content changed, so
+    # the modification time of unchanged files is retained across rebuilds
     def _save_to_file(self, path: str, content: str):
+        if os.path.isfile(path):
+            with open(path, encoding = "utf-8") as f:
+                if f.read() == content:
+                    return
+
+        # Create directories and write file
         os.makedirs(os.path.dirname(path), exist_ok = True)
         with open(path, "w", encoding = "utf-8") as f:
             f.write(content)
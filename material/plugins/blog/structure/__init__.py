@@ -22,9 +22,10 @@ from __future__ import annotations
 
 import logging
 import os
+import re
 import yaml
 
-from copy import copy
+from copy import copy, deepcopy
 from markdown import Markdown
 from material.plugins.blog.author import Author
 from mkdocs.config.defaults import MkDocsConfig
@@ -33,12 +34,16 @@ from mkdocs.structure.files import File, Files
 from mkdocs.structure.nav import Section
 from mkdocs.structure.pages import Page, _RelativePathTreeprocessor
 from mkdocs.structure.toc import get_toc
+from mkdocs.utils import get_relative_url
 from mkdocs.utils.meta import YAML_RE
 from re import Match
 from yaml import SafeLoader
 
 from .config import PostConfig
-from .markdown import ExcerptTreeprocessor
+from .markdown import (
+    ExcerptTreeprocessor, RelocationTreeprocessor,
+    relocation_end, relocation_start
+)
 
 # -----------------------------------------------------------------------------
 # Classes
@@ -48,24 +53,36 @@ from .markdown import ExcerptTreeprocessor
 class Post(Page):
 
     # Initialize post - posts are never listed in the navigation, which is why
-    # they will never include a title that was manually set, so we can omit it
-    def __init__(self, file: File, config: MkDocsConfig):
+    # they will never include a title that was manually set, so we can omit it.
+    # The contents and metadata can be passed as source, if they were already
+    # read before, e.g., when serving, where unchanged posts are cached.
+    def __init__(
+        self, file: File, config: MkDocsConfig,
+        source: tuple[str, dict] | None = None
+    ):
         super().__init__(None, file, config)
 
         # Resolve path relative to docs directory
         docs = os.path.relpath(config.docs_dir)
         path = os.path.relpath(file.abs_src_path, docs)
 
-        # Read contents and metadata immediately
-        with open(file.abs_src_path, encoding = "utf-8-sig") as f:
-            self.markdown = f.read()
+        # Use contents and metadata from source, if given - the metadata is
+        # copied, as it's altered below and might be altered by other plugins
+        if source:
+            self.markdown, meta = source
+            self.meta = deepcopy(meta)
+
+        # Otherwise, read contents and metadata immediately
+        else:
+            with open(file.abs_src_path, encoding = "utf-8-sig") as f:
+                self.markdown = f.read()
 
             # Sadly, MkDocs swallows any exceptions that occur during parsing.
             # Since we want to provide the best possible user experience, we
-            # need to catch errors early and display them nicely. We decided to
-            # drop support for MkDocs' MultiMarkdown syntax, because it is not
-            # correctly implemented anyway. When using MultiMarkdown syntax, all
-            # date formats are returned as strings and list are not properly
+            # need to catch errors early and display them nicely. We decided
+            # to drop support for MkDocs' MultiMarkdown syntax, because it is
+            # not correctly implemented anyway. When using MultiMarkdown syntax,
+            # all date formats are returned as strings and list are not properly
             # supported. Thus, we just use the relevants parts of `get_data`.
             match: Match = YAML_RE.match(self.markdown)
             if not match:
@@ -79,14 +96,17 @@ class Post(Page):
                 self.meta = yaml.load(match.group(1), SafeLoader) or {}
                 self.markdown = self.markdown[match.end():].lstrip("\n")
 
-            # The post's metadata could not be parsed because of a syntax error,
-            # which we display to the author with a nice error message
+            # The post's metadata could not be parsed because of a syntax
+            # error, which we display to the author with a nice error message
             except Exception as e:
                 raise PluginError(
                     f"Error reading metadata of post '{path}' in '{docs}':\n"
                     f"{e}"
                 )
 
+        # Remember contents and metadata, so they can be cached by the caller
+        self.source = source or (self.markdown, deepcopy(self.meta))
+
         # Initialize post configuration, but remove all keys that this plugin
         # doesn't care about, or they will be reported as invalid configuration
         self.config: PostConfig = PostConfig(file.abs_src_path)
@@ -160,6 +180,10 @@ class Excerpt(Page):
         # posts inline or to provide a link to the post's page
         self.more = None
 
+        # Initialize rendered content and content after separator, which are
+        # shared across all views, and contain relocatable links
+        self.fragments: tuple[str, str | None] | None = None
+
         # Initialize parser - note that we need to patch the configuration,
         # more specifically the table of contents extension
         config = _patch(config)
@@ -171,7 +195,7 @@ class Excerpt(Page):
         # Register excerpt tree processor - this processor resolves anchors to
         # posts from within views, so they point to the correct location
         self.md.treeprocessors.register(
-            ExcerptTreeprocessor(post),
+            ExcerptTreeprocessor(post, self),
             "excerpt",
             0
         )
@@ -184,17 +208,26 @@ class Excerpt(Page):
             1
         )
 
-    # Render an excerpt of the post on the given page - note that this is not
-    # thread-safe because excerpts are shared across views, as it cuts down on
-    # the cost of initialization. However, if in the future, we decide to render
-    # posts and views concurrently, we must change this behavior.
-    def render(self, page: Page, separator: str):
-        self.file.url = page.url
+        # Register relocation tree processor - this processor marks all relative
+        # links after the processors above ran, so they can be relocated to views
+        self.md.treeprocessors.register(
+            RelocationTreeprocessor(),
+            "relocation",
+            -1
+        )
+
+    # Render excerpt of the post - excerpts are rendered only once relative to
+    # the root of the site, and not for every view they're included in, as the
+    # same post might be included in archive, category and pagination views.
+    # Links are marked, so they can be relocated to the views. Each excerpt has
+    # a dedicated parser, so different excerpts can be rendered concurrently.
+    def render(self, separator: str):
+        if self.fragments is not None:
+            return
 
-        # Retrieve excerpt tree processor and set page as base
-        at = self.md.treeprocessors.get_index_for_name("excerpt")
-        processor: ExcerptTreeprocessor = self.md.treeprocessors[at]
-        processor.base = page
+        # Render relative to the root of the site - the excerpt tree processor
+        # and relative path tree processor both compute links from the URL
+        self.file.url = ""
 
         # Ensure that the excerpt includes a title in its content, since the
         # title is linked to the post when rendering - see https://t.ly/5Gg2F
@@ -203,16 +236,28 @@ class Excerpt(Page):
             self.markdown = "\n\n".join([f"# {self.post.title}", self.markdown])
 
         # Convert Markdown to HTML and extract excerpt
-        self.content = self.md.convert(self.markdown)
-        self.content, *more = self.content.split(separator, 1)
-        if more:
-            self.more = more[0]
+        content, *more = self.md.convert(self.markdown).split(separator, 1)
+        self.fragments = content, more[0] if more else None
 
         # Extract table of contents and reset post URL - if we wouldn't reset
         # the excerpt URL, linking to the excerpt from the view would not work
         self.toc = get_toc(getattr(self.md, "toc_tokens", []))
         self.file.url = self.post.url
 
+    # Relocate excerpt to the given page, returning a copy of the excerpt that
+    # has all links in its content resolved relative to the page
+    def relocate(self, page: Page):
+        excerpt = copy(self)
+
+        # Relocate rendered content and content after separator
+        content, more = self.fragments
+        excerpt.content = _relocate(content, page)
+        if more is not None:
+            excerpt.more = _relocate(more, page)
+
+        # Return relocated excerpt
+        return excerpt
+
 # -----------------------------------------------------------------------------
 
 # View
@@ -261,6 +306,24 @@ class Category(View):
 # Helper functions
 # -----------------------------------------------------------------------------
 
+# Relocate all marked links in the given content to the given page - links are
+# marked relative to the root of the site, which is the empty URL
+def _relocate(content: str, page: Page):
+    if relocation_start not in content:
+        return content
+
+    # Replace callback
+    def replace(match: Match):
+        path, rest = match.group("path"), match.group("rest")
+        if path == ".":
+            path = ""
+
+        # Compute link relative to the page
+        return get_relative_url(path, page.url) + rest
+
+    # Replace all marked links
+    return relocation_expr.sub(replace, content)
+
 # Patch configuration
 def _patch(config: MkDocsConfig):
     config = copy(config)
@@ -304,3 +367,9 @@ def _patch(config: MkDocsConfig):
 
 # Set up logging
 log = logging.getLogger("mkdocs.material.blog")
+
+# Expression for marked links, split into path and query string or anchor
+relocation_expr = re.compile(
+    f"{relocation_start}(?P<path>[^?#{relocation_end}]*)"
+    f"(?P<rest>[^{relocation_end}]*){relocation_end}"
+)
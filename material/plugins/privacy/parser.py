@@ -18,24 +18,89 @@
 # FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS
 # IN THE SOFTWARE.
 
-from html.parser import HTMLParser
-from xml.etree.ElementTree import Element
+import re
+
+from html import unescape
 
 # -----------------------------------------------------------------------------
 # Classes
 # -----------------------------------------------------------------------------
 
-# Fragment parser - previously, we used lxml for fault-tolerant HTML5 parsing,
-# but it blows up the size of the Docker image by 20 MB. We can't just use the
-# built-in XML parser, as it doesn't handle HTML5 (because, yeah, it's not XML),
-# so we use a streaming parser and construct the element ourselves.
-class FragmentParser(HTMLParser):
+# Tag - an opening tag found in a document, together with the spans of its
+# attribute values, so replacement values can be spliced into the document
+# without re-serializing the tag
+class Tag:
+
+    # Initialize tag
+    def __init__(self, name: str, start: int, end: int):
+        self.name  = name
+        self.start = start
+        self.end   = end
+
+        # Attribute values and spans of attribute values in the document
+        self.attrs: dict[str, str] = {}
+        self.spans: dict[str, tuple[int, int]] = {}
+
+    # Retrieve attribute value
+    def get(self, name: str, default: str | None = None):
+        return self.attrs.get(name, default)
+
+# -----------------------------------------------------------------------------
+# Functions
+# -----------------------------------------------------------------------------
+
+# Find all opening tags with the given names that reference an external URL -
+# previously, we used lxml for fault-tolerant HTML5 parsing, and then a fragment
+# parser that built an element for every match, which was serialized again for
+# replacement. Now, the document is tokenized in a single pass, and only the
+# attributes of tags that contain a URL are tokenized, which keeps processing
+# of pages linear and doesn't allocate anything for all other tags.
+def iter_tags(html: str, names: set[str]):
+    for match in tag_expr.finditer(html):
+        name = match.group("name").lower()
+        if name not in names:
+            continue
+
+        # Skip tags that don't contain any external URL
+        start, end = match.span("attrs")
+        if html.find("http", start, end) == -1:
+            continue
+
+        # Tokenize attributes, and record values and spans - attribute values
+        # are unescaped, as done by the HTML parser, as they might include
+        # entities, e.g., ampersands in query strings
+        tag = Tag(name, match.start(), match.end())
+        for attr in attr_expr.finditer(html, start, end):
+            key = attr.group("key").lower()
+            for group in ("dq", "sq", "uq"):
+                if attr.group(group) is not None:
+                    tag.attrs[key] = unescape(attr.group(group))
+                    tag.spans[key] = attr.span(group)
+                    break
+
+            # Attribute without value, i.e., boolean attribute
+            else:
+                tag.attrs[key] = ""
+
+        # Return tag
+        yield tag
+
+# -----------------------------------------------------------------------------
+# Data
+# -----------------------------------------------------------------------------
 
-    # Initialize parser
-    def __init__(self):
-        super().__init__(convert_charrefs = True)
-        self.result = None
+# Opening tag expression for all elements that might reference external assets
+# - quoted attribute values are matched as a whole, as they might contain `>`
+# characters. All alternatives start with a different character, so matching
+# never backtracks, even for unterminated quotes.
+tag_expr = re.compile(
+    r"<(?P<name>image|img|link|script)(?=[\s/>])"
+    r"(?P<attrs>(?:[^>\"']|\"[^\"]*\"|'[^']*')*)>",
+    re.I
+)
 
-    # Create element
-    def handle_starttag(self, tag, attrs):
-        self.result = Element(tag, dict(attrs))
+# Attribute expression
+attr_expr = re.compile(
+    r"(?P<key>[^\s\"'>/=]+)"
+    r"(?:\s*=\s*(?:\"(?P<dq>[^\"]*)\"|'(?P<sq>[^']*)'|(?P<uq>[^\s>]+)))?"
+)
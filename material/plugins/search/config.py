@@ -18,6 +18,8 @@
 # FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS
 # IN THE SOFTWARE.
 
+import os
+
 from mkdocs.config.config_options import (
     Choice,
     Deprecated,
@@ -42,12 +44,21 @@ pipeline = ("stemmer", "stopWordFilter", "trimmer")
 # Search plugin configuration
 class SearchConfig(Config):
     enabled = Type(bool, default = True)
+    concurrency = Type(int, default = max(1, os.cpu_count() - 1))
+
+    # Settings for caching
+    cache = Type(bool, default = True)
+    cache_dir = Type(str, default = ".cache/plugin/search")
 
     # Settings for search
     lang = Optional(LangOption())
     separator = Optional(Type(str))
     pipeline = Optional(ListOfItems(Choice(pipeline)))
 
+    # Settings for prebuilt index artifacts
+    compress = Type(bool, default = False)
+    text_limit = Optional(Type(int))
+
     # Settings for text segmentation (Chinese)
     jieba_dict = Optional(Type(str))
     jieba_dict_user = Optional(Type(str))
@@ -18,11 +18,14 @@
 # FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS
 # IN THE SOFTWARE.
 
+import gzip
 import json
 import logging
 import os
 import regex as re
 
+from concurrent.futures import ProcessPoolExecutor
+from hashlib import sha1
 from html import escape
 from html.parser import HTMLParser
 from mkdocs import utils
@@ -35,6 +38,11 @@ try:
 except ImportError:
     jieba = None
 
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
 # -----------------------------------------------------------------------------
 # Classes
 # -----------------------------------------------------------------------------
@@ -50,7 +58,8 @@ class SearchPlugin(BasePlugin[SearchConfig]):
         self.is_dirty = False
         self.is_dirtyreload = False
 
-        # Initialize search index cache
+        # Initialize search index and search index cache
+        self.search_index = None
         self.search_index_prev = None
 
     # Determine whether we're serving the site
@@ -80,15 +89,27 @@ class SearchPlugin(BasePlugin[SearchConfig]):
                 r"\s*,\s*", self._translate(config, "search.config.pipeline")
             )))
 
-        # Initialize search index
+        # Initialize search index, reusing the process pool of the previous
+        # build, if any, as starting processes is expensive
+        pool = self.search_index.pool if self.search_index else None
         self.search_index = SearchIndex(**self.config)
+        self.search_index.pool = pool
+
+        # Load cached section entries from previous builds, so only pages with
+        # changed content need to be parsed again
+        if self.config.cache:
+            self.search_index.load_cache(self.config.cache_dir)
+
+        # Skip segmentation if jieba is not available
+        if not jieba:
+            return
 
         # Set jieba dictionary, if given
+        dictionary = None
         if self.config.jieba_dict:
             path = os.path.normpath(self.config.jieba_dict)
             if os.path.isfile(path):
-                jieba.set_dictionary(path)
-                log.debug(f"Loading jieba dictionary: {path}")
+                dictionary = path
             else:
                 log.warning(
                     f"Configuration error for 'search.jieba_dict': "
@@ -96,17 +117,23 @@ class SearchPlugin(BasePlugin[SearchConfig]):
                 )
 
         # Set jieba user dictionary, if given
+        dictionary_user = None
         if self.config.jieba_dict_user:
             path = os.path.normpath(self.config.jieba_dict_user)
             if os.path.isfile(path):
-                jieba.load_userdict(path)
-                log.debug(f"Loading jieba user dictionary: {path}")
+                dictionary_user = path
             else:
                 log.warning(
                     f"Configuration error for 'search.jieba_dict_user': "
                     f"'{self.config.jieba_dict_user}' does not exist."
                 )
 
+        # Load dictionaries, and pass them to the search index, as Chinese
+        # characters are segmented where pages are parsed, i.e., also in the
+        # processes of the pool, which must load the dictionaries themselves
+        self.search_index.segment = (dictionary, dictionary_user)
+        setup_jieba(*self.search_index.segment)
+
     # Add page to search index
     def on_page_context(self, context, *, page, config, nav):
         if not self.config.enabled:
@@ -129,20 +156,49 @@ class SearchPlugin(BasePlugin[SearchConfig]):
         base = os.path.join(config.site_dir, "search")
         path = os.path.join(base, "search_index.json")
 
+        # Reconcile concurrent jobs - the process pool is kept for subsequent
+        # builds when serving, and shut down when MkDocs shuts down
+        self.search_index.reconcile()
+
         # Generate and write search index to file
         data = self.search_index.generate_search_index(self.search_index_prev)
         utils.write_file(data.encode("utf-8"), path)
 
+        # Write precompressed variants of search index
+        if self.config.compress:
+            self._write_compressed(path, data.encode("utf-8"))
+
         # Persist search index for repeated invocation
         if self.is_dirty:
             self.search_index_prev = self.search_index
 
+        # Persist section entries for subsequent builds
+        if self.config.cache:
+            self.search_index.save_cache(self.config.cache_dir)
+
     # Determine whether we're running under dirty reload
     def on_serve(self, server, *, config, builder):
         self.is_dirtyreload = self.is_dirty
 
+    # Shut down process pool on build errors, so no processes are leaked
+    def on_build_error(self, *, error):
+        if self.search_index:
+            self.search_index.shutdown()
+
+    # Shut down process pool when MkDocs shuts down
+    def on_shutdown(self):
+        if self.search_index:
+            self.search_index.shutdown()
+
     # -------------------------------------------------------------------------
 
+    # Write gzip and brotli compressed variants next to the given file, which
+    # web servers can serve directly, e.g., via nginx's gzip_static
+    def _write_compressed(self, path, data):
+        utils.write_file(gzip.compress(data, mtime = 0), f"{path}.gz")
+        if brotli:
+            utils.write_file(brotli.compress(data), f"{path}.br")
+
     # Translate the given placeholder value
     def _translate(self, config, value):
         env = config.theme.get_env()
@@ -160,7 +216,26 @@ class SearchIndex:
     # Initialize search index
     def __init__(self, **config):
         self.config = config
-        self.entries = []
+
+        # Section entries and content hashes, keyed by page URL
+        self.pages = {}
+        self.hashes = {}
+
+        # Section entries from previous builds, keyed by page URL
+        self.cache = {}
+
+        # Process pool and concurrent jobs, keyed by page URL - a job is the
+        # page content until the pool is started, and a future afterwards
+        self.pool = None
+        self.pool_jobs = {}
+
+        # Dictionaries for segmentation of Chinese characters, if enabled
+        self.segment = None
+
+    # Retrieve all section entries
+    @property
+    def entries(self):
+        return [entry for entries in self.pages.values() for entry in entries]
 
     # Add page to search index
     def add_entry_from_context(self, page):
@@ -168,19 +243,73 @@ class SearchIndex:
         if search.get("exclude"):
             return
 
-        # Divide page content into sections
-        parser = Parser()
-        parser.feed(page.content)
-        parser.close()
+        # Reuse cached section entries if the page didn't change
+        hash = self._hash_page(page)
+        cached = self.cache.get(page.url)
+        if cached and cached["hash"] == hash:
+            self.pages[page.url] = cached["entries"]
+            self.hashes[page.url] = hash
+            return
 
-        # Add sections to index
-        for section in parser.data:
-            if not section.is_excluded():
-                self.create_entry_for_section(section, page.toc, page.url, page)
+        # Reserve slot for page, so the order of pages is retained
+        self.pages[page.url] = []
+        self.hashes[page.url] = hash
 
-    # Override: graceful indexing and additional fields
+        # Divide page content into sections and add them to index, unless
+        # pages are parsed concurrently
+        if self.config.get("concurrency", 1) <= 1:
+            self.add_sections(parse_sections(page.content, self.segment), page)
+            return
+
+        # Defer parsing of all pages until more than the threshold need it, as
+        # the process pool only pays off its start-up cost for larger builds.
+        # Once started, all deferred pages are submitted at once - otherwise,
+        # they're parsed serially in reconcile after the last page was added.
+        self.pool_jobs[page.url] = (page.content, page)
+        if not self.pool and len(self.pool_jobs) > pool_threshold:
+            self.pool = ProcessPoolExecutor(self.config["concurrency"])
+
+        # Spawn concurrent jobs to divide page content into sections, which
+        # are reconciled before the search index is generated
+        if self.pool:
+            for url, (job, job_page) in self.pool_jobs.items():
+                if isinstance(job, str):
+                    future = self.pool.submit(
+                        parse_sections, job, self.segment
+                    )
+                    self.pool_jobs[url] = (future, job_page)
+
+    # Add sections of page to search index
+    def add_sections(self, sections, page):
+        toc = self._index_toc(page.toc)
+        for section in sections:
+            self.create_entry_for_section(section, toc, page.url, page)
+
+    # Reconcile concurrent jobs, adding the sections of all parsed pages -
+    # deferred pages are parsed now, if the process pool was never started
+    def reconcile(self):
+        for job, page in self.pool_jobs.values():
+            if isinstance(job, str):
+                self.add_sections(parse_sections(job, self.segment), page)
+            else:
+                self.add_sections(job.result(), page)
+
+        # Clear concurrent jobs
+        self.pool_jobs.clear()
+
+    # Shut down process pool, cancelling pending jobs
+    def shutdown(self):
+        if self.pool:
+            self.pool.shutdown(cancel_futures = True)
+            self.pool = None
+
+        # Clear concurrent jobs
+        self.pool_jobs.clear()
+
+    # Override: graceful indexing and additional fields - the table of contents
+    # is given as a mapping of anchors to items, see _index_toc
     def create_entry_for_section(self, section, toc, url, page):
-        item = self._find_toc_by_id(toc, section.id)
+        item = toc.get(section.id)
         if item:
             url = url + item.url
         elif section.id:
@@ -191,17 +320,16 @@ class SearchIndex:
         # if a page title was set via front matter, use that even though a h1
         # might be given or the page name was specified in nav in mkdocs.yml
         if not section.title:
-            section.title = [str(page.meta.get("title", page.title))]
+            title = str(page.meta.get("title", page.title)).strip()
+            if self.segment:
+                title = segment_chinese(title)
+            section.title = [title]
 
-        # Compute title and text
+        # Compute title and text - Chinese characters were already segmented
+        # when the page was parsed, see parse_sections
         title = "".join(section.title).strip()
         text  = "".join(section.text).strip()
 
-        # Segment Chinese characters if jieba is available
-        if jieba:
-            title = self._segment_chinese(title)
-            text  = self._segment_chinese(text)
-
         # Create entry for section
         entry = {
             "location": url,
@@ -223,7 +351,7 @@ class SearchIndex:
             entry["boost"] = search["boost"]
 
         # Add entry to index
-        self.entries.append(entry)
+        self.pages.setdefault(page.url, []).append(entry)
 
     # Generate search index
     def generate_search_index(self, prev):
@@ -235,32 +363,15 @@ class SearchIndex:
         # Hack: if we're running under dirty reload, the search index will only
         # include the entries for the current page. However, MkDocs > 1.4 allows
         # us to persist plugin state across rebuilds, which is exactly what we
-        # do by passing the previously built index to this method. Thus, we just
-        # remove the previous entries for the current page, and append the new
-        # entries to the end of the index, as order doesn't matter.
-        if prev and self.entries:
-            path = self.entries[0]["location"]
-
-            # Since we're sure that we're running under dirty reload, the list
-            # of entries will only contain sections for a single page. Thus, we
-            # use the first entry to remove all entries from the previous run
-            # that belong to the current page. The rationale behind this is that
-            # authors might add or remove section headers, so we need to make
-            # sure that sections are synchronized correctly.
-            entries = [
-                entry for entry in prev.entries
-                    if not entry["location"].startswith(path)
-            ]
-
-            # Merge previous with current entries
-            self.entries = entries + self.entries
-
-        # Otherwise just set previous entries
-        if prev and not self.entries:
-            self.entries = prev.entries
+        # do by passing the previously built index to this method. Since entries
+        # are grouped by page, we just replace the entries of all pages that
+        # were rebuilt, as authors might add or remove section headers.
+        if prev:
+            self.pages = { **prev.pages, **self.pages }
+            self.hashes = { **prev.hashes, **self.hashes }
 
         # Return search index as JSON
-        data = { "config": config, "docs": self.entries }
+        data = { "config": config, "docs": self._trim(self.entries) }
         return json.dumps(
             data,
             separators = (",", ":"),
@@ -269,38 +380,171 @@ class SearchIndex:
 
     # -------------------------------------------------------------------------
 
-    # Retrieve item for anchor
-    def _find_toc_by_id(self, toc, id):
-        for toc_item in toc:
-            if toc_item.id == id:
-                return toc_item
+    # Load section entries from cache
+    def load_cache(self, cache_dir):
+        path = os.path.join(cache_dir, "search_index.json")
+        if not os.path.isfile(path):
+            return
 
-            # Recurse into children of item
-            toc_item = self._find_toc_by_id(toc_item.children, id)
-            if toc_item is not None:
-                return toc_item
+        # Ignore corrupted or incompatible cache files
+        try:
+            with open(path, encoding = "utf-8") as f:
+                self.cache = json.load(f)
+        except (OSError, ValueError):
+            log.debug(f"Ignoring invalid search index cache: {path}")
+            self.cache = {}
+
+    # Save section entries to cache
+    def save_cache(self, cache_dir):
+        path = os.path.join(cache_dir, "search_index.json")
+        os.makedirs(cache_dir, exist_ok = True)
+
+        # Only persist pages that are part of the current build, so entries of
+        # deleted pages don't accumulate in the cache
+        data = {
+            url: { "hash": self.hashes[url], "entries": entries }
+                for url, entries in self.pages.items()
+                    if url in self.hashes
+        }
+        with open(path, "w", encoding = "utf-8") as f:
+            json.dump(data, f, separators = (",", ":"), default = str)
+
+    # Trim section text to the configured limit, if any
+    def _trim(self, entries):
+        limit = self.config.get("text_limit")
+        if limit is None:
+            return entries
+
+        # Cut text at the last word boundary within the limit, and remove any
+        # markup or entity that was cut in half, as the text is rendered as HTML
+        trimmed = []
+        for entry in entries:
+            text = entry["text"]
+            if len(text) > limit:
+                text = text[:limit].rsplit(" ", 1)[0] if limit else ""
+                text = re.sub(r"(<[^>]*|&[#\w]*)$", "", text)
+                text = self._close(text)
+            trimmed.append({ **entry, "text": text })
+
+        # Return trimmed entries
+        return trimmed
+
+    # Close all elements that are left open in the given markup, e.g., when
+    # text was cut inside of a code block or an emphasis
+    def _close(self, text):
+        stack = []
+        for match in re.finditer(r"<(/?)([a-zA-Z][\w-]*)[^>]*>", text):
+            closing, tag = match.group(1), match.group(2).lower()
+            if tag in void or match.group(0).endswith("/>"):
+                continue
+
+            # Push opened elements, and pop them when they're closed
+            if not closing:
+                stack.append(tag)
+            elif tag in stack:
+                del stack[len(stack) - 1 - stack[::-1].index(tag):]
+
+        # Append closing tags for elements left open, innermost first
+        return text + "".join(f"</{tag}>" for tag in reversed(stack))
+
+    # Compute hash of everything that section entries of a page depend on
+    def _hash_page(self, page):
+        search = page.meta.get("search") or {}
+        return sha1("\0".join([
+            page.content,
+            str(page.meta.get("title", page.title)),
+            json.dumps(page.meta.get("tags"), default = str),
+            json.dumps(search.get("boost"), default = str),
+            str(bool(jieba)),
+            str(self.config.get("jieba_dict")),
+            str(self.config.get("jieba_dict_user"))
+        ]).encode("utf-8")).hexdigest()
 
-        # No item found
-        return None
+    # -------------------------------------------------------------------------
 
-    # Find and segment Chinese characters in string
-    def _segment_chinese(self, data):
-        expr = re.compile(r"(\p{IsHan}+)", re.UNICODE)
+    # Map anchors to items of table of contents - if anchors are not unique,
+    # the first item in document order takes precedence
+    def _index_toc(self, toc, items = None):
+        if items is None:
+            items = {}
 
-        # Replace callback
-        def replace(match):
-            value = match.group(0)
+        # Add items and recurse into children of each item
+        for toc_item in toc:
+            items.setdefault(toc_item.id, toc_item)
+            self._index_toc(toc_item.children, items)
 
-            # Replace occurrence in original string with segmented version and
-            # surround with zero-width whitespace for efficient indexing
-            return "".join([
-                "\u200b",
-                "\u200b".join(jieba.cut(value.encode("utf-8"))),
-                "\u200b",
-            ])
+        # Return mapping
+        return items
 
-        # Return string with segmented occurrences
-        return expr.sub(replace, data).strip("\u200b")
+# -----------------------------------------------------------------------------
+
+# Divide the given HTML into sections that are not excluded from search - this
+# function is defined at module level, so it can be run in a process pool.
+# If jieba dictionaries are given, Chinese characters in the title and text of
+# each section are segmented here, and not in the main process.
+def parse_sections(content, segment = None):
+    parser = Parser()
+    parser.feed(content)
+    parser.close()
+
+    # Collect sections
+    sections = [
+        section for section in parser.data
+            if not section.is_excluded()
+    ]
+
+    # Segment Chinese characters in title and text of sections
+    if segment:
+        setup_jieba(*segment)
+        for section in sections:
+            if section.title:
+                title = "".join(section.title).strip()
+                section.title = [segment_chinese(title)]
+            text = "".join(section.text).strip()
+            section.text = [segment_chinese(text)]
+
+    # Return sections
+    return sections
+
+# Load the given jieba dictionaries, unless they're already loaded - processes
+# of the pool don't share the state of the main process, so this is called by
+# every process before it segments text
+def setup_jieba(dictionary, dictionary_user):
+    global jieba_dicts
+    if jieba_dicts == (dictionary, dictionary_user):
+        return
+
+    # Set jieba dictionary, if given
+    if dictionary:
+        jieba.set_dictionary(dictionary)
+        log.debug(f"Loading jieba dictionary: {dictionary}")
+
+    # Set jieba user dictionary, if given
+    if dictionary_user:
+        jieba.load_userdict(dictionary_user)
+        log.debug(f"Loading jieba user dictionary: {dictionary_user}")
+
+    # Remember loaded dictionaries
+    jieba_dicts = (dictionary, dictionary_user)
+
+# Find and segment Chinese characters in string
+def segment_chinese(data):
+    expr = re.compile(r"(\p{IsHan}+)", re.UNICODE)
+
+    # Replace callback
+    def replace(match):
+        value = match.group(0)
+
+        # Replace occurrence in original string with segmented version and
+        # surround with zero-width whitespace for efficient indexing
+        return "".join([
+            "\u200b",
+            "\u200b".join(jieba.cut(value.encode("utf-8"))),
+            "\u200b",
+        ])
+
+    # Return string with segmented occurrences
+    return expr.sub(replace, data).strip("\u200b")
 
 # -----------------------------------------------------------------------------
 
@@ -560,6 +804,12 @@ class Parser(HTMLParser):
 # Set up logging
 log = logging.getLogger("mkdocs.material.search")
 
+# Number of pages that need to be parsed before a process pool is started
+pool_threshold = 32
+
+# Dictionaries of jieba loaded in the current process
+jieba_dicts = None
+
 # Tags that are self-closing
 void = set([
     "area",                            # Image map areas
@@ -18,8 +18,10 @@
 # FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS
 # IN THE SOFTWARE.
 
+import os
+
 from mkdocs.config.base import Config
-from mkdocs.config.config_options import Deprecated, Type
+from mkdocs.config.config_options import Choice, Deprecated, Optional, Type
 
 # -----------------------------------------------------------------------------
 # Classes
@@ -28,13 +30,21 @@ from mkdocs.config.config_options import Deprecated, Type
 # Social plugin configuration
 class SocialConfig(Config):
     enabled = Type(bool, default = True)
+    concurrency = Type(int, default = max(1, os.cpu_count() - 1))
+    process_pool = Type(bool, default = False)
     cache_dir = Type(str, default = ".cache/plugin/social")
+    fonts_dir = Optional(Type(str))
 
     # Settings for social cards
     cards = Type(bool, default = True)
     cards_dir = Type(str, default = "assets/images/social")
     cards_layout_options = Type(dict, default = {})
 
+    # Settings for social card encoding
+    cards_format = Choice(("png", "webp", "jpeg"), default = "png")
+    cards_quality = Type(int, default = 85)
+    cards_optimize = Type(bool, default = False)
+
     # Deprecated settings
     cards_color = Deprecated(
         option_type = Type(dict, default = {}),
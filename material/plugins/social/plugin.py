@@ -32,13 +32,14 @@
 # -----------------------------------------------------------------------------
 
 import concurrent.futures
-import functools
+import json
 import logging
 import os
 import posixpath
 import re
 import requests
 import sys
+import threading
 
 from collections import defaultdict
 from hashlib import md5
@@ -78,6 +79,11 @@ class SocialPlugin(BasePlugin[SocialConfig]):
 
     def __init__(self):
         self._executor = concurrent.futures.ThreadPoolExecutor(4)
+        self._process_pool = None
+
+        # Initialize card manifest and documentation pages
+        self.manifest = {}
+        self.pages = set()
 
     # Retrieve configuration
     def on_config(self, config):
@@ -102,6 +108,13 @@ class SocialPlugin(BasePlugin[SocialConfig]):
                 + "\n\n--> Check out the troubleshooting guide: https://t.ly/MfX6u"
             )
 
+        # Check encoding quality, as Pillow doesn't validate it for all formats
+        if not 1 <= self.config.cards_quality <= 100:
+            raise PluginError(
+                f"Configuration error for 'social.cards_quality': expected "
+                f"a value between 1 and 100, got {self.config.cards_quality}"
+            )
+
         # Move color options
         if self.config.cards_color:
 
@@ -156,12 +169,43 @@ class SocialPlugin(BasePlugin[SocialConfig]):
             "text": options.get("color", self.color["text"])
         }
 
+        # Initialize thread pool
+        self._executor.shutdown()
+        self._executor = concurrent.futures.ThreadPoolExecutor(
+            self.config.concurrency
+        )
+
         # Retrieve logo and font
         self._resized_logo_promise = self._executor.submit(self._load_resized_logo, config)
         self.font = self._load_font(config)
 
+        # Compute fingerprint of all inputs of the card layout, so changing the
+        # fonts, logo, colors or layout options invalidates all cached cards
+        self.fingerprint = self._compute_fingerprint(config)
+        self.renderer = None
+
+        # Load card manifest, mapping pages to cached cards
+        self.manifest = {}
+        path = os.path.join(self.cache, "manifest.json")
+        if os.path.isfile(path):
+            try:
+                with open(path, encoding = "utf-8") as f:
+                    self.manifest = json.load(f)
+            except ValueError:
+                log.debug(f"Ignoring invalid social card manifest: {path}")
+
         self._image_promises = []
 
+    # Remember documentation pages, to evict cards of deleted pages
+    def on_files(self, files, *, config):
+        if not self.config.cards:
+            return
+
+        # Collect source URIs of all documentation pages
+        self.pages = set(
+            file.src_uri for file in files.documentation_pages()
+        )
+
     # Create social cards
     def on_page_content(self, html, page, config, files):
         if not self.config.cards:
@@ -172,11 +216,12 @@ class SocialPlugin(BasePlugin[SocialConfig]):
         file, _ = os.path.splitext(page.file.src_path)
 
         # Resolve path of image
-        path = "{}.png".format(os.path.join(
+        extension, _, _ = formats[self.config.cards_format]
+        path = "{}{}".format(os.path.join(
             config.site_dir,
             directory,
             file
-        ))
+        ), extension)
 
         # Resolve path of image directory
         directory = os.path.dirname(path)
@@ -210,15 +255,17 @@ class SocialPlugin(BasePlugin[SocialConfig]):
 
         # Generate social card if not in cache
         hash = md5("".join([
+            self.fingerprint,
             site_name,
             str(title),
             description
         ]).encode("utf-8"))
-        file = os.path.join(self.cache, f"{hash.hexdigest()}.png")
+        file = os.path.join(self.cache, f"{hash.hexdigest()}{extension}")
+        self.manifest[page.file.src_uri] = os.path.basename(file)
         self._image_promises.append(self._executor.submit(
             self._cache_image,
             cache_path = file, dest_path = path,
-            render_function = lambda: self._render_card(site_name, title, description)
+            render_args = (site_name, title, description)
         ))
 
         # Inject meta tags into page
@@ -233,104 +280,105 @@ class SocialPlugin(BasePlugin[SocialConfig]):
         for promise in self._image_promises:
             promise.result()
 
-    # -------------------------------------------------------------------------
-
-    # Render image to cache (if not present), then copy from cache to site
-    def _cache_image(self, cache_path, dest_path, render_function):
-        if not os.path.isfile(cache_path):
-            image = render_function()
-            image.save(cache_path)
-
-        # Copy file from cache
-        copyfile(cache_path, dest_path)
-
-    @functools.lru_cache(maxsize=None)
-    def _get_font(self, kind, size):
-        return ImageFont.truetype(self.font[kind], size)
-
-    # Render social card
-    def _render_card(self, site_name, title, description):
-        # Render background and logo
-        image = self._render_card_background((1200, 630), self.color["fill"])
-        image.alpha_composite(
-            self._resized_logo_promise.result(),
-            (1200 - 228, 64 - 4)
-        )
-
-        # Render site name
-        font = self._get_font("Bold", 36)
-        image.alpha_composite(
-            self._render_text((826, 48), font, site_name, 1, 20),
-            (64 + 4, 64)
-        )
-
-        # Render page title
-        font = self._get_font("Bold", 92)
-        image.alpha_composite(
-            self._render_text((826, 328), font, title, 3, 30),
-            (64, 160)
-        )
+        # Shut down process pool, if any
+        if self._process_pool:
+            self._process_pool.shutdown()
+            self._process_pool = None
 
-        # Render page description
-        font = self._get_font("Regular", 28)
-        image.alpha_composite(
-            self._render_text((826, 80), font, description, 2, 14),
-            (64 + 4, 512)
+        # Remove cards of deleted pages from manifest and persist it
+        self.manifest = {
+            page: name for page, name in self.manifest.items()
+                if page in self.pages
+        }
+        write_file(
+            json.dumps(self.manifest, indent = 2, sort_keys = True).encode("utf-8"),
+            os.path.join(self.cache, "manifest.json")
         )
 
-        # Return social card image
-        return image
-
-    # Render social card background
-    def _render_card_background(self, size, fill):
-        return Image.new(mode = "RGBA", size = size, color = fill)
+        # Evict cached cards that are not referenced by the manifest anymore
+        referenced = set(self.manifest.values())
+        for name in os.listdir(self.cache):
+            _, extension = os.path.splitext(name)
+            if extension in extensions and name not in referenced:
+                os.remove(os.path.join(self.cache, name))
 
-    @functools.lru_cache(maxsize=None)
-    def _tmp_context(self):
-        image = Image.new(mode = "RGBA", size = (50, 50))
-        return ImageDraw.Draw(image)
+    # -------------------------------------------------------------------------
 
-    @functools.lru_cache(maxsize=None)
-    def _text_bounding_box(self, text, font):
-        return self._tmp_context().textbbox((0, 0), text, font = font)
+    # Render image to cache (if not present), then copy from cache to site
+    def _cache_image(self, cache_path, dest_path, render_args):
+        if not os.path.isfile(cache_path):
+            renderer = self._get_renderer()
 
-    # Render social card text
-    def _render_text(self, size, font, text, lmax, spacing = 0):
-        width = size[0]
-        lines, words = [], []
+            # Render in process pool, if enabled, as text drawing is CPU-bound
+            if self._process_pool:
+                self._process_pool.submit(
+                    _render_card_to_file, cache_path, *render_args
+                ).result()
+            else:
+                renderer.render_to_file(cache_path, *render_args)
+
+        # Link or copy file from cache
+        _link_or_copy(cache_path, dest_path)
+
+    # Retrieve card renderer, creating it (and the process pool) on first use,
+    # as the logo is loaded concurrently
+    def _get_renderer(self):
+        with _renderer_lock:
+            if self.renderer:
+                return self.renderer
+
+            # Create card renderer
+            self.renderer = CardRenderer(
+                self.font,
+                self.color,
+                self._resized_logo_promise.result(),
+                self._encoding()
+            )
 
-        # Remove remnant HTML tags and convert HTML entities
-        text = re.sub(r"(<[^>]+>)", "", text)
-        text = unescape(text)
+            # Create process pool, initializing each process with the renderer,
+            # so measurements are shared across all cards rendered by a process
+            if self.config.process_pool:
+                self._process_pool = concurrent.futures.ProcessPoolExecutor(
+                    self.config.concurrency,
+                    initializer = _init_renderer,
+                    initargs = (self.renderer,)
+                )
+
+            # Return card renderer
+            return self.renderer
+
+    # Retrieve encoding options of social cards
+    def _encoding(self):
+        return {
+            "format": self.config.cards_format,
+            "quality": self.config.cards_quality,
+            "optimize": self.config.cards_optimize
+        }
 
-        # Retrieve y-offset of textbox to correct for spacing
-        yoffset = 0
+    # Compute fingerprint of fonts, logo, colors, layout and encoding options
+    def _compute_fingerprint(self, config):
+        hash = md5(LAYOUT_VERSION.encode("utf-8"))
+        for style in ["Regular", "Bold"]:
+            with open(self.font[style], "rb") as f:
+                hash.update(f.read())
 
-        # Create drawing context and split text into lines
-        for word in text.split(" "):
-            combine = " ".join(words + [word])
-            textbox = self._text_bounding_box(combine, font = font)
-            yoffset = textbox[1]
-            if not words or textbox[2] <= width:
-                words.append(word)
-            else:
-                lines.append(words)
-                words = [word]
+        # Add logo and fill color, if any
+        path, fill = self._resolve_logo(config)
+        with open(path, "rb") as f:
+            hash.update(f.read())
+        hash.update(str(fill).encode("utf-8"))
 
-        # Join words for each line and create image
-        lines.append(words)
-        lines = [" ".join(line) for line in lines]
-        image = Image.new(mode = "RGBA", size = size)
+        # Add colors and layout options
+        hash.update(json.dumps(self.color, sort_keys = True).encode("utf-8"))
+        hash.update(json.dumps(
+            self.config.cards_layout_options, sort_keys = True, default = str
+        ).encode("utf-8"))
 
-        # Create drawing context and split text into lines
-        context = ImageDraw.Draw(image)
-        context.text(
-            (0, spacing / 2 - yoffset), "\n".join(lines[:lmax]),
-            font = font, fill = self.color["text"], spacing = spacing - yoffset
-        )
+        # Add encoding options
+        hash.update(json.dumps(self._encoding(), sort_keys = True).encode("utf-8"))
 
-        # Return text image
-        return image
+        # Return fingerprint
+        return hash.hexdigest()
 
     # -------------------------------------------------------------------------
 
@@ -352,11 +400,12 @@ class SocialPlugin(BasePlugin[SocialConfig]):
             description = page.meta["description"]
 
         # Resolve image URL
-        url = "{}.png".format(posixpath.join(
+        extension, mime_type, _ = formats[self.config.cards_format]
+        url = "{}{}".format(posixpath.join(
             config.site_url or ".",
             directory,
             file
-        ))
+        ), extension)
 
         # Ensure forward slashes
         url = url.replace(os.path.sep, "/")
@@ -369,7 +418,7 @@ class SocialPlugin(BasePlugin[SocialConfig]):
             { "property": "og:title", "content": title },
             { "property": "og:description", "content": description },
             { "property": "og:image", "content": url },
-            { "property": "og:image:type", "content": "image/png" },
+            { "property": "og:image:type", "content": mime_type },
             { "property": "og:image:width", "content": "1200" },
             { "property": "og:image:height", "content": "630" },
             { "property": "og:url", "content": page.canonical_url },
@@ -383,19 +432,49 @@ class SocialPlugin(BasePlugin[SocialConfig]):
             { "name": "twitter:image", "content": url }
         ]
 
+    # Retrieve resized logo - rasterizing and resizing is expensive, so the
+    # result is cached, keyed by the logo's contents, fill color and width
     def _load_resized_logo(self, config, width = 144):
+        path, fill = self._resolve_logo(config)
+        with open(path, "rb") as f:
+            hash = md5(f.read())
+
+        # Compute path of cached logo
+        hash.update(f"{ASSETS_VERSION}:{fill}:{width}".encode("utf-8"))
+        file = os.path.join(self.cache, "logos", f"{hash.hexdigest()}.png")
+
+        # Load logo from cache, if present
+        if os.path.isfile(file):
+            return Image.open(file).convert("RGBA")
+
+        # Otherwise rasterize, resize and cache logo
         logo = self._load_logo(config)
         height = int(width * logo.height / logo.width)
-        return logo.resize((width, height))
+        logo = logo.resize((width, height))
+
+        # Save logo to cache
+        os.makedirs(os.path.dirname(file), exist_ok = True)
+        logo.save(file, format = "PNG")
+        return logo
 
     # Retrieve logo image or icon
     def _load_logo(self, config):
+        path, fill = self._resolve_logo(config)
+
+        # Load SVG and convert to PNG
+        _, extension = os.path.splitext(path)
+        if extension == ".svg":
+            return self._load_logo_svg(path, fill)
+
+        # Load PNG, JPEG, etc.
+        return Image.open(path).convert("RGBA")
+
+    # Resolve path of logo image or icon, and the color to fill it with
+    def _resolve_logo(self, config):
         theme = config.theme
 
         # Handle images (precedence over icons)
         if "logo" in theme:
-            _, extension = os.path.splitext(theme["logo"])
-
             path = os.path.join(config.docs_dir, theme["logo"])
 
             # Allow users to put the logo inside their custom_dir (theme["logo"] case)
@@ -404,12 +483,8 @@ class SocialPlugin(BasePlugin[SocialConfig]):
                 if os.path.exists(custom_dir_logo):
                     path = custom_dir_logo
 
-            # Load SVG and convert to PNG
-            if extension == ".svg":
-                return self._load_logo_svg(path)
-
-            # Load PNG, JPEG, etc.
-            return Image.open(path).convert("RGBA")
+            # Images are used as they are
+            return path, None
 
         # Handle icons
         icon = theme.get("icon") or {}
@@ -432,8 +507,8 @@ class SocialPlugin(BasePlugin[SocialConfig]):
             if os.path.exists(custom_dir_logo):
                 path = custom_dir_logo
 
-        # Load icon data and fill with color
-        return self._load_logo_svg(path, self.color["text"])
+        # Icons are filled with text color
+        return path, self.color["text"]
 
     # Load SVG file and convert to PNG
     def _load_logo_svg(self, path, fill = None):
@@ -475,12 +550,29 @@ class SocialPlugin(BasePlugin[SocialConfig]):
     def _resolve_font(self, family: str, style: str):
         path = os.path.join(self.config.cache_dir, "fonts", family)
 
+        # Warm font cache from local fonts directory, if the font family is
+        # provided there, so builds need no network access
+        if not os.path.isdir(path) and self.config.fonts_dir:
+            local = os.path.join(self.config.fonts_dir, family)
+            if os.path.isdir(local):
+                self._load_font_from_directory(family, local)
+
         # Fetch font family, if it hasn't been fetched yet
         if not os.path.isdir(path):
             self._fetch_font_from_google_fonts(family)
 
+        # Ensure that the font family has at least one font file, or we would
+        # recurse infinitely when looking for a fallback
+        list = sorted(os.listdir(path)) if os.path.isdir(path) else []
+        if not list:
+            raise PluginError(
+                f"Couldn't find any font files for font family '{family}'. "
+                f"Check the font files in '{family}' inside of the "
+                f"'fonts_dir' directory, or remove them from the font cache "
+                f"to fetch them from Google Fonts again."
+            )
+
         # Check for availability of font style
-        list = sorted(os.listdir(path))
         for file in list:
             name, _ = os.path.splitext(file)
             if name == style:
@@ -507,6 +599,18 @@ class SocialPlugin(BasePlugin[SocialConfig]):
         # Fall back to regular font (guess if there are multiple)
         return self._resolve_font(family, fallback)
 
+    # Load font family from local directory - font files are saved to the font
+    # cache under the name of their style, just like fetched font files
+    def _load_font_from_directory(self, family: str, directory: str):
+        for file in sorted(os.listdir(directory)):
+            _, extension = os.path.splitext(file)
+            if extension.lower() not in (".ttf", ".otf"):
+                continue
+
+            # Read font file and save it to the font cache
+            with open(os.path.join(directory, file), "rb") as f:
+                self._save_font(family, f.read())
+
     # Fetch font family from Google Fonts
     def _fetch_font_from_google_fonts(self, family: str):
         path = os.path.join(self.config.cache_dir, "fonts")
@@ -516,7 +620,14 @@ class SocialPlugin(BasePlugin[SocialConfig]):
         # URLs to font files, as we're going to rename them anyway. This should
         # be more resilient than trying to correct the JSON syntax.
         url = f"https://fonts.google.com/download/list?family={family}"
-        res = requests.get(url)
+        try:
+            res = requests.get(url)
+        except requests.exceptions.ConnectionError as e:
+            raise PluginError(
+                f"Couldn't download font family '{family}' from Google Fonts "
+                f"({e}). If the build has no network access, provide the font "
+                f"files in '{family}' inside of the 'fonts_dir' directory."
+            )
 
         # Ensure that the download succeeded
         if res.status_code != 200:
@@ -525,25 +636,217 @@ class SocialPlugin(BasePlugin[SocialConfig]):
                 f"({res.status_code}: {res.reason})"
             )
 
-        # Extract font URLs from manifest
-        for match in re.findall(
-            r"\"(https:(?:.*?)\.[ot]tf)\"", str(res.content)
-        ):
-            with requests.get(match) as res:
-                res.raise_for_status()
-
-                # Extract font family name and style using the content in the
-                # response via ByteIO to avoid writing a temp file. Done to fix
-                # problems with passing a NamedTemporaryFile to
-                # ImageFont.truetype() on Windows, see https://t.ly/LiF_k
-                with BytesIO(res.content) as fontdata:
-                    font = ImageFont.truetype(fontdata)
-                    name, style = font.getname()
-                    name = " ".join([name.replace(family, ""), style]).strip()
-                    target = os.path.join(path, family, f"{name}.ttf")
-
-                # write file to cache
-                write_file(res.content, target)
+        # Extract font URLs from manifest and fetch fonts concurrently
+        urls = re.findall(r"\"(https:(?:.*?)\.[ot]tf)\"", str(res.content))
+        list(self._executor.map(
+            lambda url: self._fetch_font(family, url), urls
+        ))
+
+    # Fetch font file and save it to the font cache
+    def _fetch_font(self, family: str, url: str):
+        with requests.get(url) as res:
+            res.raise_for_status()
+            self._save_font(family, res.content)
+
+    # Save font file to the font cache, named after its style
+    def _save_font(self, family: str, data: bytes):
+        path = os.path.join(self.config.cache_dir, "fonts")
+
+        # Extract font family name and style using the content via ByteIO to
+        # avoid writing a temp file. Done to fix problems with passing a
+        # NamedTemporaryFile to ImageFont.truetype() on Windows, see
+        # https://t.ly/LiF_k
+        with BytesIO(data) as fontdata:
+            font = ImageFont.truetype(fontdata)
+            name, style = font.getname()
+            name = " ".join([name.replace(family, ""), style]).strip()
+            target = os.path.join(path, family, f"{name}.ttf")
+
+        # write file to cache
+        write_file(data, target)
+
+# -----------------------------------------------------------------------------
+
+# Social card renderer - holds everything needed to render cards, so it can be
+# shared by all threads, or sent to processes of a process pool
+class CardRenderer:
+
+    # Initialize renderer with font files, colors, logo image and encoding
+    def __init__(self, font, color, logo, encoding):
+        self.font = dict(font)
+        self.color = color
+        self.logo = logo
+        self.encoding = encoding
+
+        # Initialize fonts and measurements
+        self.fonts = {}
+        self.boxes = {}
+        self.context = None
+
+    # Support pickling - fonts and measurements are recreated in each process
+    def __getstate__(self):
+        return {
+            "font": self.font, "color": self.color,
+            "logo": self.logo, "encoding": self.encoding
+        }
+
+    # Support unpickling
+    def __setstate__(self, state):
+        self.__init__(**state)
+
+    # Load font of given kind and size
+    def _get_font(self, kind, size):
+        key = (kind, size)
+        if key not in self.fonts:
+            self.fonts[key] = ImageFont.truetype(self.font[kind], size)
+
+        # Return font
+        return self.fonts[key]
+
+    # Render social card and save it to the given path - the card is written
+    # to a temporary file first, so other jobs never observe partial files
+    def render_to_file(self, path, site_name, title, description):
+        image = self.render(site_name, title, description)
+        temp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(temp, "wb") as f:
+            self.encode(image, f)
+        os.replace(temp, path)
+
+    # Encode social card - images are created from scratch, so they carry no
+    # metadata, and we don't pass any, e.g., EXIF or text chunks, when saving
+    def encode(self, image, file):
+        format = self.encoding["format"]
+        quality = self.encoding["quality"]
+        _, _, name = formats[format]
+
+        # Quantize to palette, if enabled - this shrinks cards considerably,
+        # but is lossy for gradients, photos in background images and emojis
+        if format == "png":
+            if self.encoding["optimize"]:
+                image = image.quantize(256, method = Image.Quantize.FASTOCTREE)
+            image.save(file, format = name, optimize = True)
+
+        # Encode as WebP, using the slowest but most efficient method
+        elif format == "webp":
+            image.save(file, format = name, quality = quality, method = 6)
+
+        # Encode as JPEG, which doesn't support transparency
+        else:
+            image.convert("RGB").save(
+                file, format = name, quality = quality,
+                optimize = True, progressive = True
+            )
+
+    # Render social card
+    def render(self, site_name, title, description):
+        # Render background and logo
+        image = self._render_card_background((1200, 630), self.color["fill"])
+        image.alpha_composite(self.logo, (1200 - 228, 64 - 4))
+
+        # Render site name
+        font = self._get_font("Bold", 36)
+        image.alpha_composite(
+            self._render_text((826, 48), font, site_name, 1, 20),
+            (64 + 4, 64)
+        )
+
+        # Render page title
+        font = self._get_font("Bold", 92)
+        image.alpha_composite(
+            self._render_text((826, 328), font, title, 3, 30),
+            (64, 160)
+        )
+
+        # Render page description
+        font = self._get_font("Regular", 28)
+        image.alpha_composite(
+            self._render_text((826, 80), font, description, 2, 14),
+            (64 + 4, 512)
+        )
+
+        # Return social card image
+        return image
+
+    # Render social card background
+    def _render_card_background(self, size, fill):
+        return Image.new(mode = "RGBA", size = size, color = fill)
+
+    # Measure bounding box of text - measurements are shared across all cards
+    # rendered by this renderer, as site names and many words recur
+    def _text_bounding_box(self, text, font):
+        key = (text, id(font))
+        if key not in self.boxes:
+            if self.context is None:
+                image = Image.new(mode = "RGBA", size = (50, 50))
+                self.context = ImageDraw.Draw(image)
+
+            # Measure text
+            self.boxes[key] = self.context.textbbox((0, 0), text, font = font)
+
+        # Return bounding box
+        return self.boxes[key]
+
+    # Render social card text
+    def _render_text(self, size, font, text, lmax, spacing = 0):
+        width = size[0]
+        lines, words = [], []
+
+        # Remove remnant HTML tags and convert HTML entities
+        text = re.sub(r"(<[^>]+>)", "", text)
+        text = unescape(text)
+
+        # Retrieve y-offset of textbox to correct for spacing
+        yoffset = 0
+
+        # Create drawing context and split text into lines
+        for word in text.split(" "):
+            combine = " ".join(words + [word])
+            textbox = self._text_bounding_box(combine, font = font)
+            yoffset = textbox[1]
+            if not words or textbox[2] <= width:
+                words.append(word)
+            else:
+                lines.append(words)
+                words = [word]
+
+        # Join words for each line and create image
+        lines.append(words)
+        lines = [" ".join(line) for line in lines]
+        image = Image.new(mode = "RGBA", size = size)
+
+        # Create drawing context and split text into lines
+        context = ImageDraw.Draw(image)
+        context.text(
+            (0, spacing / 2 - yoffset), "\n".join(lines[:lmax]),
+            font = font, fill = self.color["text"], spacing = spacing - yoffset
+        )
+
+        # Return text image
+        return image
+
+# -----------------------------------------------------------------------------
+# Functions
+# -----------------------------------------------------------------------------
+
+# Initialize card renderer of process
+def _init_renderer(renderer):
+    global _renderer
+    _renderer = renderer
+
+# Render social card in process and save it to the given path
+def _render_card_to_file(path, site_name, title, description):
+    _renderer.render_to_file(path, site_name, title, description)
+
+# Link file from cache to site directory, which is much faster than copying and
+# saves space - if linking is not supported, e.g., when the site directory is on
+# another device, fall back to copying the file
+def _link_or_copy(src, dest):
+    if os.path.exists(dest):
+        os.remove(dest)
+    try:
+        os.link(src, dest)
+    except OSError:
+        copyfile(src, dest)
 
 # -----------------------------------------------------------------------------
 # Data
@@ -553,6 +856,28 @@ class SocialPlugin(BasePlugin[SocialConfig]):
 log = logging.getLogger("mkdocs")
 log.addFilter(DuplicateFilter())
 
+# Version of card layout - bump when changing how cards are rendered, so that
+# cached cards are invalidated
+LAYOUT_VERSION = "1"
+
+# Version of cached assets, e.g., rasterized logos - bump when changing how
+# assets are processed, so that cached assets are invalidated
+ASSETS_VERSION = "1"
+
+# Card formats - extension, MIME type and Pillow format name
+formats = {
+    "png":  (".png",  "image/png",  "PNG"),
+    "webp": (".webp", "image/webp", "WEBP"),
+    "jpeg": (".jpg",  "image/jpeg", "JPEG")
+}
+
+# Extensions of cards in cache
+extensions = set(extension for extension, _, _ in formats.values())
+
+# Card renderer of process, and lock for creating the card renderer
+_renderer = None
+_renderer_lock = threading.Lock()
+
 # Color palette
 colors = {
     "red":         { "fill": "#ef5552", "text": "#ffffff" },
@@ -12,9 +12,17 @@ import logging
 import time
 import json
 import os
+import sys
+import argparse
 from typing import Optional, Dict, List
 from dotenv import load_dotenv
 
+# Permitir importar o pacote govhub a partir de src/
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from govhub.utils.checkpoint import CheckpointStore
+from govhub.utils.reference_cache import ReferenceCache
+
 load_dotenv()
 
 logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
@@ -41,10 +49,24 @@ class TransparenciaRealCollector:
             'Accept': 'application/json'
         }
         
+        # Tabelas de referência (órgãos etc.) consultadas apenas quando vencidas
+        self.reference_cache = ReferenceCache()
+        
         logger.info("🔑 Coletor configurado com chave de API")
     
-    def get_orgaos_siafi(self) -> Optional[List[Dict]]:
-        """Coleta lista de órgãos SIAFI."""
+    def get_orgaos_siafi(self, force: bool = False) -> Optional[List[Dict]]:
+        """
+        Coleta lista de órgãos SIAFI, usando o cache de referência.
+        
+        Args:
+            force: Ignora o cache e consulta a API
+        """
+        return self.reference_cache.get_or_fetch(
+            "orgaos_siafi", self._fetch_orgaos_siafi, force=force, source="orgaos-siafi"
+        )
+    
+    def _fetch_orgaos_siafi(self) -> Optional[List[Dict]]:
+        """Consulta a lista de órgãos SIAFI na API."""
         endpoint = f"{self.base_url}/orgaos-siafi"
         
         try:
@@ -102,14 +124,26 @@ class TransparenciaRealCollector:
             logger.error(f"❌ Erro na requisição de cartões: {e}")
             return None
     
-    def collect_comprehensive_data(self) -> bool:
-        """Coleta dados abrangentes do Portal da Transparência."""
+    def collect_comprehensive_data(self, resume: bool = False) -> bool:
+        """
+        Coleta dados abrangentes do Portal da Transparência.
+        
+        Args:
+            resume: Retomar a partir do checkpoint da execução anterior
+        """
         logger.info("🏛️ INICIANDO COLETA COMPLETA DE DADOS REAIS")
         logger.info("🎯 Fonte: Portal da Transparência - API Oficial")
         
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        mes_ano = "01/2024"  # Janeiro 2024
+        
+        checkpoint = CheckpointStore(
+            f"cartoes_{mes_ano.replace('/', '_')}",
+            checkpoint_dir=str(self.base_dir / "checkpoints"),
+            resume=resume,
+        )
         
-        # 1. Coletar órgãos SIAFI
+        # 1. Coletar órgãos SIAFI (do cache de referência, se válido)
         logger.info("\n📋 FASE 1: Coletando órgãos SIAFI")
         orgaos = self.get_orgaos_siafi()
         
@@ -117,17 +151,12 @@ class TransparenciaRealCollector:
             logger.error("❌ Falha ao coletar órgãos")
             return False
         
-        # Salvar órgãos
-        orgaos_file = self.raw_dir / f"orgaos_siafi_real_{timestamp}.json"
-        with open(orgaos_file, 'w', encoding='utf-8') as f:
-            json.dump(orgaos, f, indent=2, ensure_ascii=False)
-        
-        # Converter para CSV
-        orgaos_csv = self.raw_dir / f"orgaos_siafi_real_{timestamp}.csv"
+        # Exportar órgãos em um único CSV (sobrescrito a cada execução)
+        orgaos_csv = self.raw_dir / "orgaos_siafi_real.csv"
         df_orgaos = pd.DataFrame(orgaos)
         df_orgaos.to_csv(orgaos_csv, index=False, encoding='utf-8')
         
-        logger.info(f"💾 Órgãos salvos: {orgaos_csv.name}")
+        logger.info(f"💾 Órgãos exportados: {orgaos_csv.name}")
         
         # 2. Coletar dados de cartões para órgãos principais
         logger.info("\n💳 FASE 2: Coletando dados de cartões de pagamento")
@@ -137,22 +166,29 @@ class TransparenciaRealCollector:
         logger.info(f"📊 {len(orgaos_validos)} órgãos válidos encontrados")
         
         all_cartoes = []
-        mes_ano = "01/2024"  # Janeiro 2024
         
         for i, orgao in enumerate(orgaos_validos[:5], 1):  # Primeiros 5 órgãos
             codigo = orgao['codigo']
             nome = orgao['descricao']
+            series = {'codigoOrgao': codigo, 'mesAno': mes_ano}
             
             logger.info(f"🏛️ ({i}/5) Processando: {codigo} - {nome}")
             
             # Coletar até 3 páginas por órgão
             orgao_cartoes = []
             for pagina in range(1, 4):
-                cartoes = self.get_cartoes_pagamento(codigo, mes_ano, pagina)
-                
+                cartoes = checkpoint.load_page("cartoes", series, pagina)
                 if cartoes is None:
-                    break
-                elif len(cartoes) == 0:
+                    if checkpoint.is_complete("cartoes", series):
+                        break
+                    cartoes = self.get_cartoes_pagamento(codigo, mes_ano, pagina)
+                    if cartoes is None:
+                        break
+                    checkpoint.record_page("cartoes", series, pagina, cartoes)
+                    time.sleep(1)  # Rate limiting
+                
+                if len(cartoes) == 0:
+                    checkpoint.mark_complete("cartoes", series)
                     break
                 else:
                     # Adicionar info do órgão aos registros
@@ -163,9 +199,8 @@ class TransparenciaRealCollector:
                     orgao_cartoes.extend(cartoes)
                     
                     if len(cartoes) < 500:  # Última página
+                        checkpoint.mark_complete("cartoes", series)
                         break
-                
-                time.sleep(1)  # Rate limiting
             
             if orgao_cartoes:
                 logger.info(f"✅ {len(orgao_cartoes)} registros coletados para {nome}")
@@ -198,6 +233,42 @@ class TransparenciaRealCollector:
             logger.warning("⚠️ Nenhum dado de cartão foi coletado")
             return False
     
+    def collect_all_orgaos_async(self, meses: List[str], max_concurrency: int = 8,
+                                 requests_per_minute: int = 90, resume: bool = False) -> bool:
+        """
+        Coleta cartões de todos os órgãos válidos e meses em paralelo.
+
+        Usa o coletor assíncrono do pacote govhub, com concorrência limitada e
+        limitador de taxa compartilhado. Os resultados são gravados por órgão
+        em dados_brutos/cartoes/<codigo>.jsonl à medida que chegam.
+
+        Args:
+            meses: Períodos no formato MM/AAAA
+            max_concurrency: Número máximo de requisições simultâneas
+            requests_per_minute: Cota de requisições por minuto da API
+            resume: Retomar a partir do checkpoint da execução anterior
+        """
+        from govhub.core.transparencia import AsyncTransparenciaCollector
+
+        logger.info("🏛️ INICIANDO COLETA ASSÍNCRONA DE TODOS OS ÓRGÃOS")
+        collector = AsyncTransparenciaCollector(
+            output_dir=str(self.raw_dir),
+            api_key=self.headers.get('chave-api-dados'),
+            max_concurrency=max_concurrency,
+            requests_per_minute=requests_per_minute,
+            checkpoint=CheckpointStore(
+                "transparencia_cartoes",
+                checkpoint_dir=str(self.base_dir / "checkpoints"),
+                resume=resume,
+            ),
+            reference_cache=self.reference_cache,
+        )
+        results = collector.collect(meses)
+
+        total = sum(results.values())
+        logger.info(f"📊 {len(results)} órgãos processados, {total:,} registros")
+        return total > 0
+    
     def generate_comprehensive_report(self, orgaos_file: Path, cartoes_file: Path, 
                                     orgaos: List[Dict], cartoes: List[Dict]):
         """Gera relatório abrangente da coleta."""
@@ -287,10 +358,25 @@ def main():
     print("🏛️ Gov-Hub - Coletor de Dados Reais do Portal da Transparência")
     print("=" * 70)
     
+    parser = argparse.ArgumentParser(description="Coletor de dados reais do Portal da Transparência")
+    parser.add_argument("--todos-orgaos", action="store_true",
+                        help="Coleta assíncrona de todos os órgãos válidos")
+    parser.add_argument("--meses", nargs="+", default=["01/2024"],
+                        help="Períodos no formato MM/AAAA (padrão: 01/2024)")
+    parser.add_argument("--concurrency", type=int, default=8,
+                        help="Requisições simultâneas na coleta assíncrona")
+    parser.add_argument("--resume", action="store_true",
+                        help="Retoma a coleta anterior a partir das páginas pendentes")
+    args = parser.parse_args()
+    
     collector = TransparenciaRealCollector()
     
     try:
-        success = collector.collect_comprehensive_data()
+        if args.todos_orgaos:
+            success = collector.collect_all_orgaos_async(args.meses, args.concurrency,
+                                                         resume=args.resume)
+        else:
+            success = collector.collect_comprehensive_data(resume=args.resume)
         
         if success:
             print(f"\n🎉 COLETA COMPLETA REALIZADA COM SUCESSO!")
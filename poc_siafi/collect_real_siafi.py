@@ -12,9 +12,17 @@ import logging
 import time
 import json
 import os
+import sys
+import argparse
 from typing import Optional, Dict, List
 from dotenv import load_dotenv
 
+# Permitir importar o pacote govhub a partir de src/
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from govhub.utils.checkpoint import CheckpointStore
+from govhub.utils.reference_cache import ReferenceCache
+
 # Carregar variáveis de ambiente do arquivo .env
 load_dotenv()
 
@@ -49,6 +57,9 @@ class SiafiRealDataCollector:
             logger.info("🔑 Chave de API encontrada")
         else:
             logger.warning("⚠️ Nenhuma chave de API encontrada. Algumas funcionalidades podem ter limitações.")
+        
+        # Tabelas de referência (órgãos etc.) consultadas apenas quando vencidas
+        self.reference_cache = ReferenceCache()
     
     def get_despesas_execucao(self, ano: int = 2024, mes: int = None, pagina: int = 1) -> Optional[Dict]:
         """
@@ -100,8 +111,19 @@ class SiafiRealDataCollector:
             logger.error(f"❌ Erro na requisição: {e}")
             return None
     
-    def get_orgaos_siafi(self) -> Optional[List[Dict]]:
-        """Busca lista de órgãos do SIAFI."""
+    def get_orgaos_siafi(self, force: bool = False) -> Optional[List[Dict]]:
+        """
+        Busca lista de órgãos do SIAFI, usando o cache de referência.
+        
+        Args:
+            force: Ignora o cache e consulta a API
+        """
+        return self.reference_cache.get_or_fetch(
+            "orgaos_siafi", self._fetch_orgaos_siafi, force=force, source="orgaos-siafi"
+        )
+    
+    def _fetch_orgaos_siafi(self) -> Optional[List[Dict]]:
+        """Consulta a lista de órgãos do SIAFI na API."""
         endpoint = f"{self.base_url}/orgaos-siafi"
         
         try:
@@ -120,32 +142,56 @@ class SiafiRealDataCollector:
             logger.error(f"❌ Erro na busca de órgãos: {e}")
             return None
     
-    def collect_real_data(self, ano: int = 2024, mes: int = None, max_pages: int = 5) -> Optional[Path]:
+    def collect_real_data(self, ano: int = 2024, mes: int = None, max_pages: int = 5,
+                          resume: bool = False) -> Optional[Path]:
         """
         Coleta dados reais do SIAFI.
         
+        Cada página recebida é gravada em um checkpoint; com `resume=True`, as
+        páginas já concluídas em uma execução anterior são lidas do disco e a
+        coleta continua a partir da próxima página pendente.
+        
         Args:
             ano: Ano da consulta
             mes: Mês específico (opcional)
             max_pages: Máximo de páginas a coletar
+            resume: Retomar a partir do checkpoint anterior
         """
         logger.info(f"🏛️ Iniciando coleta de dados REAIS do SIAFI")
         logger.info(f"📅 Período: {mes or 'Ano completo'}/{ano}")
         
+        checkpoint = CheckpointStore(
+            f"siafi_despesas_{ano}_{mes or 'completo'}",
+            checkpoint_dir=str(self.base_dir / "checkpoints"),
+            resume=resume,
+        )
+        endpoint = "despesas/execucao"
+        series = {'ano': ano, 'mes': mes}
+        
         all_data = []
         pagina = 1
         
         while pagina <= max_pages:
-            # Buscar dados da página
-            data = self.get_despesas_execucao(ano, mes, pagina)
+            # Reaproveitar página já concluída ou buscar na API
+            data = checkpoint.load_page(endpoint, series, pagina)
+            if data is not None:
+                logger.info(f"♻️ Página {pagina}: {len(data)} registros recuperados do checkpoint")
+            elif checkpoint.is_complete(endpoint, series):
+                break
+            else:
+                data = self.get_despesas_execucao(ano, mes, pagina)
+                if isinstance(data, list):
+                    checkpoint.record_page(endpoint, series, pagina, data)
+                    time.sleep(2)  # Rate limiting respeitoso
             
-            if not data:
+            if data is None:
                 logger.warning(f"⚠️ Sem dados na página {pagina}")
                 break
             
             # Verificar se há dados na resposta
             if isinstance(data, list) and len(data) == 0:
                 logger.info(f"📄 Página {pagina} vazia - fim dos dados")
+                checkpoint.mark_complete(endpoint, series)
                 break
             
             # Adicionar dados
@@ -159,10 +205,10 @@ class SiafiRealDataCollector:
             # Se recebeu menos que o máximo, provavelmente é a última página
             if len(data) < 500:
                 logger.info(f"📄 Página {pagina} com {len(data)} registros - fim dos dados")
+                checkpoint.mark_complete(endpoint, series)
                 break
             
             pagina += 1
-            time.sleep(2)  # Rate limiting respeitoso
         
         if all_data:
             # Salvar dados coletados
@@ -254,6 +300,11 @@ def main():
     print("🏛️ Gov-Hub - Coletor de Dados Reais do SIAFI")
     print("=" * 60)
     
+    parser = argparse.ArgumentParser(description="Coletor de dados reais do SIAFI")
+    parser.add_argument("--resume", action="store_true",
+                        help="Retoma a coleta anterior a partir da próxima página pendente")
+    args = parser.parse_args()
+    
     # Instruções para API Key
     if not os.getenv('PORTAL_TRANSPARENCIA_API_KEY'):
         print("\n⚠️  IMPORTANTE: Para melhor performance, configure sua chave de API:")
@@ -277,7 +328,8 @@ def main():
         arquivo = collector.collect_real_data(
             ano=ano_dados,
             mes=mes_dados,
-            max_pages=5  # Aumentar para mais dados
+            max_pages=5,  # Aumentar para mais dados
+            resume=args.resume
         )
         
         if arquivo:
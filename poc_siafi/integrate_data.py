@@ -1,8 +1,15 @@
 #!/usr/bin/env python3
 import pandas as pd
 import logging
+import sys
 from pathlib import Path
 
+# Permitir importar o pacote govhub a partir de src/
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from govhub.core.entity_resolution import EntityResolver
+from govhub.utils.reference_cache import ReferenceCache
+
 logging.basicConfig(
     level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s"
 )
@@ -59,6 +66,21 @@ class DataIntegrator:
 
         return cleaned
 
+    def resolve_keys(self, cleaned_data):
+        """Map UASG / TransfereGov codes to SIAFI UGs using the crosswalk"""
+        # The resolver reads the DataFrames column-wise (no per-row dicts)
+        with ReferenceCache() as cache:
+            crosswalk = EntityResolver(cache).load(cleaned_data)
+
+        for source, column in (("compras", "uasg"), ("transferegov", "codigo_siafi")):
+            df = cleaned_data.get(source)
+            if df is not None and column in df.columns:
+                codes = df[column]
+                if pd.api.types.is_float_dtype(codes):
+                    codes = codes.astype("Int64")
+                codes = codes.astype("string").str.strip()
+                df["codigo_ug_resolvido"] = codes.map(crosswalk[source]).fillna(codes)
+
     def integrate_data(self, cleaned_data):
         """Integrate data using key fields"""
         # Start with SIAFI data if available
@@ -67,26 +89,32 @@ class DataIntegrator:
         else:
             return None
 
+        self.resolve_keys(cleaned_data)
+
         # Join with Compras data
-        if "compras" in cleaned_data:
+        if "compras" in cleaned_data and "codigo_ug_resolvido" in cleaned_data["compras"]:
             integrated = pd.merge(
                 integrated,
                 cleaned_data["compras"],
                 left_on="codigo_ug",
-                right_on="uasg",
+                right_on="codigo_ug_resolvido",
                 how="outer",
                 suffixes=("_siafi", "_compras"),
-            )
+            ).drop(columns="codigo_ug_resolvido")
 
         # Join with TransfereGov data
-        if "transferegov" in cleaned_data:
+        if (
+            "transferegov" in cleaned_data
+            and "codigo_ug_resolvido" in cleaned_data["transferegov"]
+        ):
             integrated = pd.merge(
                 integrated,
                 cleaned_data["transferegov"],
-                on="codigo_siafi",
+                left_on="codigo_ug",
+                right_on="codigo_ug_resolvido",
                 how="outer",
                 suffixes=("", "_transferegov"),
-            )
+            ).drop(columns="codigo_ug_resolvido")
 
         return integrated
 
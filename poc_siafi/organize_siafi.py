@@ -5,10 +5,17 @@ Script para organizar os dados existentes do SIAFI na nova estrutura.
 """
 
 import shutil
+import sys
 from pathlib import Path
 from datetime import datetime
+from typing import Dict, Optional
 import logging
 
+# Permitir importar o pacote govhub a partir de src/
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from govhub.utils.profiler import FileProfile, profile_csv
+
 logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
 logger = logging.getLogger(__name__)
 
@@ -44,69 +51,45 @@ def organize_existing_siafi_data():
             else:
                 organized_files.append(dest_file)
     
-    # Processar cada arquivo organizado
+    # Processar cada arquivo organizado (uma única leitura por arquivo)
+    profiles = {}
     for file in organized_files:
+        profiles[file] = profile_csv(file, sample_size=1000)
+        
         # Criar amostra para análise
-        create_sample(file, processed_dir)
+        create_sample(file, processed_dir, profiles[file])
         
         # Gerar relatório básico
-        generate_basic_report(file, reports_dir)
+        generate_basic_report(file, reports_dir, profiles[file])
     
     # Criar relatório final
-    generate_final_organized_report(base_dir)
+    generate_final_organized_report(base_dir, profiles)
     
     logger.info("✅ Organização concluída!")
 
-def create_sample(source_file: Path, processed_dir: Path):
-    """Cria uma amostra dos dados para análise."""
+def create_sample(source_file: Path, processed_dir: Path, profile: Optional[FileProfile] = None):
+    """Cria uma amostra aleatória dos dados a partir do perfil do arquivo."""
     try:
         sample_file = processed_dir / "siafi_amostra_1000_registros_2025-06-30.csv"
         
-        # Tentar diferentes encodings
-        encodings = ['latin-1', 'cp1252', 'iso-8859-1', 'utf-8']
-        
-        for encoding in encodings:
-            try:
-                with open(source_file, 'r', encoding=encoding) as f:
-                    lines = f.readlines()
-                    
-                    # Pegar cabeçalho + primeiros 1000 registros
-                    sample_lines = lines[:1001] if len(lines) > 1001 else lines
-                    
-                    with open(sample_file, 'w', encoding='utf-8') as target:
-                        target.writelines(sample_lines)
-                    
-                    logger.info(f"📊 Amostra criada: {sample_file.name} ({len(sample_lines)-1} registros)")
-                    break
-                    
-            except UnicodeDecodeError:
-                continue
+        if profile is None:
+            profile = profile_csv(source_file, sample_size=1000)
+        
+        written = profile.write_sample(sample_file)
+        logger.info(f"📊 Amostra criada: {sample_file.name} ({written} registros)")
                 
     except Exception as e:
         logger.warning(f"⚠️ Erro ao criar amostra: {e}")
 
-def generate_basic_report(source_file: Path, reports_dir: Path):
-    """Gera um relatório básico do arquivo."""
+def generate_basic_report(source_file: Path, reports_dir: Path, profile: Optional[FileProfile] = None):
+    """Gera um relatório básico do arquivo a partir do seu perfil."""
     report_file = reports_dir / "siafi_relatorio_basico_2025-06-30.txt"
     
-    file_size_mb = source_file.stat().st_size / 1024 / 1024
-    
-    # Contar linhas com encoding robusto
-    line_count = 0
-    columns = []
+    if profile is None:
+        profile = profile_csv(source_file, sample_size=1000)
     
-    encodings = ['latin-1', 'cp1252', 'iso-8859-1', 'utf-8']
-    
-    for encoding in encodings:
-        try:
-            with open(source_file, 'r', encoding=encoding) as f:
-                lines = f.readlines()
-                line_count = len(lines)
-                if lines:
-                    columns = lines[0].strip().split(';')
-                break
-        except UnicodeDecodeError:
-            continue
+    file_size_mb = profile.size_mb
+    columns = profile.clean_columns
     
     with open(report_file, 'w', encoding='utf-8') as f:
         f.write("=" * 80 + "\n")
@@ -115,22 +98,51 @@ def generate_basic_report(source_file: Path, reports_dir: Path):
         
         f.write(f"Arquivo: {source_file.name}\n")
         f.write(f"Tamanho: {file_size_mb:.2f} MB\n")
-        f.write(f"Total de linhas: {line_count:,}\n")
-        f.write(f"Total de registros: {line_count-1:,} (excluindo cabeçalho)\n")
+        f.write(f"Total de linhas: {profile.total_lines:,}\n")
+        f.write(f"Total de registros: {profile.total_records:,} (excluindo cabeçalho)\n")
         f.write(f"Total de colunas: {len(columns)}\n\n")
         
         f.write("ESTRUTURA DE COLUNAS:\n")
         f.write("-" * 40 + "\n")
+        null_rate = profile.null_rate()
         for i, col in enumerate(columns[:10], 1):  # Primeiras 10 colunas
-            clean_col = col.replace('"', '').strip()
-            f.write(f"{i:2d}. {clean_col}\n")
+            f.write(f"{i:2d}. {col} (nulos: {null_rate[col]:.1%})\n")
         
         if len(columns) > 10:
             f.write(f"... e mais {len(columns)-10} colunas\n")
+        
+        if profile.value_stats:
+            f.write("\nCOLUNAS DE VALOR:\n")
+            f.write("-" * 40 + "\n")
+            for col in profile.value_stats:
+                stats = profile.value_summary(col)
+                f.write(
+                    f"{col}: soma R$ {stats['soma']:,.2f}, "
+                    f"mín R$ {stats['minimo']:,.2f}, máx R$ {stats['maximo']:,.2f}\n"
+                )
+                if 'p50' in stats:
+                    f.write(
+                        f"    mediana R$ {stats['p50']:,.2f}, "
+                        f"p90 R$ {stats['p90']:,.2f}, p99 R$ {stats['p99']:,.2f}\n"
+                    )
+        
+        distinct = profile.distinct_counts()
+        if distinct:
+            f.write("\nVALORES DISTINTOS (ESTIMATIVA):\n")
+            f.write("-" * 40 + "\n")
+            for col, count in distinct.items():
+                f.write(f"{col}: ~{count:,}\n")
+        
+        top_orgaos = profile.top_k(10)
+        if top_orgaos:
+            f.write("\nÓRGÃOS MAIS FREQUENTES (TOP 10):\n")
+            f.write("-" * 40 + "\n")
+            for i, (orgao, count) in enumerate(top_orgaos.items(), 1):
+                f.write(f"{i:2d}. {orgao}: {count:,} registros\n")
     
     logger.info(f"📋 Relatório básico salvo: {report_file.name}")
 
-def generate_final_organized_report(base_dir: Path):
+def generate_final_organized_report(base_dir: Path, profiles: Optional[Dict[Path, FileProfile]] = None):
     """Gera relatório final da organização."""
     report_file = base_dir / "relatorios" / "relatorio_final_organizacao_2025-06-30.txt"
     
@@ -176,18 +188,9 @@ def generate_final_organized_report(base_dir: Path):
         f.write("-" * 40 + "\n")
         if raw_files:
             main_file = raw_files[0]
-            encodings = ['latin-1', 'cp1252', 'iso-8859-1', 'utf-8']
-            line_count = 0
-            
-            for encoding in encodings:
-                try:
-                    with open(main_file, 'r', encoding=encoding) as file:
-                        line_count = sum(1 for _ in file)
-                    break
-                except UnicodeDecodeError:
-                    continue
+            profile = (profiles or {}).get(main_file) or profile_csv(main_file)
             
-            f.write(f"📊 Total de registros SIAFI: {line_count-1:,}\n")
+            f.write(f"📊 Total de registros SIAFI: {profile.total_records:,}\n")
             f.write(f"📦 Tamanho do dataset: {main_file.stat().st_size / 1024 / 1024:.2f} MB\n")
             f.write(f"🎯 Fonte: Portal da Transparência (SIAFI)\n")
         
@@ -12,9 +12,15 @@ import logging
 import time
 import json
 import os
+import sys
 from typing import Optional, Dict, List
 from dotenv import load_dotenv
 
+# Permitir importar o pacote govhub a partir de src/
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from govhub.utils.reference_cache import ReferenceCache
+
 load_dotenv()
 
 logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
@@ -42,19 +48,32 @@ class SiafiPocComplete:
             'Accept': 'application/json'
         }
         
+        # Tabelas de referência (órgãos etc.) consultadas apenas quando vencidas
+        self.reference_cache = ReferenceCache()
+        
         logger.info("🔑 PoC SIAFI configurada com chave de API real")
     
-    def collect_orgaos_data(self) -> Optional[Dict]:
-        """Coleta dados detalhados dos órgãos SIAFI."""
+    def _fetch_orgaos_siafi(self) -> Optional[List[Dict]]:
+        """Consulta a lista de órgãos SIAFI na API."""
         endpoint = f"{self.base_url}/orgaos-siafi"
         
+        logger.info("🏛️ Coletando dados completos dos órgãos SIAFI...")
+        response = requests.get(endpoint, headers=self.headers, timeout=30)
+        
+        if response.status_code == 200:
+            return response.json()
+        
+        logger.error(f"❌ Erro ao coletar órgãos: {response.status_code}")
+        return None
+    
+    def collect_orgaos_data(self) -> Optional[Dict]:
+        """Coleta dados detalhados dos órgãos SIAFI (via cache de referência)."""
         try:
-            logger.info("🏛️ Coletando dados completos dos órgãos SIAFI...")
-            response = requests.get(endpoint, headers=self.headers, timeout=30)
+            orgaos = self.reference_cache.get_or_fetch(
+                "orgaos_siafi", self._fetch_orgaos_siafi, source="orgaos-siafi"
+            )
             
-            if response.status_code == 200:
-                orgaos = response.json()
-                
+            if orgaos:
                 # Processar e enriquecer dados
                 orgaos_processados = []
                 for orgao in orgaos:
@@ -76,7 +95,7 @@ class SiafiPocComplete:
                     'dados': orgaos_processados
                 }
             else:
-                logger.error(f"❌ Erro ao coletar órgãos: {response.status_code}")
+                logger.error("❌ Lista de órgãos indisponível")
                 return None
                 
         except Exception as e:
@@ -171,13 +190,14 @@ class SiafiPocComplete:
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         files_created = {}
         
-        # 1. Salvar dados de órgãos
-        orgaos_json = self.raw_dir / f"orgaos_siafi_completo_{timestamp}.json"
+        # 1. Salvar dados de órgãos (um único arquivo, sobrescrito a cada execução;
+        #    a tabela de referência fica no cache SQLite)
+        orgaos_json = self.raw_dir / "orgaos_siafi_completo.json"
         with open(orgaos_json, 'w', encoding='utf-8') as f:
             json.dump(orgaos_data, f, indent=2, ensure_ascii=False)
         files_created['orgaos_json'] = orgaos_json
         
-        orgaos_csv = self.raw_dir / f"orgaos_siafi_completo_{timestamp}.csv"
+        orgaos_csv = self.raw_dir / "orgaos_siafi_completo.csv"
         df_orgaos = pd.DataFrame(orgaos_data['dados'])
         df_orgaos.to_csv(orgaos_csv, index=False, encoding='utf-8')
         files_created['orgaos_csv'] = orgaos_csv
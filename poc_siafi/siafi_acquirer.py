@@ -24,6 +24,12 @@ from datetime import datetime
 import pandas as pd
 from pathlib import Path
 from typing import Dict, Optional
+import sys
+
+# Permitir importar o pacote govhub a partir de src/
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from govhub.utils.profiler import FileProfile, profile_csv
 
 # Configuração de SSL para evitar erros de certificado
 ssl._create_default_https_context = ssl._create_unverified_context
@@ -57,6 +63,9 @@ class SiafiDataAcquirer:
         for dir_path in [self.raw_dir, self.processed_dir, self.reports_dir, self.temp_dir]:
             dir_path.mkdir(parents=True, exist_ok=True)
         
+        # Perfis de arquivo (uma única leitura por arquivo)
+        self._profiles: Dict[Path, FileProfile] = {}
+        
         logger.info("🏛️ SIAFI Data Acquirer inicializado")
         logger.info(f"📁 Dados brutos: {self.raw_dir}")
         logger.info(f"📊 Dados processados: {self.processed_dir}")
@@ -147,9 +156,9 @@ class SiafiDataAcquirer:
                 logger.info(f"✅ Arquivo extraído: {final_csv_name}")
                 logger.info(f"📊 Tamanho: {final_csv_path.stat().st_size / 1024 / 1024:.2f} MB")
                 
-                # Contar registros
-                line_count = self._count_csv_lines(final_csv_path)
-                logger.info(f"📈 Total de registros: {line_count - 1:,} (excluindo cabeçalho)")
+                # Perfil do arquivo (contagem, valores, amostra) em uma passada
+                profile = self._get_profile(final_csv_path)
+                logger.info(f"📈 Total de registros: {profile.total_records:,} (excluindo cabeçalho)")
                 
                 return True
                 
@@ -157,20 +166,6 @@ class SiafiDataAcquirer:
             logger.error(f"❌ Erro na extração: {e}")
             return False
 
-    def _count_csv_lines(self, csv_path: Path) -> int:
-        """Conta o número de linhas no arquivo CSV."""
-        encodings = ['utf-8', 'latin-1', 'cp1252', 'iso-8859-1']
-        
-        for encoding in encodings:
-            try:
-                with open(csv_path, 'r', encoding=encoding) as f:
-                    return sum(1 for _ in f)
-            except UnicodeDecodeError:
-                continue
-        
-        logger.warning(f"⚠️ Não foi possível contar linhas do arquivo {csv_path.name}")
-        return 0
-
     def process_siafi_data(self) -> bool:
         """
         Processa os dados do SIAFI e gera análises básicas.
@@ -206,125 +201,48 @@ class SiafiDataAcquirer:
             logger.error(f"❌ Erro no processamento: {e}")
             return False
 
+    def _get_profile(self, csv_path: Path) -> FileProfile:
+        """Retorna o perfil do arquivo, gerado em uma única leitura."""
+        profile = self._profiles.get(csv_path)
+        if profile is None:
+            profile = profile_csv(csv_path, sample_size=1000)
+            self._profiles[csv_path] = profile
+        return profile
+
     def _analyze_siafi_file(self, csv_path: Path) -> Dict:
         """Analisa o arquivo do SIAFI e extrai estatísticas básicas."""
         logger.info("📊 Analisando estrutura e conteúdo do arquivo...")
         
-        analysis = {
-            "arquivo": csv_path.name,
-            "tamanho_mb": csv_path.stat().st_size / 1024 / 1024,
-            "timestamp_processamento": datetime.now().isoformat(),
-        }
-        
         try:
-            # Ler apenas as primeiras linhas para análise da estrutura
-            # Tentar diferentes encodings
-            encodings = ['utf-8', 'latin-1', 'cp1252', 'iso-8859-1']
-            file_content = None
-            used_encoding = None
-            
-            for encoding in encodings:
-                try:
-                    with open(csv_path, 'r', encoding=encoding) as f:
-                        first_line = f.readline().strip()
-                        analysis["colunas"] = first_line.split(';')
-                        analysis["total_colunas"] = len(analysis["colunas"])
-                        used_encoding = encoding
-                        break
-                except UnicodeDecodeError:
-                    continue
-            
-            if used_encoding:
-                logger.info(f"📝 Encoding utilizado: {used_encoding}")
-                # Contar linhas totais
-                with open(csv_path, 'r', encoding=used_encoding) as f:
-                    analysis["total_linhas"] = sum(1 for _ in f)
-                    analysis["total_registros"] = analysis["total_linhas"] - 1
-            else:
-                raise Exception("Não foi possível decodificar o arquivo com nenhum encoding testado")
-                
-                # Ler uma amostra para análise de valores
-                sample_data = []
-                if used_encoding:
-                    with open(csv_path, 'r', encoding=used_encoding) as f:
-                        lines = f.readlines()
-                        header = lines[0].strip().split(';')
-                        
-                        # Pegar até 100 linhas de exemplo
-                        for i in range(1, min(101, len(lines))):
-                            row_data = lines[i].strip().split(';')
-                            if len(row_data) == len(header):
-                                sample_data.append(dict(zip(header, row_data)))
-                
-                # Analisar valores monetários
-                analysis["analise_valores"] = self._analyze_monetary_values(sample_data)
-                
-                # Analisar órgãos mais frequentes
-                analysis["orgaos_frequentes"] = self._analyze_frequent_organs(sample_data)
+            profile = self._get_profile(csv_path)
+            logger.info(f"📝 Encoding utilizado: {profile.encoding}")
+            
+            analysis = profile.to_dict()
+            
+            # Valores monetários (arquivo completo, não apenas uma amostra)
+            analysis["analise_valores"] = {
+                "empenhado": profile.value_summary("Valor Empenhado (R$)"),
+                "liquidado": profile.value_summary("Valor Liquidado (R$)"),
+                "pago": profile.value_summary("Valor Pago (R$)"),
+            }
+            
+            # Órgãos mais frequentes (sketch Space-Saving)
+            analysis["orgaos_frequentes"] = profile.top_k(10)
             
         except Exception as e:
             logger.warning(f"⚠️ Erro na análise detalhada: {e}")
-            analysis["erro_analise"] = str(e)
-        
-        return analysis
-
-    def _analyze_monetary_values(self, sample_data: list) -> Dict:
-        """Analisa os valores monetários na amostra."""
-        valores_empenhados = []
-        valores_liquidados = []
-        valores_pagos = []
-        
-        for row in sample_data:
-            try:
-                # Limpar e converter valores monetários
-                emp = row.get('"Valor Empenhado (R$)"', '0').replace('"', '').replace(',', '.')
-                liq = row.get('"Valor Liquidado (R$)"', '0').replace('"', '').replace(',', '.')
-                pag = row.get('"Valor Pago (R$)"', '0').replace('"', '').replace(',', '.')
-                
-                if emp and emp != '0':
-                    valores_empenhados.append(float(emp))
-                if liq and liq != '0':
-                    valores_liquidados.append(float(liq))
-                if pag and pag != '0':
-                    valores_pagos.append(float(pag))
-                    
-            except (ValueError, KeyError):
-                continue
-        
-        return {
-            "empenhado": {
-                "total_registros": len(valores_empenhados),
-                "soma": sum(valores_empenhados),
-                "media": sum(valores_empenhados) / len(valores_empenhados) if valores_empenhados else 0,
-                "maximo": max(valores_empenhados) if valores_empenhados else 0
-            },
-            "liquidado": {
-                "total_registros": len(valores_liquidados),
-                "soma": sum(valores_liquidados),
-                "media": sum(valores_liquidados) / len(valores_liquidados) if valores_liquidados else 0
-            },
-            "pago": {
-                "total_registros": len(valores_pagos),
-                "soma": sum(valores_pagos),
-                "media": sum(valores_pagos) / len(valores_pagos) if valores_pagos else 0
+            analysis = {
+                "arquivo": csv_path.name,
+                "tamanho_mb": csv_path.stat().st_size / 1024 / 1024,
+                "timestamp_processamento": datetime.now().isoformat(),
+                "colunas": [],
+                "total_colunas": 0,
+                "total_linhas": 0,
+                "total_registros": 0,
+                "erro_analise": str(e),
             }
-        }
-
-    def _analyze_frequent_organs(self, sample_data: list) -> Dict:
-        """Analisa os órgãos mais frequentes na amostra."""
-        organs = {}
-        
-        for row in sample_data:
-            try:
-                organ_name = row.get('"Nome Órgão Superior"', '').replace('"', '').strip()
-                if organ_name and organ_name != 'Sem informação':
-                    organs[organ_name] = organs.get(organ_name, 0) + 1
-            except KeyError:
-                continue
         
-        # Retornar os 10 mais frequentes
-        sorted_organs = sorted(organs.items(), key=lambda x: x[1], reverse=True)[:10]
-        return dict(sorted_organs)
+        return analysis
 
     def _generate_analysis_report(self, analysis: Dict, csv_path: Path):
         """Gera um relatório detalhado da análise."""
@@ -346,6 +264,14 @@ class SiafiDataAcquirer:
             f.write(f"Total de Linhas: {analysis['total_linhas']:,}\n")
             f.write(f"Total de Registros: {analysis['total_registros']:,}\n\n")
             
+            if analysis.get('taxa_nulos'):
+                f.write("COLUNAS COM VALORES NULOS:\n")
+                f.write("-" * 40 + "\n")
+                for col, rate in analysis['taxa_nulos'].items():
+                    if rate > 0:
+                        f.write(f"  {col}: {rate:.1%}\n")
+                f.write("\n")
+            
             if 'analise_valores' in analysis:
                 f.write("ANÁLISE DE VALORES MONETÁRIOS:\n")
                 f.write("-" * 40 + "\n")
@@ -355,7 +281,13 @@ class SiafiDataAcquirer:
                 f.write(f"  Registros com valores: {valores['empenhado']['total_registros']:,}\n")
                 f.write(f"  Soma total: R$ {valores['empenhado']['soma']:,.2f}\n")
                 f.write(f"  Valor médio: R$ {valores['empenhado']['media']:,.2f}\n")
-                f.write(f"  Maior valor: R$ {valores['empenhado']['maximo']:,.2f}\n\n")
+                f.write(f"  Menor valor: R$ {valores['empenhado']['minimo']:,.2f}\n")
+                f.write(f"  Maior valor: R$ {valores['empenhado']['maximo']:,.2f}\n")
+                if 'p50' in valores['empenhado']:
+                    f.write(f"  Mediana (aprox.): R$ {valores['empenhado']['p50']:,.2f}\n")
+                    f.write(f"  P90 (aprox.): R$ {valores['empenhado']['p90']:,.2f}\n")
+                    f.write(f"  P99 (aprox.): R$ {valores['empenhado']['p99']:,.2f}\n")
+                f.write("\n")
                 
                 f.write(f"VALORES LIQUIDADOS:\n")
                 f.write(f"  Registros com valores: {valores['liquidado']['total_registros']:,}\n")
@@ -365,6 +297,13 @@ class SiafiDataAcquirer:
                 f.write(f"  Registros com valores: {valores['pago']['total_registros']:,}\n")
                 f.write(f"  Soma total: R$ {valores['pago']['soma']:,.2f}\n\n")
             
+            if analysis.get('distintos'):
+                f.write("VALORES DISTINTOS (ESTIMATIVA HYPERLOGLOG):\n")
+                f.write("-" * 40 + "\n")
+                for col, count in analysis['distintos'].items():
+                    f.write(f"  {col}: ~{count:,}\n")
+                f.write("\n")
+            
             if 'orgaos_frequentes' in analysis:
                 f.write("ÓRGÃOS MAIS FREQUENTES (TOP 10):\n")
                 f.write("-" * 40 + "\n")
@@ -375,27 +314,19 @@ class SiafiDataAcquirer:
             f.write("ESTRUTURA DE COLUNAS:\n")
             f.write("-" * 40 + "\n")
             for i, col in enumerate(analysis['colunas'], 1):
-                clean_col = col.replace('"', '').strip()
-                f.write(f"{i:2d}. {clean_col}\n")
+                f.write(f"{i:2d}. {col}\n")
         
         logger.info(f"📋 Relatório de análise salvo: {report_path.name}")
 
     def _create_sample_data(self, csv_path: Path):
-        """Cria uma amostra dos dados para análise rápida."""
+        """Cria uma amostra aleatória dos dados para análise rápida."""
         timestamp = datetime.now().strftime("%Y-%m-%d")
         sample_path = self.processed_dir / f"siafi_amostra_1000_registros_{timestamp}.csv"
         
         try:
-            with open(csv_path, 'r', encoding='utf-8') as source:
-                lines = source.readlines()
-                
-                # Pegar cabeçalho + primeiros 1000 registros
-                sample_lines = lines[:1001] if len(lines) > 1001 else lines
-                
-                with open(sample_path, 'w', encoding='utf-8') as target:
-                    target.writelines(sample_lines)
-            
-            logger.info(f"📊 Amostra criada: {sample_path.name} ({len(sample_lines)-1} registros)")
+            # Amostra uniforme (reservoir) coletada durante o perfil do arquivo
+            written = self._get_profile(csv_path).write_sample(sample_path)
+            logger.info(f"📊 Amostra criada: {sample_path.name} ({written} registros)")
             
         except Exception as e:
             logger.warning(f"⚠️ Erro ao criar amostra: {e}")
@@ -447,8 +378,8 @@ class SiafiDataAcquirer:
             f.write("-" * 40 + "\n")
             if raw_files:
                 latest_raw = max(raw_files, key=lambda x: x.stat().st_mtime)
-                line_count = self._count_csv_lines(latest_raw)
-                f.write(f"Total de registros SIAFI: {line_count-1:,}\n")
+                profile = self._get_profile(latest_raw)
+                f.write(f"Total de registros SIAFI: {profile.total_records:,}\n")
                 f.write(f"Tamanho do dataset: {latest_raw.stat().st_size / 1024 / 1024:.2f} MB\n")
             
             f.write(f"\nStatus: ✅ POC CONCLUÍDA COM SUCESSO!\n")
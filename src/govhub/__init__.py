@@ -7,6 +7,8 @@ governamentais brasileiras (SIAFI, Compras.gov.br, TransfereGov).
 Arquitetura Refatorada:
     - core/: Módulos principais (acquisition, integration, processor, advanced_integration)
     - utils/: Utilitários e validadores (validation)
+    - datasets: API preguiçosa de consulta aos datasets (`govhub.datasets.siafi()`)
+    - cli: Ponto de entrada único (`python -m govhub <comando>`)
     
 Características:
     ✅ Estrutura modular e escalável
@@ -14,18 +16,36 @@ Características:
     ✅ Sistema completo de validação
     ✅ Integração avançada de múltiplas fontes
     ✅ Logging detalhado e relatórios abrangentes
+
+As classes principais são importadas sob demanda (PEP 562): `import govhub`
+não carrega pandas nem requests até que uma delas seja usada.
 """
 
+import importlib
+from typing import TYPE_CHECKING
+
 __version__ = "2.0.0"
 __author__ = "Gov-Hub Team"
 __description__ = "Plataforma Modular de Integração de Dados Governamentais"
 
-# Importações principais para facilitar o uso
-from .core.acquisition import GovHubDataAcquirer
-from .core.integration import DataIntegrator
-from .core.processor import SiafiLargeFileProcessor
-from .core.advanced_integration import AdvancedDataIntegrator
-from .utils.validation import SystemValidator
+# Importações principais para facilitar o uso (carregadas sob demanda)
+_LAZY_ATTRIBUTES = {
+    "GovHubDataAcquirer": ".core.acquisition",
+    "DataIntegrator": ".core.integration",
+    "SiafiLargeFileProcessor": ".core.processor",
+    "AdvancedDataIntegrator": ".core.advanced_integration",
+    "SystemValidator": ".utils.validation",
+}
+
+# Submódulos acessíveis como atributo (ex.: `govhub.datasets.siafi()`)
+_LAZY_SUBMODULES = ("datasets",)
+
+if TYPE_CHECKING:
+    from .core.acquisition import GovHubDataAcquirer
+    from .core.integration import DataIntegrator
+    from .core.processor import SiafiLargeFileProcessor
+    from .core.advanced_integration import AdvancedDataIntegrator
+    from .utils.validation import SystemValidator
 
 __all__ = [
     "GovHubDataAcquirer",
@@ -34,3 +54,21 @@ __all__ = [
     "AdvancedDataIntegrator",
     "SystemValidator"
 ]
+
+
+def __getattr__(name: str):
+    """Importa o módulo da classe pedida no primeiro acesso."""
+    if name in _LAZY_SUBMODULES:
+        return importlib.import_module(f".{name}", __name__)
+
+    module_name = _LAZY_ATTRIBUTES.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_ATTRIBUTES) | set(_LAZY_SUBMODULES))
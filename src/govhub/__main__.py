@@ -0,0 +1,7 @@
+"""Permite executar o Gov-Hub com `python -m govhub <comando>`."""
+
+import sys
+
+from .cli import main
+
+sys.exit(main())
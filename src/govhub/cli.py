@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+Gov-Hub CLI Module
+Ponto de entrada único da linha de comando do Gov-Hub.
+
+Cada subcomando delega para a função `main()` do módulo correspondente, que
+só é importado quando o subcomando é executado. Assim, `govhub --help` e
+invocações curtas (cron) não carregam pandas nem requests.
+
+Uso:
+    python -m govhub <comando> [opções do comando]
+    python -m govhub acquire --source siafi --resume
+    python -m govhub pipeline --parse-workers 4
+"""
+
+import argparse
+import importlib
+import sys
+from typing import Dict, List, Optional, Tuple
+
+from . import __version__
+
+# Subcomando -> (módulo com main(), descrição)
+COMMANDS: Dict[str, Tuple[str, str]] = {
+    "acquire": (
+        "govhub.core.acquisition",
+        "Aquisição de dados (SIAFI, Compras.gov.br, TransfereGov)",
+    ),
+    "process": (
+        "govhub.core.processor",
+        "Processamento de arquivos grandes do SIAFI",
+    ),
+    "integrate": (
+        "govhub.core.integration",
+        "Integração padrão das fontes",
+    ),
+    "integrate-advanced": (
+        "govhub.core.advanced_integration",
+        "Integração avançada e relatórios de dados em larga escala",
+    ),
+    "pipeline": (
+        "govhub.core.pipeline",
+        "Aquisição, parsing e integração em paralelo (DAG)",
+    ),
+    "quality": (
+        "govhub.core.quality",
+        "Validação de qualidade dos dados (regras vetorizadas)",
+    ),
+    "warehouse": (
+        "govhub.core.warehouse",
+        "Carga de empenhos em banco embarcado (SQLite/DuckDB)",
+    ),
+    "transparencia": (
+        "govhub.core.transparencia",
+        "Coleta assíncrona de cartões do Portal da Transparência",
+    ),
+    "validate": (
+        "govhub.utils.validation",
+        "Validação completa do sistema",
+    ),
+}
+
+# Subcomandos cujo main() não lê argumentos: o --help é tratado aqui, sem
+# importar (nem executar) o módulo
+ARGLESS_COMMANDS = frozenset({"process", "integrate-advanced", "validate"})
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Cria o parser com os subcomandos disponíveis."""
+    parser = argparse.ArgumentParser(
+        prog="govhub",
+        description="Gov-Hub - Plataforma de Integração de Dados Governamentais",
+        epilog="Use 'govhub <comando> --help' para as opções de cada comando.",
+    )
+    parser.add_argument(
+        "--version", action="version", version=f"%(prog)s {__version__}"
+    )
+
+    subparsers = parser.add_subparsers(dest="command", metavar="<comando>")
+    for name, (_, description) in COMMANDS.items():
+        if name in ARGLESS_COMMANDS:
+            subparsers.add_parser(name, help=description, description=description)
+        else:
+            # As opções de cada comando são tratadas pelo próprio módulo
+            subparsers.add_parser(name, help=description, add_help=False)
+
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """
+    Executa o subcomando informado.
+
+    Args:
+        argv: Argumentos da linha de comando (padrão: sys.argv[1:])
+
+    Returns:
+        Código de saída do subcomando
+    """
+    parser = build_parser()
+    args, remaining = parser.parse_known_args(argv)
+
+    if args.command is None:
+        parser.print_help()
+        return 1
+
+    if args.command in ARGLESS_COMMANDS and remaining:
+        parser.error(
+            f"o comando '{args.command}' não aceita opções: {' '.join(remaining)}"
+        )
+
+    module_name, _ = COMMANDS[args.command]
+    module = importlib.import_module(module_name)
+
+    # O main() de cada módulo lê sys.argv com seu próprio argparse
+    sys.argv = [f"govhub {args.command}", *remaining]
+    return module.main() or 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -3,26 +3,88 @@ Gov-Hub Core Module
 Módulos principais do sistema Gov-Hub.
 
 Este módulo contém as funcionalidades centrais para aquisição, integração
-e processamento de dados governamentais.
+e processamento de dados governamentais. As classes são importadas sob
+demanda (PEP 562), de modo que `import govhub.core` não carrega pandas.
 
 Módulos:
     acquisition: Aquisição robusta de dados governamentais
     integration: Integração padrão de dados
     processor: Processamento de arquivos grandes (SIAFI)
     advanced_integration: Integração avançada para dados em larga escala
+    transparencia: Coleta assíncrona do Portal da Transparência
+    records: Representação compacta de linhas para integração
+    dictionary: Codificação categórica e dicionário de códigos SIAFI
+    pipeline: Execução em DAG de aquisição, parsing e integração
+    quality: Validação declarativa da qualidade dos dados
+    documents: Normalização vetorizada de CNPJ/CPF
+    entity_resolution: Crosswalk UG/UASG/TransfereGov por código e nome
+    external_join: Join fora da memória com saída particionada
+    warehouse: Carga idempotente de empenhos em banco embarcado
 """
 
+import importlib
+from typing import TYPE_CHECKING
+
 __version__ = "2.0.0"
 __author__ = "Gov-Hub Team"
 
-from .acquisition import GovHubDataAcquirer
-from .integration import DataIntegrator
-from .processor import SiafiLargeFileProcessor
-from .advanced_integration import AdvancedDataIntegrator
+_LAZY_ATTRIBUTES = {
+    "GovHubDataAcquirer": ".acquisition",
+    "DataIntegrator": ".integration",
+    "SiafiLargeFileProcessor": ".processor",
+    "AdvancedDataIntegrator": ".advanced_integration",
+    "AsyncTransparenciaCollector": ".transparencia",
+    "SiafiDictionary": ".dictionary",
+    "PipelineRunner": ".pipeline",
+    "DataQualityEngine": ".quality",
+    "normalize_credor_columns": ".documents",
+    "parse_documents": ".documents",
+    "EntityResolver": ".entity_resolution",
+    "SortMergeJoin": ".external_join",
+    "WarehouseSink": ".warehouse",
+}
+
+if TYPE_CHECKING:
+    from .acquisition import GovHubDataAcquirer
+    from .integration import DataIntegrator
+    from .processor import SiafiLargeFileProcessor
+    from .advanced_integration import AdvancedDataIntegrator
+    from .transparencia import AsyncTransparenciaCollector
+    from .dictionary import SiafiDictionary
+    from .pipeline import PipelineRunner
+    from .quality import DataQualityEngine
+    from .documents import normalize_credor_columns, parse_documents
+    from .entity_resolution import EntityResolver
+    from .external_join import SortMergeJoin
+    from .warehouse import WarehouseSink
 
 __all__ = [
     "GovHubDataAcquirer",
     "DataIntegrator",
     "SiafiLargeFileProcessor", 
     "AdvancedDataIntegrator",
+    "AsyncTransparenciaCollector",
+    "SiafiDictionary",
+    "PipelineRunner",
+    "DataQualityEngine",
+    "normalize_credor_columns",
+    "parse_documents",
+    "EntityResolver",
+    "SortMergeJoin",
+    "WarehouseSink",
 ]
+
+
+def __getattr__(name: str):
+    """Importa o módulo da classe pedida no primeiro acesso."""
+    module_name = _LAZY_ATTRIBUTES.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_ATTRIBUTES))
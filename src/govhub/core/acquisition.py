@@ -14,22 +14,33 @@ import argparse
 import json
 import logging
 import ssl
+import threading
 import time
 import zipfile
 import requests
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, Optional
+from typing import Callable, Dict, List, Optional, Tuple
 
 import pandas as pd
 
-# Configuração de SSL para evitar erros de certificado
-ssl._create_default_https_context = ssl._create_unverified_context
+from ..utils.checkpoint import CheckpointStore
 
 # Configuração de logging
 logger = logging.getLogger(__name__)
 
 
+def _disable_ssl_verification() -> None:
+    """
+    Desativa a verificação de certificados SSL do urllib.
+
+    Alguns portais gov têm cadeias de certificado incompletas. O ajuste é
+    global, por isso é aplicado apenas ao criar o GovHubDataAcquirer, e não
+    na importação do módulo.
+    """
+    ssl._create_default_https_context = ssl._create_unverified_context
+
+
 class GovHubDataAcquirer:
     """
     Classe principal para aquisição robusta de dados governamentais.
@@ -40,15 +51,20 @@ class GovHubDataAcquirer:
     - Download de dados do TransfereGov
     - Fallback automático para dados de amostra
     - Tratamento robusto de exceções
+    - Checkpoints para retomada de execuções interrompidas
     """
 
-    def __init__(self, config_path: str = "config/config.json"):
+    def __init__(self, config_path: str = "config/config.json", resume: bool = False):
         """
         Inicializa o Data Acquirer com configurações externas.
 
         Args:
             config_path: Caminho para o arquivo de configuração JSON
+            resume: Retomar a partir do checkpoint da execução anterior
         """
+        # Configuração de SSL para evitar erros de certificado
+        _disable_ssl_verification()
+
         self.config = self._load_configuration(config_path)
         self.output_dir = Path(self.config["file_settings"]["raw_data_dir"])
         self.temp_dir = Path(self.config["file_settings"]["temp_dir"])
@@ -64,10 +80,47 @@ class GovHubDataAcquirer:
         self.retry_delay = self.config["download_settings"]["retry_delay"]
         self.rate_limit_delay = self.config["download_settings"]["rate_limit_delay"]
 
+        # CSVs gravados pela chamada de download em curso, por thread
+        self._local = threading.local()
+
+        # Checkpoints de páginas e fontes concluídas
+        self.checkpoint = CheckpointStore(
+            "acquisition",
+            checkpoint_dir=self.config["file_settings"].get(
+                "checkpoint_dir", "data/checkpoints"
+            ),
+            resume=resume,
+        )
+
         logger.info("GovHub Data Acquirer inicializado com sucesso")
         logger.info(f"Diretório de saída: {self.output_dir}")
         logger.info(f"Diretório temporário: {self.temp_dir}")
 
+    def _register_output(self, path: Path) -> None:
+        """Registra um CSV gravado pela chamada de download em curso."""
+        outputs = getattr(self._local, "outputs", None)
+        if outputs is not None:
+            outputs.append(Path(path))
+
+    def collect_outputs(self, download: Callable[[], bool]) -> Tuple[bool, List[Path]]:
+        """
+        Executa um download e coleta os CSVs gravados por ele.
+
+        Seguro para downloads concorrentes (um registro por thread).
+
+        Args:
+            download: Método de download (ex.: `download_siafi_data`)
+
+        Returns:
+            Tupla (sucesso, CSVs gravados pela chamada, incluindo amostras)
+        """
+        self._local.outputs = []
+        try:
+            success = download()
+        finally:
+            outputs, self._local.outputs = self._local.outputs, None
+        return success, outputs
+
     def _load_configuration(self, config_path: str) -> Dict:
         """Carrega configurações do arquivo JSON."""
         try:
@@ -202,6 +255,7 @@ class GovHubDataAcquirer:
 
                         # Mover arquivo
                         src_path.rename(dest_path)
+                        self._register_output(dest_path)
                         logger.info(f"✅ Arquivo CSV extraído: {dest_path}")
 
                 # Remover arquivo ZIP temporário
@@ -271,6 +325,8 @@ class GovHubDataAcquirer:
                     logger.info("✅ Arquivo ZIP extraído com sucesso")
                 else:
                     logger.warning("⚠️ Problemas na extração do ZIP")
+            else:
+                self._register_output(file_path)
 
             return file_path
 
@@ -448,10 +504,21 @@ class GovHubDataAcquirer:
             all_data = []
             page = 0
             max_pages = self.config["download_settings"]["max_pages"]
+            series = {"limit": 100}
 
             while page < max_pages:
                 params = {"offset": page * 100, "limit": 100}
 
+                # Reaproveitar página concluída em execução anterior
+                page_data = self.checkpoint.load_page(base_url, series, page)
+                if page_data is not None:
+                    logger.info(f"♻️ Página {page + 1} recuperada do checkpoint")
+                    all_data.extend(page_data)
+                    if len(page_data) < 100:
+                        break
+                    page += 1
+                    continue
+
                 logger.info(f"Baixando página {page + 1}/{max_pages}...")
 
                 response = self._make_http_request(base_url, headers, params)
@@ -473,6 +540,8 @@ class GovHubDataAcquirer:
                         )
                         break
 
+                    self.checkpoint.record_page(base_url, series, page, page_data)
+
                     if not page_data:
                         logger.info("Não há mais dados para baixar")
                         break
@@ -499,6 +568,7 @@ class GovHubDataAcquirer:
                 output_file = self.output_dir / f"{resource_name}_{timestamp}.csv"
 
                 df.to_csv(output_file, index=False, encoding="utf-8")
+                self._register_output(output_file)
                 logger.info(f"✅ {len(all_data)} registros salvos em: {output_file}")
                 return True
             else:
@@ -548,6 +618,7 @@ class GovHubDataAcquirer:
                     output_file = self.output_dir / f"transferegov_{timestamp}.csv"
 
                     df.to_csv(output_file, index=False, encoding="utf-8")
+                    self._register_output(output_file)
                     logger.info(
                         f"✅ {len(records)} registros TransfereGov salvos em: {output_file}"
                     )
@@ -698,6 +769,7 @@ class GovHubDataAcquirer:
             df = pd.DataFrame(data)
             output_file = self.output_dir / filename
             df.to_csv(output_file, index=False, encoding="utf-8")
+            self._register_output(output_file)
 
             file_size = output_file.stat().st_size
             logger.info(f"✅ Dados de amostra criados: {output_file}")
@@ -717,22 +789,33 @@ class GovHubDataAcquirer:
         logger.info(f"Data/Hora: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
 
         results = {}
+        sources = [
+            ("siafi", self.download_siafi_data),
+            ("compras", self.download_compras_data),
+            ("transferegov", self.download_transferegov_data),
+        ]
 
         try:
-            # SIAFI
-            logger.info("\n" + "=" * 60)
-            results["siafi"] = self.download_siafi_data()
+            for source, download in sources:
+                logger.info("\n" + "=" * 60)
 
-            # Compras.gov.br
-            logger.info("\n" + "=" * 60)
-            results["compras"] = self.download_compras_data()
+                # Fontes concluídas em execução anterior não são baixadas de novo
+                if self.checkpoint.is_finished(source):
+                    logger.info(f"♻️ {source.upper()} já concluído (checkpoint)")
+                    results[source] = True
+                    continue
 
-            # TransfereGov
-            logger.info("\n" + "=" * 60)
-            results["transferegov"] = self.download_transferegov_data()
+                # Os CSVs produzidos ficam no checkpoint para que `pipeline
+                # --resume` saiba o que emitir para esta fonte
+                results[source], paths = self.collect_outputs(download)
+                if results[source]:
+                    self.checkpoint.mark_finished(
+                        source, files=[str(path) for path in paths]
+                    )
 
         except KeyboardInterrupt:
             logger.warning("⚠️ Interrompido pelo usuário")
+            logger.info("💡 Execute novamente com --resume para continuar")
             return results
         except Exception as e:
             logger.error(f"❌ Erro crítico durante aquisição: {e}")
@@ -789,6 +872,12 @@ def main():
         help="Caminho para arquivo de configuração (padrão: config/config.json)",
     )
 
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="Retoma a execução anterior a partir do último checkpoint",
+    )
+
     args = parser.parse_args()
 
     try:
@@ -804,7 +893,7 @@ def main():
 
         # Inicializar o Data Acquirer
         logger.info("Inicializando Gov-Hub Data Acquirer...")
-        acquirer = GovHubDataAcquirer(config_path=args.config)
+        acquirer = GovHubDataAcquirer(config_path=args.config, resume=args.resume)
 
         # Executar downloads
         if args.source == "all":
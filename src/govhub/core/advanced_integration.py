@@ -16,6 +16,9 @@ from pathlib import Path
 from datetime import datetime
 from typing import Dict, List, Optional, Tuple, Any
 
+from .dictionary import SiafiDictionary, siafi_categorical_dtypes
+from .documents import CREDOR_KEY_COLUMN, credor_dtypes, normalize_credor_columns
+
 logger = logging.getLogger(__name__)
 
 
@@ -27,18 +30,29 @@ class AdvancedDataIntegrator:
     with 48k+ records.
     """
     
-    def __init__(self, raw_data_dir: str = "data/raw", processed_data_dir: str = "data/processed"):
+    def __init__(
+        self,
+        raw_data_dir: str = "data/raw",
+        processed_data_dir: str = "data/processed",
+        reference_dir: str = "data/reference",
+    ):
         """
         Inicializa o integrador avançado.
 
         Args:
             raw_data_dir: Diretório com dados brutos
             processed_data_dir: Diretório para dados processados
+            reference_dir: Diretório do dicionário SIAFI persistente
         """
         self.raw_dir = Path(raw_data_dir)
         self.processed_dir = Path(processed_data_dir)
         self.processed_dir.mkdir(parents=True, exist_ok=True)
 
+        # Dicionário código→nome compartilhado entre arquivos
+        self.dictionary = SiafiDictionary(
+            str(Path(reference_dir) / "siafi_dicionario.json")
+        )
+
         # Mapeamento para identificar colunas-chave por fonte
         self.key_mappings = {
             "siafi": [
@@ -75,14 +89,26 @@ class AdvancedDataIntegrator:
         else:
             return "unknown"
 
-    def load_large_csv_safely(self, filepath: Path, max_rows: Optional[int] = None) -> Optional[pd.DataFrame]:
+    def load_large_csv_safely(
+        self,
+        filepath: Path,
+        max_rows: Optional[int] = None,
+        lazy_names: bool = False,
+    ) -> Optional[pd.DataFrame]:
         """
         Carrega arquivo CSV grande de forma segura com múltiplos encodings.
-        
+
+        Colunas de dimensão do SIAFI (órgão, UG, função, elemento...) são
+        lidas como categóricas, e seus pares código/nome alimentam o
+        dicionário SIAFI persistente. Colunas de credor (CNPJ/CPF) são lidas
+        como texto e normalizadas, com a chave int64 em `credor_chave`.
+
         Args:
             filepath: Caminho para o arquivo
             max_rows: Número máximo de registros a carregar
-            
+            lazy_names: Remove as colunas de nome, mantendo apenas os códigos
+                (os nomes podem ser reanexados com `dictionary.join_names`)
+
         Returns:
             DataFrame carregado ou None se falhar
         """
@@ -106,7 +132,16 @@ class AdvancedDataIntegrator:
                         
                         if max_rows:
                             kwargs["nrows"] = max_rows
-                        
+
+                        # Ler o cabeçalho para definir os dtypes categóricos
+                        header = pd.read_csv(
+                            filepath, nrows=0, encoding=encoding, sep=sep
+                        )
+                        dtypes = siafi_categorical_dtypes(header.columns)
+                        dtypes.update(credor_dtypes(header.columns))
+                        if dtypes:
+                            kwargs["dtype"] = dtypes
+
                         df = pd.read_csv(filepath, **kwargs)
                         logger.info(f"Arquivo carregado com encoding: {encoding}, separador: '{sep}'")
                         break
@@ -124,6 +159,13 @@ class AdvancedDataIntegrator:
                 logger.error(f"Não foi possível carregar {filepath}")
                 return None
 
+            # Registrar códigos/nomes no dicionário compartilhado
+            if self.dictionary.update_from_frame(df):
+                self.dictionary.save()
+            if lazy_names:
+                df = self.dictionary.drop_names(df)
+            normalize_credor_columns(df)
+
             logger.info(f"✅ Carregados {len(df)} registros de {filepath.name}")
             logger.info(f"   📊 Colunas: {list(df.columns)[:5]}...")
             
@@ -188,6 +230,10 @@ class AdvancedDataIntegrator:
                 elif "codigo" in col_lower or "código" in col_lower:
                     processed[f"codigo_{col.lower().replace(' ', '_')}"] = df[col]
 
+            # Chave do credor, para joins com as demais fontes
+            if CREDOR_KEY_COLUMN in df.columns:
+                processed[CREDOR_KEY_COLUMN] = df[CREDOR_KEY_COLUMN]
+
             # Adicionar metadados
             processed["fonte"] = "SIAFI"
             processed["data_processamento"] = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
@@ -233,6 +279,72 @@ class AdvancedDataIntegrator:
             logger.warning(f"Erro ao limpar valores monetários: {e}")
             return series
 
+    def process_file(
+        self, file_path: Path, max_large_file_rows: int = 1000
+    ) -> Optional[Tuple[str, pd.DataFrame, Dict]]:
+        """
+        Carrega e processa um único arquivo CSV.
+
+        Args:
+            file_path: Caminho do arquivo
+            max_large_file_rows: Número máximo de registros para arquivos grandes
+
+        Returns:
+            Tupla (chave do conjunto, dados processados, estatísticas) ou None
+        """
+        logger.info(f"\n--- Processando: {file_path.name} ---")
+
+        source = self.detect_file_source(file_path.name)
+        logger.info(f"🏷️ Fonte detectada: {source}")
+
+        # Verificar tamanho do arquivo
+        file_size_mb = file_path.stat().st_size / (1024 * 1024)
+        logger.info(f"📏 Tamanho: {file_size_mb:.1f} MB")
+
+        # Determinar estratégia de carregamento
+        max_rows = None
+        if file_size_mb > 10:  # Arquivos maiores que 10MB
+            max_rows = max_large_file_rows
+            logger.info(f"📊 Arquivo grande detectado, limitando a {max_rows} registros")
+
+        # Carregar arquivo
+        df = self.load_large_csv_safely(file_path, max_rows=max_rows)
+
+        if df is None or len(df) == 0:
+            return None
+
+        # Processar baseado na fonte detectada
+        if source == "siafi" and file_size_mb > 1:  # SIAFI real
+            processed_df = self.process_siafi_data_advanced(df)
+            if processed_df is None:
+                return None
+            return (
+                f"siafi_real_{file_path.stem}",
+                processed_df,
+                {
+                    "fonte": "SIAFI (Real)",
+                    "registros": len(processed_df),
+                    "tamanho_mb": file_size_mb,
+                    "valor_total": (
+                        processed_df["valor_empenhado"].sum()
+                        if "valor_empenhado" in processed_df.columns
+                        else 0
+                    ),
+                },
+            )
+
+        # Outros arquivos (samples ou pequenos)
+        return (
+            f"{source}_{file_path.stem}",
+            df,
+            {
+                "fonte": source.upper(),
+                "registros": len(df),
+                "tamanho_mb": file_size_mb,
+                "principais_colunas": list(df.columns)[:3],
+            },
+        )
+
     def process_all_available_files(self, max_large_file_rows: int = 1000) -> Tuple[Dict[str, pd.DataFrame], Dict[str, Dict]]:
         """
         Processa todos os arquivos disponíveis no diretório.
@@ -253,53 +365,39 @@ class AdvancedDataIntegrator:
         logger.info(f"📁 Encontrados {len(csv_files)} arquivos CSV")
 
         for file_path in csv_files:
-            logger.info(f"\n--- Processando: {file_path.name} ---")
-
-            source = self.detect_file_source(file_path.name)
-            logger.info(f"🏷️ Fonte detectada: {source}")
-
-            # Verificar tamanho do arquivo
-            file_size_mb = file_path.stat().st_size / (1024 * 1024)
-            logger.info(f"📏 Tamanho: {file_size_mb:.1f} MB")
+            result = self.process_file(file_path, max_large_file_rows)
+            if result is not None:
+                key, processed_df, stats = result
+                all_data[key] = processed_df
+                summary_stats[file_path.name] = stats
 
-            # Determinar estratégia de carregamento
-            max_rows = None
-            if file_size_mb > 10:  # Arquivos maiores que 10MB
-                max_rows = max_large_file_rows
-                logger.info(f"📊 Arquivo grande detectado, limitando a {max_rows} registros")
+        return all_data, summary_stats
 
-            # Carregar arquivo
-            df = self.load_large_csv_safely(file_path, max_rows=max_rows)
+    def match_credores(self, all_data: Dict[str, pd.DataFrame]) -> Dict[str, int]:
+        """
+        Conta os credores em comum entre SIAFI e Compras pela chave int64.
 
-            if df is not None and len(df) > 0:
-                # Processar baseado na fonte detectada
-                processed_df = df
-                
-                if source == "siafi" and file_size_mb > 1:  # SIAFI real
-                    processed_df = self.process_siafi_data_advanced(df)
-                    if processed_df is not None:
-                        all_data[f"siafi_real_{file_path.stem}"] = processed_df
-                        summary_stats[file_path.name] = {
-                            "fonte": "SIAFI (Real)",
-                            "registros": len(processed_df),
-                            "tamanho_mb": file_size_mb,
-                            "valor_total": (
-                                processed_df["valor_empenhado"].sum()
-                                if "valor_empenhado" in processed_df.columns
-                                else 0
-                            ),
-                        }
-                else:
-                    # Outros arquivos (samples ou pequenos)
-                    all_data[f"{source}_{file_path.stem}"] = processed_df
-                    summary_stats[file_path.name] = {
-                        "fonte": source.upper(),
-                        "registros": len(processed_df),
-                        "tamanho_mb": file_size_mb,
-                        "principais_colunas": list(processed_df.columns)[:3],
-                    }
+        Args:
+            all_data: Dados processados (chave do conjunto -> DataFrame)
 
-        return all_data, summary_stats
+        Returns:
+            Credores distintos por fonte e em comum
+        """
+        keys: Dict[str, List[pd.Series]] = {"siafi": [], "compras": []}
+        for name, df in all_data.items():
+            source = name.split("_", 1)[0]
+            if source in keys and CREDOR_KEY_COLUMN in df.columns:
+                keys[source].append(df[CREDOR_KEY_COLUMN].dropna())
+
+        distinct = {
+            source: pd.Index(pd.concat(series).unique()) if series else pd.Index([])
+            for source, series in keys.items()
+        }
+        return {
+            "credores_siafi": len(distinct["siafi"]),
+            "credores_compras": len(distinct["compras"]),
+            "credores_em_comum": len(distinct["siafi"].intersection(distinct["compras"])),
+        }
 
     def generate_comprehensive_report(self, all_data: Dict[str, pd.DataFrame], summary_stats: Dict[str, Dict]) -> str:
         """
@@ -367,6 +465,17 @@ class AdvancedDataIntegrator:
                 "",
             ])
 
+        # Credores em comum entre as fontes (CNPJ/CPF normalizados)
+        credores = self.match_credores(all_data)
+        if credores["credores_siafi"] and credores["credores_compras"]:
+            report_lines.extend([
+                "🤝 CREDORES SIAFI x COMPRAS:",
+                f"   • Credores distintos no SIAFI: {credores['credores_siafi']:,}",
+                f"   • Fornecedores distintos no Compras: {credores['credores_compras']:,}",
+                f"   • Em comum: {credores['credores_em_comum']:,}",
+                "",
+            ])
+
         # Avaliação da qualidade dos dados
         real_sources = [s for s in sources_summary.keys() if "Real" in s]
         report_lines.extend([
@@ -0,0 +1,241 @@
+#!/usr/bin/env python3
+"""
+Gov-Hub SIAFI Dictionary Module
+Codificação categórica e dicionário persistente de códigos do SIAFI.
+
+Os arquivos de despesas do SIAFI repetem os mesmos nomes de órgão, unidade
+gestora, função e elemento de despesa milhões de vezes. Este módulo define o
+esquema das dimensões do SIAFI (pares código/nome), gera os dtypes
+categóricos usados na leitura dos CSVs e mantém um dicionário código→nome
+persistente, compartilhado entre arquivos, para que os nomes possam ser
+descartados dos DataFrames e reanexados sob demanda. As dimensões de
+referência (UGs, funções e modalidades) também são publicadas no
+`ReferenceCache`, ao lado dos órgãos SIAFI consultados na API.
+
+Classes:
+    SiafiDictionary: Dicionário persistente código→nome por dimensão
+"""
+
+import json
+import logging
+import os
+import threading
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import pandas as pd
+
+from ..utils.reference_cache import ReferenceCache
+
+logger = logging.getLogger(__name__)
+
+# Dimensões do SIAFI: nome da dimensão -> (coluna de código, coluna de nome)
+SIAFI_DIMENSIONS: Dict[str, Tuple[str, str]] = {
+    "orgao_superior": ("Código Órgão Superior", "Nome Órgão Superior"),
+    "orgao_subordinado": ("Código Órgão Subordinado", "Nome Órgão Subordinado"),
+    "unidade_gestora": ("Código Unidade Gestora", "Nome Unidade Gestora"),
+    "gestao": ("Código Gestão", "Nome Gestão"),
+    "funcao": ("Código Função", "Nome Função"),
+    "subfuncao": ("Código Subfunção", "Nome Subfunção"),
+    "programa": ("Código Programa Orçamentário", "Nome Programa Orçamentário"),
+    "acao": ("Código Ação", "Nome Ação"),
+    "categoria_economica": (
+        "Código Categoria Econômica",
+        "Nome Categoria Econômica",
+    ),
+    "grupo_despesa": ("Código Grupo de Despesa", "Nome Grupo de Despesa"),
+    "elemento_despesa": (
+        "Código Elemento de Despesa",
+        "Nome Elemento de Despesa",
+    ),
+    "modalidade": (
+        "Código Modalidade da Despesa",
+        "Modalidade da Despesa",
+    ),
+}
+
+# Dimensões publicadas como tabelas do cache de referência
+REFERENCE_TABLES: Dict[str, str] = {
+    "unidade_gestora": "unidades_gestoras",
+    "funcao": "funcoes",
+    "modalidade": "modalidades",
+}
+
+# Colunas repetitivas sem par código/nome
+SIAFI_CATEGORICAL_COLUMNS = frozenset(
+    {"Ano e mês do lançamento", "Nome Autor Emenda", "Código Autor Emenda"}
+)
+
+
+def _normalize(column: str) -> str:
+    """Normaliza o nome de coluna (aspas e espaços) para comparação."""
+    return column.replace('"', "").strip()
+
+
+def siafi_categorical_dtypes(columns: Iterable[str]) -> Dict[str, str]:
+    """
+    Gera o mapeamento de dtypes categóricos para as colunas de um CSV SIAFI.
+
+    Args:
+        columns: Colunas presentes no arquivo
+
+    Returns:
+        Dicionário coluna -> "category" para as colunas do esquema
+    """
+    schema_columns = set(SIAFI_CATEGORICAL_COLUMNS)
+    for code_col, name_col in SIAFI_DIMENSIONS.values():
+        schema_columns.update((code_col, name_col))
+
+    return {col: "category" for col in columns if _normalize(col) in schema_columns}
+
+
+def _resolve_columns(df: pd.DataFrame) -> Dict[str, Tuple[str, str]]:
+    """Mapeia cada dimensão às colunas reais (código, nome) do DataFrame."""
+    by_normalized = {_normalize(col): col for col in df.columns}
+    resolved = {}
+    for dimension, (code_col, name_col) in SIAFI_DIMENSIONS.items():
+        if code_col in by_normalized and name_col in by_normalized:
+            resolved[dimension] = (by_normalized[code_col], by_normalized[name_col])
+    return resolved
+
+
+class SiafiDictionary:
+    """
+    Dicionário persistente código→nome das dimensões do SIAFI.
+
+    É alimentado por cada arquivo carregado e gravado em JSON, de modo que
+    arquivos diferentes (meses, anos) compartilham as mesmas tabelas. Pode
+    ser compartilhado entre threads (ex.: workers de parsing do pipeline).
+    """
+
+    def __init__(self, path: str = "data/reference/siafi_dicionario.json"):
+        """
+        Inicializa o dicionário, carregando o arquivo existente.
+
+        Args:
+            path: Caminho do arquivo JSON persistente
+        """
+        self.path = Path(path)
+        self.tables: Dict[str, Dict[str, str]] = {}
+        self._dirty = False
+        self._lock = threading.RLock()
+
+        if self.path.exists():
+            try:
+                with open(self.path, "r", encoding="utf-8") as f:
+                    self.tables = json.load(f)
+                logger.info(
+                    f"📚 Dicionário SIAFI carregado: {len(self.tables)} dimensões"
+                )
+            except json.JSONDecodeError as e:
+                logger.warning(f"⚠️ Dicionário SIAFI inválido, recriando: {e}")
+
+    def update_from_frame(self, df: pd.DataFrame) -> int:
+        """
+        Registra os pares código/nome presentes no DataFrame.
+
+        Args:
+            df: DataFrame SIAFI com colunas de código e nome
+
+        Returns:
+            Número de novos códigos registrados
+        """
+        added = 0
+        for dimension, (code_col, name_col) in _resolve_columns(df).items():
+            pairs = df[[code_col, name_col]].drop_duplicates().dropna()
+            with self._lock:
+                table = self.tables.setdefault(dimension, {})
+                for code, name in zip(pairs[code_col].astype(str), pairs[name_col]):
+                    if code not in table:
+                        table[code] = str(name)
+                        added += 1
+
+        if added:
+            with self._lock:
+                self._dirty = True
+            logger.info(f"📚 {added} novos códigos registrados no dicionário SIAFI")
+        return added
+
+    def drop_names(self, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Registra os nomes no dicionário e os remove do DataFrame.
+
+        Args:
+            df: DataFrame SIAFI
+
+        Returns:
+            DataFrame apenas com as colunas de código das dimensões
+        """
+        self.update_from_frame(df)
+        name_cols = [name_col for _, name_col in _resolve_columns(df).values()]
+        return df.drop(columns=name_cols)
+
+    def join_names(
+        self, df: pd.DataFrame, dimensions: Optional[List[str]] = None
+    ) -> pd.DataFrame:
+        """
+        Anexa as colunas de nome a partir dos códigos, sob demanda.
+
+        O mapeamento é aplicado às categorias (não às linhas) quando a coluna
+        de código é categórica, o que torna a operação barata.
+
+        Args:
+            df: DataFrame com colunas de código
+            dimensions: Dimensões a anexar (padrão: todas as disponíveis)
+
+        Returns:
+            DataFrame com as colunas de nome adicionadas
+        """
+        by_normalized = {_normalize(col): col for col in df.columns}
+        for dimension in dimensions or list(SIAFI_DIMENSIONS):
+            code_col, name_col = SIAFI_DIMENSIONS[dimension]
+            with self._lock:
+                table = dict(self.tables.get(dimension) or {})
+            if not table or code_col not in by_normalized:
+                continue
+
+            codes = df[by_normalized[code_col]]
+            if isinstance(codes.dtype, pd.CategoricalDtype):
+                codes = codes.cat.rename_categories(str)
+            else:
+                codes = codes.astype(str)
+            df[name_col] = codes.map(table)
+        return df
+
+    def name(self, dimension: str, code: str) -> Optional[str]:
+        """Retorna o nome de um código (None se desconhecido)."""
+        with self._lock:
+            return self.tables.get(dimension, {}).get(str(code))
+
+    def save(self) -> None:
+        """Grava o dicionário em disco, se houve alterações (seguro entre threads)."""
+        with self._lock:
+            if not self._dirty:
+                return
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = self.path.with_suffix(".tmp")
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(self.tables, f, ensure_ascii=False, sort_keys=True)
+            os.replace(tmp, self.path)
+            self._dirty = False
+            logger.info(f"💾 Dicionário SIAFI salvo: {self.path}")
+            self.publish(self.path.parent / "referencia.db")
+
+    def publish(self, db_path: Path) -> int:
+        """
+        Publica as dimensões de referência no cache de referência.
+
+        Args:
+            db_path: Banco do `ReferenceCache`
+
+        Returns:
+            Número de tabelas gravadas
+        """
+        published = 0
+        with self._lock, ReferenceCache(str(db_path)) as cache:
+            for dimension, table in REFERENCE_TABLES.items():
+                mapping = self.tables.get(dimension)
+                if mapping:
+                    cache.store_mapping(table, mapping, source="siafi_dicionario")
+                    published += 1
+        return published
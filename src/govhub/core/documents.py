@@ -0,0 +1,193 @@
+#!/usr/bin/env python3
+"""
+Gov-Hub Documents Module
+Normalização vetorizada de CNPJ/CPF de credores e fornecedores.
+
+O credor chega como `cnpj_credor`, `credor`, `cnpj_contratada` ou `Código
+Favorecido`, com máscara ("12.345.678/0001-95"), mascarado pelo Portal
+("***.456.789-**") ou lido pelo pandas como inteiro, perdendo os zeros à
+esquerda. Sem normalização, joins por credor entre SIAFI e Compras falham
+silenciosamente. Aqui os documentos são tratados como arrays NumPy: a
+máscara é removida, os zeros são restaurados (usando os dígitos
+verificadores para distinguir CPF de CNPJ quando o tamanho é ambíguo), os
+dígitos verificadores são conferidos e cada documento vira uma chave int64.
+
+Chaves:
+    CNPJ -> o próprio número (menor que 10**14)
+    CPF  -> 10**14 + número (faixa disjunta da dos CNPJs)
+"""
+
+import logging
+from typing import Dict, Iterable, Optional
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+# Colunas com documento de credor/fornecedor, nas fontes conhecidas
+CREDOR_COLUMNS = (
+    "cnpj_credor",
+    "credor",
+    "credor_cpf_cnpj",
+    "cnpj_contratada",
+    "Código Favorecido",
+)
+
+# Coluna com a chave int64 do credor, usada nos joins entre fontes
+CREDOR_KEY_COLUMN = "credor_chave"
+
+# Sufixo das colunas com o documento normalizado (a coluna original é mantida)
+NORMALIZED_SUFFIX = "_normalizado"
+
+# Deslocamento das chaves de CPF (evita colisão com CNPJs com zeros à esquerda)
+CPF_KEY_OFFSET = 10**14
+
+_CNPJ_WEIGHTS = np.array([6, 5, 4, 3, 2, 9, 8, 7, 6, 5, 4, 3, 2])
+_CPF_WEIGHTS = np.arange(11, 1, -1)
+_POWERS = {width: 10 ** np.arange(width - 1, -1, -1, dtype=np.int64) for width in (11, 14)}
+
+
+def _check_digits_ok(numbers: np.ndarray, width: int, weights: np.ndarray) -> np.ndarray:
+    """Confere os dois dígitos verificadores (módulo 11) de cada número."""
+    digits = (numbers[:, None] // _POWERS[width]) % 10
+    ok = ~(digits == digits[:, [0]]).all(axis=1)  # 000..., 111... são inválidos
+    for position in (width - 2, width - 1):
+        remainder = (digits[:, :position] * weights[-position:]).sum(axis=1) % 11
+        ok &= digits[:, position] == np.where(remainder < 2, 0, 11 - remainder)
+    return ok
+
+
+def parse_documents(series: pd.Series, kind: str = "auto") -> pd.DataFrame:
+    """
+    Normaliza e valida uma coluna de CNPJs/CPFs.
+
+    Args:
+        series: Documentos como texto (com ou sem máscara) ou inteiros
+        kind: "cnpj", "cpf" ou "auto" (decide pelo tamanho e, quando os
+            zeros à esquerda foram perdidos, pelos dígitos verificadores)
+
+    Returns:
+        DataFrame com o mesmo índice e as colunas:
+            documento: dígitos com zeros à esquerda (NA se inutilizável)
+            tipo: "cnpj", "cpf" ou NA
+            valido: dígitos verificadores corretos
+            chave: chave Int64 para joins (NA se inutilizável)
+    """
+    if kind not in ("auto", "cnpj", "cpf"):
+        raise ValueError(f"Tipo de documento inválido: {kind}")
+
+    if pd.api.types.is_numeric_dtype(series):
+        # Lido como número: zeros à esquerda já perdidos, tamanho desconhecido
+        numbers = pd.to_numeric(series, errors="coerce")
+        usable = (numbers.fillna(-1) >= 0).to_numpy()
+        lengths = np.zeros(len(series), dtype=np.int64)
+    else:
+        text = series.astype("string")
+        digits = text.str.replace(r"\D", "", regex=True)
+        # Documentos mascarados ("***.456.789-**") não identificam o credor
+        masked = text.str.contains("*", regex=False).fillna(False).to_numpy(bool)
+        lengths = digits.str.len().fillna(0).to_numpy(np.int64)
+        usable = (lengths > 0) & (lengths <= 14) & ~masked
+        numbers = pd.to_numeric(digits.where(usable), errors="coerce")
+
+    values = numbers.fillna(0).to_numpy().astype(np.int64)
+    usable &= values < 10**14
+
+    cnpj_ok = _check_digits_ok(values, 14, _CNPJ_WEIGHTS)
+    cpf_ok = (values < 10**11) & _check_digits_ok(values % 10**11, 11, _CPF_WEIGHTS)
+
+    if kind == "cnpj":
+        is_cpf = np.zeros(len(values), dtype=bool)
+    elif kind == "cpf":
+        is_cpf = values < 10**11
+        usable &= is_cpf
+    else:
+        # 11 dígitos = CPF; 12 a 14 = CNPJ. Abaixo disso (ou lido como inteiro)
+        # os zeros foram perdidos: é CPF, a menos que só o DV de CNPJ confira
+        ambiguous = (lengths < 11) & (values < 10**11)
+        is_cpf = (lengths == 11) | (ambiguous & (cpf_ok | ~cnpj_ok))
+    is_cpf &= usable
+    is_cnpj = usable & ~is_cpf
+
+    text_values = pd.Series(values, index=series.index).astype(str)
+    documento = text_values.str.zfill(14).where(is_cnpj, text_values.str.zfill(11))
+    tipo = np.where(is_cpf, "cpf", "cnpj")
+    chave = np.where(is_cpf, values + CPF_KEY_OFFSET, values)
+
+    return pd.DataFrame(
+        {
+            "documento": documento.astype("string").where(usable),
+            "tipo": pd.Series(tipo, index=series.index, dtype="string").where(usable),
+            "valido": np.where(is_cpf, cpf_ok, cnpj_ok) & usable,
+            "chave": pd.Series(chave, index=series.index, dtype="Int64").where(usable),
+        },
+        index=series.index,
+    )
+
+
+def normalize_documents(series: pd.Series, kind: str = "auto") -> pd.Series:
+    """Retorna os documentos normalizados (dígitos com zeros à esquerda)."""
+    return parse_documents(series, kind)["documento"]
+
+
+def valid_documents(series: pd.Series, kind: str = "auto") -> pd.Series:
+    """Retorna uma série booleana (True = dígitos verificadores válidos)."""
+    return parse_documents(series, kind)["valido"]
+
+
+def document_keys(series: pd.Series, kind: str = "auto") -> pd.Series:
+    """Retorna as chaves Int64 dos documentos, para joins entre fontes."""
+    return parse_documents(series, kind)["chave"]
+
+
+def credor_dtypes(columns: Iterable[str]) -> Dict[str, str]:
+    """
+    Retorna os dtypes de leitura que preservam os zeros das colunas de credor.
+
+    Args:
+        columns: Colunas do arquivo (como lidas do cabeçalho)
+
+    Returns:
+        Dicionário coluna -> "string" para as colunas de credor presentes
+    """
+    wanted = set(CREDOR_COLUMNS)
+    return {col: "string" for col in columns if str(col).replace('"', "").strip() in wanted}
+
+
+def normalize_credor_columns(
+    df: pd.DataFrame, key_column: Optional[str] = CREDOR_KEY_COLUMN
+) -> pd.DataFrame:
+    """
+    Normaliza in-place as colunas de credor de um DataFrame.
+
+    Cada coluna de credor presente ganha uma coluna `<coluna>_normalizado`
+    com os documentos normalizados, e a primeira delas gera a coluna de
+    chave int64. As colunas originais não são alteradas, para que as regras
+    de qualidade e a auditoria continuem vendo o valor bruto da fonte.
+
+    Args:
+        df: DataFrame carregado de qualquer fonte
+        key_column: Nome da coluna de chave (None = não criar)
+
+    Returns:
+        O próprio DataFrame
+    """
+    by_normalized = {str(col).replace('"', "").strip(): col for col in df.columns}
+    present = [
+        (name, by_normalized[name]) for name in CREDOR_COLUMNS if name in by_normalized
+    ]
+
+    for name, col in present:
+        parsed = parse_documents(df[col])
+        df[f"{name}{NORMALIZED_SUFFIX}"] = parsed["documento"]
+        if key_column and key_column not in df.columns:
+            df[key_column] = parsed["chave"]
+
+        invalid = int((parsed["documento"].notna() & ~parsed["valido"]).sum())
+        missing = int(parsed["documento"].isna().sum())
+        logger.info(
+            f"🪪 {col}: {len(df) - missing:,} documentos normalizados, "
+            f"{invalid:,} com dígito verificador inválido, {missing:,} ausentes/mascarados"
+        )
+    return df
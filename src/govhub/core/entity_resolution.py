@@ -0,0 +1,435 @@
+#!/usr/bin/env python3
+"""
+Gov-Hub Entity Resolution Module
+Resolução de entidades entre UGs do SIAFI, UASGs do Compras e códigos do
+TransfereGov.
+
+A integração juntava as fontes apenas por igualdade exata de `codigo_ug`
+com `uasg` e `codigo_siafi`, o que deixa de fora toda unidade cujo código
+difere entre os sistemas. Aqui cada código externo é resolvido para uma UG
+em duas etapas:
+
+1. Código: o código existe entre as UGs conhecidas (tabelas de referência
+   e dados do SIAFI).
+2. Nome: o nome normalizado (sem acentos, pontuação, stopwords e com
+   abreviações expandidas) é comparado apenas com as UGs que compartilham
+   algum token raro (blocking por índice invertido), com similaridade de
+   tokens ponderada por IDF, em lotes.
+
+O resultado é uma tabela de correspondência (crosswalk) gravada no cache de
+referência, que as integrações seguintes carregam sem recalcular.
+
+Classes:
+    NameIndex: Índice de nomes normalizados com blocking e similaridade
+    EntityResolver: Gera e carrega o crosswalk código externo -> UG
+"""
+
+import json
+import logging
+import math
+import re
+import unicodedata
+from collections import Counter, defaultdict
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from ..utils.reference_cache import ReferenceCache
+
+logger = logging.getLogger(__name__)
+
+# Tabelas do crosswalk no cache de referência (código externo -> UG)
+CROSSWALK_TABLES = {
+    "compras": "crosswalk_uasg_ug",
+    "transferegov": "crosswalk_transferegov_ug",
+}
+
+# Colunas de código e de nome por fonte
+CODE_COLUMNS = {
+    "siafi": ("codigo_ug", "Código Unidade Gestora"),
+    "compras": ("uasg", "codigo_uasg"),
+    "transferegov": ("codigo_siafi",),
+}
+NAME_COLUMNS = {
+    "siafi": ("nome_ug", "Nome Unidade Gestora", "unidade_gestora"),
+    "compras": ("nome_uasg", "unidade", "nome_unidade"),
+    "transferegov": ("nome_concedente", "concedente", "orgao_concedente"),
+}
+
+# Palavras sem valor discriminante em nomes de órgãos e unidades
+STOPWORDS = frozenset(
+    {"a", "o", "as", "os", "de", "da", "do", "das", "dos", "e", "em", "na", "no"}
+)
+
+# Abreviações frequentes nos cadastros
+ABBREVIATIONS = {
+    "min": "ministerio",
+    "minist": "ministerio",
+    "sec": "secretaria",
+    "secr": "secretaria",
+    "sup": "superintendencia",
+    "super": "superintendencia",
+    "univ": "universidade",
+    "fed": "federal",
+    "inst": "instituto",
+    "fund": "fundacao",
+    "dep": "departamento",
+    "depto": "departamento",
+    "coord": "coordenacao",
+    "ger": "gerencia",
+    "reg": "regional",
+    "nac": "nacional",
+    "adm": "administracao",
+    "admin": "administracao",
+    "est": "estadual",
+    "mun": "municipal",
+    "pref": "prefeitura",
+    "hosp": "hospital",
+    "cia": "companhia",
+}
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+
+def normalize_name(name: str) -> List[str]:
+    """
+    Normaliza o nome de um órgão/unidade em tokens comparáveis.
+
+    Args:
+        name: Nome como aparece no cadastro (ex.: "MIN. DA SAÚDE - FUND.")
+
+    Returns:
+        Tokens sem acentos, stopwords ou abreviações
+    """
+    text = unicodedata.normalize("NFKD", str(name)).encode("ascii", "ignore").decode()
+    tokens = []
+    for token in _TOKEN_RE.findall(text.lower()):
+        token = ABBREVIATIONS.get(token, token)
+        if token not in STOPWORDS:
+            tokens.append(token)
+    return tokens
+
+
+class NameIndex:
+    """
+    Índice invertido de nomes normalizados.
+
+    Um nome consultado só é comparado com as entradas que compartilham algum
+    token com frequência de documento até `max_block_size` (blocking): tokens
+    genéricos como "ministerio" não geram candidatos sozinhos.
+    """
+
+    def __init__(self, names: Dict[str, str], max_block_size: int = 200):
+        """
+        Constrói o índice.
+
+        Args:
+            names: Mapeamento código -> nome
+            max_block_size: Frequência máxima de um token usado no blocking
+        """
+        self.max_block_size = max_block_size
+        self.tokens: Dict[str, frozenset] = {}
+        self.postings: Dict[str, List[str]] = defaultdict(list)
+
+        for code, name in names.items():
+            tokens = frozenset(normalize_name(name))
+            if tokens:
+                self.tokens[code] = tokens
+                for token in tokens:
+                    self.postings[token].append(code)
+
+        total = max(len(self.tokens), 1)
+        self.idf = {
+            token: math.log(1 + total / len(codes)) for token, codes in self.postings.items()
+        }
+        self._default_idf = math.log(1 + total)
+
+    def __len__(self) -> int:
+        return len(self.tokens)
+
+    def _weight(self, tokens: Iterable[str]) -> float:
+        return sum(self.idf.get(token, self._default_idf) for token in tokens)
+
+    def candidates(self, tokens: Iterable[str]) -> Counter:
+        """Entradas que compartilham tokens discriminantes com a consulta."""
+        found: Counter = Counter()
+        for token in tokens:
+            codes = self.postings.get(token)
+            if codes and len(codes) <= self.max_block_size:
+                found.update(codes)
+        return found
+
+    def similarity(self, query: frozenset, code: str) -> float:
+        """Similaridade de Jaccard ponderada por IDF entre a consulta e uma entrada."""
+        other = self.tokens[code]
+        union = self._weight(query | other)
+        return self._weight(query & other) / union if union else 0.0
+
+    def best_match(self, name: str) -> Optional[Tuple[str, float]]:
+        """
+        Retorna a entrada mais parecida com o nome.
+
+        Returns:
+            Tupla (código, score) ou None se não houver candidatos
+        """
+        return self._best(frozenset(normalize_name(name)))
+
+    def _best(self, query: frozenset) -> Optional[Tuple[str, float]]:
+        best: Optional[Tuple[str, float]] = None
+        for code in self.candidates(query):
+            score = self.similarity(query, code)
+            if best is None or score > best[1]:
+                best = (code, score)
+        return best
+
+    def match_batch(
+        self, names: Dict[str, str], threshold: float = 0.75, batch_size: int = 5000
+    ) -> Dict[str, Tuple[str, float]]:
+        """
+        Casa um conjunto de nomes com o índice, em lotes.
+
+        Args:
+            names: Mapeamento código externo -> nome
+            threshold: Score mínimo para aceitar a correspondência
+            batch_size: Nomes processados por lote
+
+        Returns:
+            Mapeamento código externo -> (código do índice, score)
+        """
+        items = list(names.items())
+        matches = {}
+        for start in range(0, len(items), batch_size):
+            # Nomes repetidos no lote (após normalização) são comparados uma vez
+            seen: Dict[frozenset, Optional[Tuple[str, float]]] = {}
+            for code, name in items[start : start + batch_size]:
+                query = frozenset(normalize_name(name))
+                if query not in seen:
+                    seen[query] = self._best(query)
+                match = seen[query]
+                if match and match[1] >= threshold:
+                    matches[code] = match
+            logger.debug(f"Lote {start // batch_size + 1}: {len(matches)} correspondências")
+        return matches
+
+
+def _first_column(row_keys: Iterable[str], candidates: Sequence[str]) -> Optional[str]:
+    keys = set(row_keys)
+    return next((col for col in candidates if col in keys), None)
+
+
+def _code(value) -> str:
+    """Converte um código para texto ("" para vazios e NaN; 123.0 -> "123")."""
+    if value is None or value != value:
+        return ""
+    if isinstance(value, float) and value.is_integer():
+        value = int(value)
+    return str(value).strip()
+
+
+def _iter_pairs(rows: Iterable, source: str) -> Iterator[Tuple[str, str]]:
+    """
+    Percorre os pares (código, nome) das linhas de uma fonte.
+
+    DataFrames são lidos pelas colunas, sem materializar um `dict` por linha.
+    """
+    if hasattr(rows, "columns"):
+        code_col = _first_column(rows.columns, CODE_COLUMNS[source])
+        if code_col is None:
+            return
+        name_col = _first_column(rows.columns, NAME_COLUMNS[source])
+        frame = rows[[code_col, name_col] if name_col else [code_col]]
+        frame = frame.dropna(subset=[code_col]).drop_duplicates(subset=[code_col])
+        names = frame[name_col] if name_col else [None] * len(frame)
+        for code, name in zip(frame[code_col], names):
+            yield _code(code), _code(name)
+        return
+
+    code_col = name_col = None
+    for row in rows:
+        if code_col is None:
+            code_col = _first_column(row.keys(), CODE_COLUMNS[source])
+            name_col = _first_column(row.keys(), NAME_COLUMNS[source])
+            if code_col is None:
+                return
+        yield _code(row.get(code_col)), _code(row.get(name_col)) if name_col else ""
+
+
+def collect_names(rows: Iterable, source: str) -> Dict[str, str]:
+    """
+    Extrai o mapeamento código -> nome das linhas de uma fonte.
+
+    Args:
+        rows: Linhas com API de mapeamento (`Record`, `dict`) ou DataFrame
+        source: Fonte ("siafi", "compras" ou "transferegov")
+
+    Returns:
+        Dicionário código -> nome (nome vazio se a fonte não tiver nomes)
+    """
+    names: Dict[str, str] = {}
+    for code, name in _iter_pairs(rows, source):
+        if code and code not in names:
+            names[code] = name
+    return names
+
+
+def has_new_codes(rows: Iterable, source: str, known: Dict[str, Optional[str]]) -> bool:
+    """Indica se a fonte tem algum código fora de `known` (para no primeiro)."""
+    return any(code and code not in known for code, _ in _iter_pairs(rows, source))
+
+
+class EntityResolver:
+    """
+    Gera o crosswalk UASG/código TransfereGov -> UG e o mantém no cache.
+
+    As UGs conhecidas vêm do dicionário SIAFI persistente (código -> nome)
+    e dos próprios dados do SIAFI carregados na integração.
+    """
+
+    def __init__(
+        self,
+        cache: Optional[ReferenceCache] = None,
+        dictionary_path: str = "data/reference/siafi_dicionario.json",
+        threshold: float = 0.75,
+        batch_size: int = 5000,
+    ):
+        """
+        Inicializa o resolvedor.
+
+        Args:
+            cache: Cache de referência onde o crosswalk é gravado
+            dictionary_path: Dicionário SIAFI com os nomes das UGs
+            threshold: Score mínimo das correspondências por nome
+            batch_size: Nomes processados por lote
+        """
+        self.cache = cache or ReferenceCache()
+        self.dictionary_path = Path(dictionary_path)
+        self.threshold = threshold
+        self.batch_size = batch_size
+
+    def _reference_ugs(self) -> Dict[str, str]:
+        """UGs do dicionário SIAFI persistente (vazio se inexistente)."""
+        if not self.dictionary_path.exists():
+            return {}
+        try:
+            with open(self.dictionary_path, "r", encoding="utf-8") as f:
+                return json.load(f).get("unidade_gestora", {})
+        except (OSError, json.JSONDecodeError) as e:
+            logger.warning(f"⚠️ Dicionário SIAFI indisponível: {e}")
+            return {}
+
+    def resolve(self, external: Dict[str, str], ugs: Dict[str, str]) -> List[Dict]:
+        """
+        Resolve códigos externos para UGs, por código e depois por nome.
+
+        Args:
+            external: Código externo -> nome
+            ugs: Código de UG -> nome
+
+        Returns:
+            Linhas do crosswalk (codigo, codigo_ug, metodo, score, nome);
+            códigos não resolvidos também são registrados, com UG vazia
+        """
+        matches: Dict[str, Tuple[str, float]] = {}
+        by_name = {}
+        for code, name in external.items():
+            if code in ugs:
+                matches[code] = (code, 1.0)
+            elif name:
+                by_name[code] = name
+
+        if by_name:
+            index = NameIndex({code: name for code, name in ugs.items() if name})
+            if len(index):
+                matches.update(index.match_batch(by_name, self.threshold, self.batch_size))
+
+        rows = []
+        for code, name in external.items():
+            ug, score = matches.get(code, (None, 0.0))
+            if ug is None:
+                method = "nao_resolvido"
+            else:
+                method = "codigo" if ug == code and code in ugs else "nome"
+            rows.append(
+                {
+                    "codigo": code,
+                    "codigo_ug": ug,
+                    "metodo": method,
+                    "score": round(score, 4),
+                    "nome": name,
+                }
+            )
+        return rows
+
+    def build(self, tables: Dict[str, Iterable]) -> Dict[str, Dict[str, str]]:
+        """
+        Gera e grava o crosswalk de cada fonte externa.
+
+        Args:
+            tables: Fonte -> linhas ("siafi", "compras", "transferegov")
+
+        Returns:
+            Fonte -> mapeamento código externo -> UG
+        """
+        ugs = self._reference_ugs()
+        for code, name in collect_names(tables.get("siafi", []), "siafi").items():
+            if name or code not in ugs:
+                ugs[code] = name or ugs.get(code, "")
+
+        crosswalks = {}
+        for source, table in CROSSWALK_TABLES.items():
+            external = collect_names(tables.get(source, []), source)
+            rows = self.resolve(external, ugs)
+            self.cache.store(
+                table, rows, code_field="codigo", name_field="codigo_ug", source="entity_resolution"
+            )
+
+            by_method = Counter(row["metodo"] for row in rows)
+            logger.info(
+                f"🧩 Crosswalk {source}: {len(rows) - by_method['nao_resolvido']} de "
+                f"{len(rows)} códigos resolvidos ({by_method['codigo']} por código, "
+                f"{by_method['nome']} por nome)"
+            )
+            crosswalks[source] = self.cache.lookup(table)
+        return crosswalks
+
+    def load(
+        self, tables: Optional[Dict[str, Iterable]] = None, force: bool = False
+    ) -> Dict[str, Dict[str, Optional[str]]]:
+        """
+        Carrega o crosswalk do cache, gerando-o apenas quando necessário.
+
+        O crosswalk é recalculado se estiver vencido ou se as fontes
+        informadas tiverem códigos ainda não vistos; caso contrário, é
+        apenas lido do cache.
+
+        Args:
+            tables: Linhas (ou DataFrames) das fontes, necessárias para
+                (re)gerar o crosswalk
+            force: Recalcula mesmo com o crosswalk válido
+
+        Returns:
+            Fonte -> mapeamento código externo -> UG (None = não resolvido)
+        """
+        crosswalks = {
+            source: self.cache.lookup(table) for source, table in CROSSWALK_TABLES.items()
+        }
+        if tables is None:
+            return crosswalks
+
+        rebuild = force or any(
+            self.cache.is_stale(table) for table in CROSSWALK_TABLES.values()
+        )
+        if not rebuild:
+            rebuild = any(
+                has_new_codes(tables.get(source, []), source, crosswalks[source])
+                for source in CROSSWALK_TABLES
+            )
+
+        if rebuild:
+            return self.build(tables)
+        logger.info("🧩 Crosswalk carregado do cache de referência")
+        return crosswalks
+
+
+def resolve_code(crosswalk: Dict[str, Optional[str]], code: str) -> str:
+    """Retorna a UG correspondente ao código externo (ou o próprio código)."""
+    return crosswalk.get(code) or code
@@ -0,0 +1,418 @@
+#!/usr/bin/env python3
+"""
+Gov-Hub External Join Module
+Join fora da memória (external sort + merge join) entre fontes grandes.
+
+O `DataIntegrator` monta índices em dicionário e a versão pandas faz
+`pd.merge`: ambos exigem todas as fontes inteiras em memória, o que não
+comporta um ano de SIAFI contra todos os contratos. Aqui cada fonte é
+ordenada pela chave de junção normalizada em arquivos temporários (runs de
+tamanho limitado), as runs são intercaladas em fluxo (`heapq.merge`, no
+máximo `MAX_FAN_IN` arquivos abertos por passada) e as fontes ordenadas são
+juntadas por merge join. A memória fica limitada ao tamanho de uma run e
+ao maior grupo de uma mesma chave nas fontes da direita. O resultado é
+gravado diretamente no dataset integrado particionado
+(`<coluna>=<valor>/part-*.csv`).
+
+Classes:
+    CsvRows: Leitura re-iterável de um CSV como dicionários
+    JoinSource: Fonte de um join (arquivo, coluna-chave e normalização)
+    PartitionedWriter: Gravação do dataset integrado particionado
+    SortMergeJoin: Join por ordenação externa e intercalação
+"""
+
+import csv
+import heapq
+import itertools
+import json
+import logging
+import re
+import tempfile
+from collections import OrderedDict
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from ..utils.profiler import sniff_encoding
+
+logger = logging.getLogger(__name__)
+
+# Partição usada para linhas sem valor na coluna de particionamento
+EMPTY_PARTITION = "__vazio__"
+
+# Runs intercaladas por passada (limita os arquivos abertos simultaneamente)
+MAX_FAN_IN = 64
+
+
+def _open_csv(path: Path, encoding: Optional[str] = None):
+    """Abre um CSV detectando o encoding (se omitido) e o separador."""
+    f = open(path, "r", encoding=encoding or sniff_encoding(path), newline="")
+    header_line = f.readline().lstrip("\ufeff")
+    delimiter = ";" if header_line.count(";") > header_line.count(",") else ","
+    header = next(csv.reader([header_line], delimiter=delimiter), [])
+    return f, csv.reader(f, delimiter=delimiter), header
+
+
+def _merge_runs(runs: Sequence[Path]) -> Iterator[Tuple[str, List[str]]]:
+    """Intercala runs ordenadas (chave na primeira coluna) em fluxo."""
+    files = [open(run, "r", encoding="utf-8", newline="") for run in runs]
+    try:
+        streams = [((row[0], row[1:]) for row in csv.reader(f)) for f in files]
+        yield from heapq.merge(*streams, key=lambda item: item[0])
+    finally:
+        for f in files:
+            f.close()
+
+
+class CsvRows:
+    """
+    CSV re-iterável como dicionários (cada iteração relê o arquivo).
+
+    Permite passar um arquivo grande para funções que só precisam percorrer
+    as linhas (ex.: `EntityResolver.load`) sem carregá-lo em memória.
+    """
+
+    def __init__(self, path: Path, encoding: Optional[str] = None):
+        self.path = Path(path)
+        self.encoding = encoding
+
+    def __iter__(self) -> Iterator[Dict[str, str]]:
+        f, reader, header = _open_csv(self.path, self.encoding)
+        with f:
+            for row in reader:
+                if row:
+                    yield dict(zip(header, row))
+
+
+class JoinSource:
+    """Fonte de um join: arquivo, coluna-chave e normalização da chave."""
+
+    def __init__(
+        self,
+        name: str,
+        path: Path,
+        key_column: str,
+        prefix: str = "",
+        key_map: Optional[Callable[[str], str]] = None,
+        encoding: Optional[str] = None,
+    ):
+        """
+        Inicializa a fonte.
+
+        Args:
+            name: Nome da fonte (ex.: "compras")
+            path: Arquivo CSV
+            key_column: Coluna com a chave de junção
+            prefix: Prefixo das colunas no resultado (ex.: "compras_")
+            key_map: Normalização da chave (ex.: UASG -> UG pelo crosswalk)
+            encoding: Encoding do arquivo (None = detectar por amostra)
+        """
+        self.name = name
+        self.path = Path(path)
+        self.key_column = key_column
+        self.prefix = prefix
+        self.key_map = key_map
+        self.encoding = encoding
+        self.header: List[str] = []
+
+    def key(self, value: str) -> str:
+        """Normaliza o valor da chave."""
+        value = value.strip()
+        if value and self.key_map is not None:
+            value = self.key_map(value)
+        return value
+
+    def sorted_rows(
+        self, spill_dir: Path, run_size: int = 200_000, fan_in: int = MAX_FAN_IN
+    ) -> Iterator[Tuple[str, List[str]]]:
+        """
+        Ordena a fonte pela chave em runs temporárias e as intercala em fluxo.
+
+        Com mais de `fan_in` runs, grupos de `fan_in` runs são intercalados
+        em runs maiores (passadas intermediárias) até restarem no máximo
+        `fan_in`, de modo que nunca há mais arquivos abertos do que isso.
+
+        Args:
+            spill_dir: Diretório das runs temporárias
+            run_size: Linhas mantidas em memória por run
+            fan_in: Runs intercaladas por passada
+
+        Yields:
+            Tuplas (chave, linha) em ordem crescente de chave
+        """
+        runs: List[Path] = []
+        f, reader, self.header = _open_csv(self.path, self.encoding)
+        with f:
+            if self.key_column not in self.header:
+                raise ValueError(f"Coluna '{self.key_column}' ausente em {self.path.name}")
+            key_index = self.header.index(self.key_column)
+            width = len(self.header)
+
+            while True:
+                chunk = [
+                    (self.key(row[key_index]) if key_index < len(row) else "", row)
+                    for row in itertools.islice(reader, run_size)
+                    if row
+                ]
+                if not chunk:
+                    break
+                chunk.sort(key=lambda item: item[0])
+                run_path = spill_dir / f"{self.name}_{len(runs):05d}.csv"
+                with open(run_path, "w", encoding="utf-8", newline="") as out:
+                    writer = csv.writer(out)
+                    for key, row in chunk:
+                        writer.writerow([key] + row[:width] + [""] * (width - len(row)))
+                runs.append(run_path)
+
+        logger.info(f"📦 {self.name}: {len(runs)} runs ordenadas em disco")
+
+        passes = 0
+        while len(runs) > fan_in:
+            passes += 1
+            merged: List[Path] = []
+            for start in range(0, len(runs), fan_in):
+                group = runs[start : start + fan_in]
+                if len(group) == 1:
+                    merged.append(group[0])
+                    continue
+                run_path = spill_dir / f"{self.name}_p{passes}_{len(merged):05d}.csv"
+                with open(run_path, "w", encoding="utf-8", newline="") as out:
+                    writer = csv.writer(out)
+                    for key, row in _merge_runs(group):
+                        writer.writerow([key] + row)
+                for run in group:
+                    run.unlink()
+                merged.append(run_path)
+            runs = merged
+            logger.info(f"📦 {self.name}: passada {passes} de intercalação, {len(runs)} runs")
+
+        yield from _merge_runs(runs)
+
+
+class PartitionedWriter:
+    """
+    Grava linhas no dataset particionado `<base>/<coluna>=<valor>/part-*.csv`.
+
+    Mantém no máximo `max_open_files` arquivos abertos (LRU); um arquivo
+    fechado é reaberto em modo de acréscimo quando a partição reaparece.
+    Valores diferentes que geram o mesmo nome de diretório (ex.: "A/B" e
+    "A B") compartilham a partição; o manifesto registra os valores brutos
+    de cada uma.
+    """
+
+    def __init__(
+        self,
+        base_dir: Path,
+        columns: Sequence[str],
+        partition_by: Optional[str] = None,
+        max_open_files: int = 64,
+    ):
+        """
+        Inicializa o gravador, removendo arquivos de uma gravação anterior.
+
+        Args:
+            base_dir: Diretório do dataset
+            columns: Colunas das linhas gravadas
+            partition_by: Coluna de particionamento (None = partição única)
+            max_open_files: Arquivos mantidos abertos simultaneamente
+        """
+        self.base_dir = Path(base_dir)
+        self.columns = list(columns)
+        self.partition_by = partition_by if partition_by in self.columns else None
+        self.partition_index = (
+            self.columns.index(self.partition_by) if self.partition_by else None
+        )
+        self.max_open_files = max_open_files
+        self.part_name = f"part-{datetime.now().strftime('%Y%m%d%H%M%S')}.csv"
+        self.counts: Dict[str, int] = {}
+        self._dirs: Dict[str, Path] = {}
+        self._open: "OrderedDict[Path, Tuple]" = OrderedDict()
+
+        for old in self.base_dir.glob("**/part-*.csv"):
+            old.unlink()
+        self.base_dir.mkdir(parents=True, exist_ok=True)
+
+    def _partition_dir(self, value: str) -> Path:
+        directory = self._dirs.get(value)
+        if directory is None:
+            if self.partition_by is None:
+                directory = self.base_dir
+            else:
+                safe = re.sub(r"[^\w.-]+", "_", value.strip()) or EMPTY_PARTITION
+                directory = self.base_dir / f"{self.partition_by}={safe}"
+            self._dirs[value] = directory
+        return directory
+
+    def _writer(self, directory: Path):
+        entry = self._open.get(directory)
+        if entry is not None:
+            self._open.move_to_end(directory)
+            return entry[1]
+
+        if len(self._open) >= self.max_open_files:
+            _, (old_file, _) = self._open.popitem(last=False)
+            old_file.close()
+
+        directory.mkdir(parents=True, exist_ok=True)
+        path = directory / self.part_name
+        new_file = not path.exists()
+        f = open(path, "a", encoding="utf-8", newline="")
+        writer = csv.writer(f)
+        if new_file:
+            writer.writerow(self.columns)
+        self._open[directory] = (f, writer)
+        return writer
+
+    def write(self, row: Sequence[str]) -> None:
+        """Grava uma linha na sua partição."""
+        partition = "" if self.partition_index is None else row[self.partition_index]
+        self._writer(self._partition_dir(partition)).writerow(row)
+        self.counts[partition] = self.counts.get(partition, 0) + 1
+
+    def close(self) -> Dict:
+        """
+        Fecha os arquivos e grava o manifesto do dataset.
+
+        O manifesto traz a contagem de registros por diretório de partição
+        (`particoes`) e os valores brutos gravados em cada um
+        (`valores_particao`), usados na poda de partições pelos filtros.
+        """
+        for f, _ in self._open.values():
+            f.close()
+        self._open.clear()
+
+        partitions: Dict[str, int] = {}
+        values: Dict[str, List[str]] = {}
+        for value, count in sorted(self.counts.items()):
+            directory = str(self._partition_dir(value).relative_to(self.base_dir))
+            partitions[directory] = partitions.get(directory, 0) + count
+            values.setdefault(directory, []).append(value)
+
+        manifest = {
+            "gerado_em": datetime.now().isoformat(),
+            "colunas": self.columns,
+            "particionado_por": self.partition_by,
+            "total_registros": sum(self.counts.values()),
+            "particoes": partitions,
+            "valores_particao": values if self.partition_by else {},
+        }
+        with open(self.base_dir / "_manifest.json", "w", encoding="utf-8") as f:
+            json.dump(manifest, f, indent=2, ensure_ascii=False)
+        return manifest
+
+
+class SortMergeJoin:
+    """
+    Join de uma fonte principal com N fontes pela mesma chave, fora da memória.
+
+    Cada linha da fonte principal é combinada com as linhas de mesma chave de
+    cada fonte da direita (produto dos grupos); sem correspondência, as
+    colunas dessa fonte ficam vazias. Com `how="outer"`, chaves presentes
+    apenas nas fontes da direita também são emitidas. Linhas sem chave são
+    mantidas apenas da fonte principal.
+    """
+
+    def __init__(
+        self,
+        left: JoinSource,
+        rights: Sequence[JoinSource],
+        how: str = "left",
+        run_size: int = 200_000,
+        spill_dir: str = "data/temp",
+    ):
+        """
+        Inicializa o join.
+
+        Args:
+            left: Fonte principal (ex.: SIAFI)
+            rights: Fontes juntadas à principal (ex.: Compras, TransfereGov)
+            how: "left" ou "outer"
+            run_size: Linhas em memória por run da ordenação externa
+            spill_dir: Diretório base dos arquivos temporários
+        """
+        if how not in ("left", "outer"):
+            raise ValueError(f"Tipo de join não suportado: {how}")
+        self.left = left
+        self.rights = list(rights)
+        self.how = how
+        self.run_size = run_size
+        self.spill_dir = Path(spill_dir)
+
+    def _groups(self, source: JoinSource, spill: Path) -> Iterator[Tuple[str, Iterator]]:
+        rows = source.sorted_rows(spill, self.run_size)
+        for key, group in itertools.groupby(rows, key=lambda item: item[0]):
+            yield key, (row for _, row in group)
+
+    def run(self, output_dir: Path, partition_by: Optional[str] = None) -> Dict:
+        """
+        Executa o join e grava o dataset integrado particionado.
+
+        Args:
+            output_dir: Diretório do dataset integrado
+            partition_by: Coluna de particionamento do resultado
+
+        Returns:
+            Manifesto do dataset, com contagens de correspondências por fonte
+        """
+        self.spill_dir.mkdir(parents=True, exist_ok=True)
+        with tempfile.TemporaryDirectory(dir=self.spill_dir, prefix="join_") as tmp:
+            spill = Path(tmp)
+            sources = [self.left] + self.rights
+            streams = [self._groups(source, spill) for source in sources]
+            heads = [next(stream, None) for stream in streams]
+
+            columns = list(self.left.header)
+            for source in self.rights:
+                columns += [source.prefix + col for col in source.header]
+            widths = [len(source.header) for source in sources]
+            writer = PartitionedWriter(output_dir, columns, partition_by)
+            matches = {source.name: 0 for source in self.rights}
+
+            while any(head is not None for head in heads):
+                key = min(head[0] for head in heads if head is not None)
+                groups = []
+                for i, head in enumerate(heads):
+                    if head is not None and head[0] == key:
+                        groups.append(head[1])
+                        heads[i] = None
+                    else:
+                        groups.append(None)
+
+                # Chave vazia nunca corresponde a outra fonte
+                matchable = key != ""
+                right_groups = [
+                    list(group) if group is not None and matchable else []
+                    for group in groups[1:]
+                ]
+                left_group = groups[0]
+                if left_group is not None:
+                    for source, group in zip(self.rights, right_groups):
+                        if group:
+                            matches[source.name] += 1
+
+                if left_group is None and self.how == "outer" and any(right_groups):
+                    left_group = iter([[""] * widths[0]])
+                if left_group is not None:
+                    combos = [
+                        group or [[""] * width]
+                        for group, width in zip(right_groups, widths[1:])
+                    ]
+                    for left_row in left_group:
+                        for combo in itertools.product(*combos):
+                            writer.write(list(itertools.chain(left_row, *combo)))
+
+                # Esgotar grupos não consumidos e avançar as fontes desta chave
+                for i, group in enumerate(groups):
+                    if group is not None:
+                        for _ in group:
+                            pass
+                        heads[i] = next(streams[i], None)
+
+            manifest = writer.close()
+
+        manifest["chaves_com_correspondencia"] = matches
+        logger.info(
+            f"🔗 Join externo concluído: {manifest['total_registros']:,} registros em "
+            f"{len(manifest['particoes'])} partições"
+        )
+        return manifest
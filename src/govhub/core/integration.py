@@ -10,11 +10,17 @@ Classes:
     DataIntegrator: Classe principal para integração de dados
 """
 
+import argparse
 import csv
 import logging
 from pathlib import Path
 from datetime import datetime
-from typing import Dict, List, Tuple, Optional
+from typing import Dict, List, Tuple, Optional, Union
+
+from ..utils.reference_cache import ReferenceCache
+from .entity_resolution import EntityResolver, resolve_code
+from .external_join import CsvRows, JoinSource, SortMergeJoin
+from .records import JoinedRecord, Record, RecordTable
 
 logger = logging.getLogger(__name__)
 
@@ -24,14 +30,17 @@ class DataIntegrator:
     Classe principal para integração de dados governamentais.
 
     Esta classe implementa funcionalidades para:
-    - Carregamento de dados CSV
+    - Carregamento de dados CSV em tabelas compactas (RecordTable)
     - Integração entre diferentes fontes
     - Geração de relatórios de correspondência
     - Salvamento de dados processados
     """
 
     def __init__(
-        self, raw_data_dir: str = "data/raw", processed_data_dir: str = "data/processed"
+        self,
+        raw_data_dir: str = "data/raw",
+        processed_data_dir: str = "data/processed",
+        reference_dir: str = "data/reference",
     ):
         """
         Inicializa o Data Integrator.
@@ -39,24 +48,29 @@ class DataIntegrator:
         Args:
             raw_data_dir: Diretório com dados brutos
             processed_data_dir: Diretório para dados processados
+            reference_dir: Diretório do cache de referência e do crosswalk
         """
         self.raw_dir = Path(raw_data_dir)
         self.processed_dir = Path(processed_data_dir)
         self.processed_dir.mkdir(parents=True, exist_ok=True)
+        self.reference_dir = Path(reference_dir)
 
         logger.info("DataIntegrator inicializado")
         logger.info(f"Diretório de dados brutos: {self.raw_dir}")
         logger.info(f"Diretório de dados processados: {self.processed_dir}")
 
-    def load_csv_file_data(self, filename: str) -> List[Dict]:
+    def load_csv_file_data(self, filename: str) -> Union[RecordTable, List]:
         """
-        Carrega dados de um arquivo CSV.
+        Carrega dados de um arquivo CSV em uma tabela compacta.
+
+        As linhas são tuplas com esquema compartilhado, strings categóricas
+        internadas e colunas de valor convertidas para float.
 
         Args:
             filename: Nome do arquivo CSV
 
         Returns:
-            Lista de dicionários com os dados
+            Tabela com os dados (lista vazia se o arquivo não existir)
         """
         filepath = self.raw_dir / filename
 
@@ -64,17 +78,13 @@ class DataIntegrator:
             logger.warning(f"Arquivo {filename} não encontrado")
             return []
 
-        data = []
         try:
-            with open(filepath, "r", encoding="utf-8") as f:
-                reader = csv.DictReader(f)
-                for row in reader:
-                    data.append(row)
+            data = RecordTable.from_csv(filepath)
             logger.info(f"Carregados {len(data)} registros de {filename}")
+            return data
         except Exception as e:
             logger.error(f"Erro ao carregar {filename}: {e}")
-
-        return data
+            return []
 
     def discover_latest_files(self) -> Dict[str, Optional[str]]:
         """
@@ -112,7 +122,7 @@ class DataIntegrator:
 
     def integrate_government_data(
         self,
-    ) -> Tuple[List[Dict], Dict[str, int], Dict[str, int]]:
+    ) -> Tuple[List[JoinedRecord], Dict[str, int], Dict[str, int]]:
         """
         Integra dados de diferentes fontes governamentais.
 
@@ -132,35 +142,48 @@ class DataIntegrator:
             else []
         )
 
+        # Crosswalk UASG/código TransfereGov -> UG (recalculado só se necessário)
+        with ReferenceCache(str(self.reference_dir / "referencia.db")) as cache:
+            resolver = EntityResolver(
+                cache, str(self.reference_dir / "siafi_dicionario.json")
+            )
+            crosswalk = resolver.load(
+                {
+                    "siafi": siafi_data,
+                    "compras": compras_data,
+                    "transferegov": transfere_data,
+                }
+            )
+
         # Criar índices para join eficiente
-        compras_index = self._create_compras_index(compras_data)
-        transfere_index = self._create_transferegov_index(transfere_data)
+        compras_index = self._create_compras_index(compras_data, crosswalk["compras"])
+        transfere_index = self._create_transferegov_index(
+            transfere_data, crosswalk["transferegov"]
+        )
 
         # Integrar dados usando código UG como chave
         integrated_data = []
         matches = {"siafi_compras": 0, "siafi_transfere": 0, "total_integrated": 0}
 
+        prefixes = ("", "compras_", "transfere_")
+        layouts: Dict = {}
+
         for siafi_row in siafi_data:
             codigo_ug = siafi_row.get("codigo_ug", "")
 
-            # Criar linha integrada começando com dados do SIAFI
-            integrated_row = dict(siafi_row)
-
-            # Join com dados de compras
-            if codigo_ug in compras_index:
-                compras_row = compras_index[codigo_ug]
-                for key, value in compras_row.items():
-                    integrated_row[f"compras_{key}"] = value
+            # Join com dados de compras e do TransfereGov
+            compras_row = compras_index.get(codigo_ug)
+            if compras_row is not None:
                 matches["siafi_compras"] += 1
 
-            # Join com dados do TransfereGov
-            if codigo_ug in transfere_index:
-                transfere_row = transfere_index[codigo_ug]
-                for key, value in transfere_row.items():
-                    integrated_row[f"transfere_{key}"] = value
+            transfere_row = transfere_index.get(codigo_ug)
+            if transfere_row is not None:
                 matches["siafi_transfere"] += 1
 
-            integrated_data.append(integrated_row)
+            # A linha integrada referencia as linhas de origem, sem copiá-las
+            integrated_data.append(
+                JoinedRecord((siafi_row, compras_row, transfere_row), prefixes, layouts)
+            )
             matches["total_integrated"] += 1
 
         logger.info(
@@ -179,45 +202,53 @@ class DataIntegrator:
             },
         )
 
-    def _create_compras_index(self, compras_data: List[Dict]) -> Dict[str, Dict]:
+    def _create_compras_index(
+        self, compras_data: RecordTable, crosswalk: Optional[Dict[str, str]] = None
+    ) -> Dict[str, Record]:
         """
-        Cria índice de dados de compras por UASG.
+        Cria índice de dados de compras pela UG correspondente à UASG.
 
         Args:
-            compras_data: Lista com dados de compras
+            compras_data: Tabela com dados de compras
+            crosswalk: Mapeamento UASG -> UG (padrão: a própria UASG)
 
         Returns:
-            Dicionário indexado por UASG
+            Dicionário indexado por código UG
         """
+        crosswalk = crosswalk or {}
         index = {}
         for row in compras_data:
             uasg = row.get("uasg", "")
             if uasg:
-                index[uasg] = row
+                index[resolve_code(crosswalk, uasg)] = row
 
         logger.info(f"Índice de compras criado: {len(index)} entradas")
         return index
 
-    def _create_transferegov_index(self, transfere_data: List[Dict]) -> Dict[str, Dict]:
+    def _create_transferegov_index(
+        self, transfere_data: RecordTable, crosswalk: Optional[Dict[str, str]] = None
+    ) -> Dict[str, Record]:
         """
-        Cria índice de dados do TransfereGov por código SIAFI.
+        Cria índice de dados do TransfereGov pela UG correspondente ao código SIAFI.
 
         Args:
-            transfere_data: Lista com dados do TransfereGov
+            transfere_data: Tabela com dados do TransfereGov
+            crosswalk: Mapeamento código SIAFI -> UG (padrão: o próprio código)
 
         Returns:
-            Dicionário indexado por código SIAFI
+            Dicionário indexado por código UG
         """
+        crosswalk = crosswalk or {}
         index = {}
         for row in transfere_data:
             codigo_siafi = row.get("codigo_siafi", "")
             if codigo_siafi:
-                index[codigo_siafi] = row
+                index[resolve_code(crosswalk, codigo_siafi)] = row
 
         logger.info(f"Índice do TransfereGov criado: {len(index)} entradas")
         return index
 
-    def save_integrated_data_to_csv(self, integrated_data: List[Dict]) -> bool:
+    def save_integrated_data_to_csv(self, integrated_data: List[JoinedRecord]) -> bool:
         """
         Salva os dados integrados em arquivo CSV.
 
@@ -234,10 +265,11 @@ class DataIntegrator:
         output_file = self.processed_dir / "integrated_poc_data.csv"
 
         try:
-            # Obter todas as colunas únicas
+            # Obter todas as colunas únicas (uma vez por disposição de fontes)
             all_columns = set()
-            for row in integrated_data:
-                all_columns.update(row.keys())
+            layouts = {id(row.layout): row.layout for row in integrated_data}
+            for layout in layouts.values():
+                all_columns.update(layout.keys)
             all_columns = sorted(list(all_columns))
 
             with open(output_file, "w", newline="", encoding="utf-8") as f:
@@ -315,6 +347,82 @@ class DataIntegrator:
             logger.error(f"Erro ao salvar relatório: {e}")
             return False
 
+    def execute_external_integration(
+        self,
+        run_size: int = 200_000,
+        partition_by: Optional[str] = "orgao",
+        how: str = "left",
+        spill_dir: str = "data/temp",
+    ) -> bool:
+        """
+        Integra as fontes fora da memória (external sort + merge join).
+
+        Para fontes maiores que a RAM: cada arquivo é ordenado pela UG em
+        disco e as fontes são juntadas em fluxo, gravando o resultado no
+        dataset particionado `integrado/` do diretório processado.
+
+        Args:
+            run_size: Linhas em memória por run da ordenação externa
+            partition_by: Coluna de particionamento do resultado
+            how: "left" (todas as linhas do SIAFI) ou "outer"
+            spill_dir: Diretório dos arquivos temporários
+
+        Returns:
+            True se concluiu com sucesso, False caso contrário
+        """
+        try:
+            logger.info("=== Iniciando integração externa (fora da memória) ===")
+            files = self.discover_latest_files()
+            if not files["siafi"]:
+                logger.error("Nenhum arquivo SIAFI encontrado")
+                return False
+
+            sources = {
+                source: CsvRows(self.raw_dir / filename)
+                for source, filename in files.items()
+                if filename
+            }
+            with ReferenceCache(str(self.reference_dir / "referencia.db")) as cache:
+                resolver = EntityResolver(
+                    cache, str(self.reference_dir / "siafi_dicionario.json")
+                )
+                crosswalk = resolver.load(sources)
+
+            rights = []
+            for source, key_column, prefix in (
+                ("compras", "uasg", "compras_"),
+                ("transferegov", "codigo_siafi", "transfere_"),
+            ):
+                if files[source]:
+                    mapping = crosswalk[source]
+                    rights.append(
+                        JoinSource(
+                            source,
+                            self.raw_dir / files[source],
+                            key_column,
+                            prefix,
+                            key_map=lambda code, mapping=mapping: resolve_code(mapping, code),
+                        )
+                    )
+
+            join = SortMergeJoin(
+                JoinSource("siafi", self.raw_dir / files["siafi"], "codigo_ug"),
+                rights,
+                how=how,
+                run_size=run_size,
+                spill_dir=spill_dir,
+            )
+            manifest = join.run(self.processed_dir / "integrado", partition_by)
+
+            for source, count in manifest["chaves_com_correspondencia"].items():
+                logger.info(f"UGs com correspondência SIAFI-{source}: {count}")
+            logger.info("=== Integração externa concluída com sucesso ===")
+            return True
+
+        except Exception as e:
+            logger.error(f"Erro durante a integração externa: {e}")
+            return False
+
     def execute_complete_integration(self) -> bool:
         """
         Executa o processo completo de integração.
@@ -351,13 +459,42 @@ class DataIntegrator:
 
 def main():
     """Função principal para execução standalone."""
+    parser = argparse.ArgumentParser(
+        description="Gov-Hub Data Integration - integração das fontes por UG"
+    )
+    parser.add_argument(
+        "--external",
+        action="store_true",
+        help="Integração fora da memória (external sort + merge join) para fontes grandes",
+    )
+    parser.add_argument(
+        "--run-size",
+        type=int,
+        default=200_000,
+        help="Linhas em memória por run da ordenação externa (padrão: 200000)",
+    )
+    parser.add_argument(
+        "--partition-by",
+        default="orgao",
+        help="Coluna de particionamento do dataset integrado (padrão: orgao)",
+    )
+    parser.add_argument(
+        "--how", choices=["left", "outer"], default="left", help="Tipo de join externo"
+    )
+    args = parser.parse_args()
+
     # Configurar logging
     logging.basicConfig(
         level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s"
     )
 
     integrator = DataIntegrator()
-    success = integrator.execute_complete_integration()
+    if args.external:
+        success = integrator.execute_external_integration(
+            run_size=args.run_size, partition_by=args.partition_by, how=args.how
+        )
+    else:
+        success = integrator.execute_complete_integration()
 
     return 0 if success else 1
 
@@ -0,0 +1,591 @@
+#!/usr/bin/env python3
+"""
+Gov-Hub Pipeline Module
+Execução em DAG das etapas de aquisição, parsing e integração.
+
+Antes, aquisição, processamento e integração eram executados em sequência,
+cada etapa aguardando a anterior terminar por completo. Aqui as etapas são
+nós de um grafo ligados por filas limitadas: o parsing de um arquivo SIAFI
+começa enquanto o Compras ainda está sendo baixado, e a integração começa
+assim que todas as suas entradas ficam prontas. A latência total tende à da
+etapa mais lenta, e não à soma das etapas.
+
+Classes:
+    Stage: Definição de uma etapa do pipeline
+    PipelineRunner: Executor de etapas em DAG com filas limitadas
+"""
+
+import argparse
+import json
+import logging
+import queue
+import threading
+import time
+import types
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+from .acquisition import GovHubDataAcquirer
+from .advanced_integration import AdvancedDataIntegrator
+from .integration import DataIntegrator
+from .quality import DataQualityEngine, default_rules
+from .warehouse import DEFAULT_WAREHOUSE_PATH, WarehouseSink
+
+logger = logging.getLogger(__name__)
+
+# Marcadores internos das filas
+_END = object()  # Fim da produção de uma etapa de entrada
+_STOP = object()  # Encerramento dos demais workers de uma etapa
+
+
+class Stage:
+    """
+    Etapa do pipeline.
+
+    A função de uma etapa pode retornar um valor (emitido como um item) ou
+    ser um gerador (cada `yield` é emitido assim que produzido):
+
+    - Sem entradas: chamada uma vez, sem argumentos (fonte).
+    - Com entradas: chamada para cada item recebido, por `workers` threads.
+    - Com `gather=True`: chamada uma vez, quando todas as entradas terminam,
+      com um dicionário etapa -> lista de itens recebidos.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        func: Callable[..., Any],
+        inputs: Sequence[str] = (),
+        workers: int = 1,
+        gather: bool = False,
+    ):
+        """
+        Inicializa a etapa.
+
+        Args:
+            name: Nome único da etapa
+            func: Função executada pela etapa
+            inputs: Etapas cujas saídas alimentam esta etapa
+            workers: Número de threads consumindo a fila de entrada
+            gather: Aguarda todas as entradas e chama a função uma única vez
+        """
+        self.name = name
+        self.func = func
+        self.inputs = list(inputs)
+        self.workers = 1 if gather or not inputs else max(1, workers)
+        self.gather = gather
+
+        self.queue: Optional[queue.Queue] = None
+        self.outputs: List["Stage"] = []
+        self.stats: Dict[str, Any] = {}
+        self._lock = threading.Lock()
+        self._running = 0
+        self._ends = 0
+
+
+class PipelineRunner:
+    """
+    Executor de etapas em DAG, com uma fila limitada na entrada de cada etapa.
+
+    As filas limitadas aplicam contrapressão: uma etapa rápida bloqueia ao
+    encher a fila da seguinte, em vez de acumular tudo em memória.
+    """
+
+    def __init__(self, queue_size: int = 8, report_path: Optional[Path] = None):
+        """
+        Inicializa o executor.
+
+        Args:
+            queue_size: Capacidade das filas entre etapas
+            report_path: Arquivo JSON onde o relatório da execução é gravado
+        """
+        self.queue_size = queue_size
+        self.report_path = Path(report_path) if report_path else None
+        self.stages: Dict[str, Stage] = {}
+        self.report: Dict[str, Any] = {}
+        self._started = 0.0
+        self._cleanups: List[Callable[[], Any]] = []
+
+    def add_stage(
+        self,
+        name: str,
+        func: Callable[..., Any],
+        inputs: Sequence[str] = (),
+        workers: int = 1,
+        gather: bool = False,
+    ) -> "PipelineRunner":
+        """
+        Adiciona uma etapa ao pipeline.
+
+        Args:
+            name: Nome único da etapa
+            func: Função executada pela etapa
+            inputs: Etapas cujas saídas alimentam esta etapa
+            workers: Número de threads da etapa
+            gather: Aguarda todas as entradas e chama a função uma única vez
+
+        Returns:
+            O próprio executor, para encadeamento
+        """
+        if name in self.stages:
+            raise ValueError(f"Etapa duplicada: {name}")
+        self.stages[name] = Stage(name, func, inputs, workers, gather)
+        return self
+
+    def add_cleanup(self, func: Callable[[], Any]) -> "PipelineRunner":
+        """
+        Registra uma função chamada ao fim de `run()`, mesmo em caso de erro.
+
+        Usada para liberar recursos das etapas (ex.: conexões de banco).
+
+        Args:
+            func: Função sem argumentos
+
+        Returns:
+            O próprio executor, para encadeamento
+        """
+        self._cleanups.append(func)
+        return self
+
+    def _close(self) -> None:
+        """Executa as funções de limpeza registradas, na ordem inversa."""
+        while self._cleanups:
+            func = self._cleanups.pop()
+            try:
+                func()
+            except Exception as e:
+                logger.warning(f"⚠️ Erro ao liberar recursos do pipeline: {e}")
+
+    def _validate(self) -> List[str]:
+        """Liga as etapas e retorna uma ordem topológica (detecta ciclos)."""
+        for stage in self.stages.values():
+            stage.outputs = []
+        for stage in self.stages.values():
+            for name in stage.inputs:
+                if name not in self.stages:
+                    raise ValueError(f"Etapa '{stage.name}' depende de '{name}', inexistente")
+                self.stages[name].outputs.append(stage)
+
+        order: List[str] = []
+        pending = {name: len(stage.inputs) for name, stage in self.stages.items()}
+        ready = [name for name, count in pending.items() if count == 0]
+        while ready:
+            name = ready.pop()
+            order.append(name)
+            for consumer in self.stages[name].outputs:
+                pending[consumer.name] -= 1
+                if pending[consumer.name] == 0:
+                    ready.append(consumer.name)
+
+        if len(order) != len(self.stages):
+            raise ValueError("O pipeline contém um ciclo")
+        return order
+
+    def _now(self) -> float:
+        return time.perf_counter() - self._started
+
+    def _emit(self, stage: Stage, result: Any) -> None:
+        """Envia o resultado de uma chamada às etapas seguintes."""
+        items = result if isinstance(result, types.GeneratorType) else (result,)
+        for item in items:
+            if item is None:
+                continue
+            with stage._lock:
+                stage.stats["emitidos"] += 1
+            for consumer in stage.outputs:
+                consumer.queue.put((stage.name, item))
+
+    def _call(self, stage: Stage, *args) -> None:
+        """Executa a função da etapa, contabilizando tempo e erros."""
+        started = time.perf_counter()
+        with stage._lock:
+            if stage.stats["inicio_s"] is None:
+                stage.stats["inicio_s"] = self._now()
+        try:
+            self._emit(stage, stage.func(*args))
+        except Exception as e:
+            logger.error(f"❌ Erro na etapa '{stage.name}': {e}")
+            with stage._lock:
+                stage.stats["erros"] += 1
+        finally:
+            with stage._lock:
+                stage.stats["ocupado_s"] += time.perf_counter() - started
+
+    def _worker(self, stage: Stage) -> None:
+        """Laço de um worker: consome a fila de entrada e executa a etapa."""
+        try:
+            if not stage.inputs:
+                self._call(stage)
+            elif stage.gather:
+                self._gather(stage)
+            else:
+                self._consume(stage)
+        finally:
+            self._finish_worker(stage)
+
+    def _consume(self, stage: Stage) -> None:
+        """Processa cada item da fila até o fim de todas as entradas."""
+        while True:
+            source, item = stage.queue.get()
+            if item is _STOP:
+                return
+            if item is _END:
+                with stage._lock:
+                    stage._ends += 1
+                    done = stage._ends == len(stage.inputs)
+                if done:
+                    # Liberar os demais workers bloqueados na fila
+                    for _ in range(stage.workers - 1):
+                        stage.queue.put((stage.name, _STOP))
+                    return
+                continue
+
+            with stage._lock:
+                stage.stats["recebidos"] += 1
+            self._call(stage, item)
+
+    def _gather(self, stage: Stage) -> None:
+        """Acumula os itens de todas as entradas e executa a etapa uma vez."""
+        collected: Dict[str, List[Any]] = {name: [] for name in stage.inputs}
+        ends = 0
+        while ends < len(stage.inputs):
+            source, item = stage.queue.get()
+            if item is _END:
+                ends += 1
+                continue
+            collected[source].append(item)
+            stage.stats["recebidos"] += 1
+
+        logger.info(f"🔗 Entradas de '{stage.name}' prontas")
+        self._call(stage, collected)
+
+    def _finish_worker(self, stage: Stage) -> None:
+        """Registra o fim de um worker; o último sinaliza o fim da etapa."""
+        with stage._lock:
+            stage._running -= 1
+            last = stage._running == 0
+            if last:
+                stage.stats["fim_s"] = self._now()
+        if last:
+            logger.info(
+                f"🏁 Etapa '{stage.name}' concluída "
+                f"({stage.stats['emitidos']} itens, {stage.stats['erros']} erros)"
+            )
+            for consumer in stage.outputs:
+                consumer.queue.put((stage.name, _END))
+
+    def run(self) -> Dict[str, Any]:
+        """
+        Executa o pipeline até todas as etapas terminarem.
+
+        Returns:
+            Relatório da execução (tempos e contagens por etapa)
+        """
+        order = self._validate()
+        self._started = time.perf_counter()
+        started_at = datetime.now()
+        logger.info(f"🚀 Iniciando pipeline com {len(order)} etapas: {' → '.join(order)}")
+
+        threads = []
+        for name in order:
+            stage = self.stages[name]
+            stage.queue = queue.Queue(maxsize=self.queue_size) if stage.inputs else None
+            stage.stats = {
+                "workers": stage.workers,
+                "entradas": stage.inputs,
+                "recebidos": 0,
+                "emitidos": 0,
+                "erros": 0,
+                "ocupado_s": 0.0,
+                "inicio_s": None,
+                "fim_s": None,
+            }
+            stage._running = stage.workers
+            stage._ends = 0
+
+        for name in order:
+            stage = self.stages[name]
+            for i in range(stage.workers):
+                thread = threading.Thread(
+                    target=self._worker, args=(stage,), name=f"{name}-{i}", daemon=True
+                )
+                threads.append(thread)
+                thread.start()
+
+        try:
+            for thread in threads:
+                thread.join()
+        finally:
+            self._close()
+
+        total = self._now()
+        stages = {}
+        for name in order:
+            stats = self.stages[name].stats
+            stats["duracao_s"] = round((stats["fim_s"] or 0) - (stats["inicio_s"] or 0), 3)
+            for key in ("ocupado_s", "inicio_s", "fim_s"):
+                stats[key] = round(stats[key] or 0, 3)
+            stages[name] = stats
+
+        self.report = {
+            "inicio": started_at.isoformat(),
+            "duracao_total_s": round(total, 3),
+            "soma_etapas_s": round(sum(s["duracao_s"] for s in stages.values()), 3),
+            "erros": sum(s["erros"] for s in stages.values()),
+            "etapas": stages,
+        }
+
+        logger.info("\n" + "=" * 60)
+        logger.info("📊 === RELATÓRIO DO PIPELINE ===")
+        for name, stats in stages.items():
+            logger.info(
+                f"   {name}: {stats['duracao_s']:.1f}s "
+                f"[{stats['inicio_s']:.1f}s → {stats['fim_s']:.1f}s], "
+                f"{stats['emitidos']} itens, {stats['erros']} erros"
+            )
+        logger.info(
+            f"⏱️ Tempo total: {self.report['duracao_total_s']:.1f}s "
+            f"(soma das etapas: {self.report['soma_etapas_s']:.1f}s)"
+        )
+
+        if self.report_path:
+            self.save_report(self.report_path)
+        return self.report
+
+    def save_report(self, path: Path) -> Path:
+        """Grava o relatório da última execução em JSON."""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.report, f, indent=2, ensure_ascii=False)
+        logger.info(f"✅ Relatório do pipeline salvo: {path}")
+        return path
+
+
+def build_govhub_pipeline(
+    config_path: str = "config/config.json",
+    parse_workers: int = 2,
+    queue_size: int = 8,
+    max_large_file_rows: int = 1000,
+    resume: bool = False,
+    quality: bool = True,
+    warehouse: bool = True,
+) -> PipelineRunner:
+    """
+    Monta o pipeline completo do Gov-Hub.
+
+    Grafo:
+        download_siafi ────────┐   ┌─> parse (N workers) ───> integrate
+        download_compras ──────┤   │
+        download_transferegov ─┼───┤
+        scan_raw_dir ──────────┘   └─> quality (N workers) ─> quality_report
+        download_siafi ──────────────> warehouse
+
+    Cada etapa de download emite os CSVs gravados pelo seu download assim que
+    ele termina (com `resume`, os registrados no checkpoint); `scan_raw_dir`
+    emite os demais CSVs do diretório (fonte não identificada). `parse` processa os arquivos em paralelo e `integrate`
+    gera os relatórios quando todos foram processados. Em paralelo,
+    `quality` valida cada arquivo completo (uma leitura em blocos) e
+    `quality_report` grava as violações por regra, e `warehouse` carrega os
+    empenhos do SIAFI no banco embarcado (upsert pelo número do empenho).
+
+    Args:
+        config_path: Caminho do arquivo de configuração
+        parse_workers: Número de threads da etapa de parsing
+        queue_size: Capacidade das filas entre etapas
+        max_large_file_rows: Número máximo de registros para arquivos grandes
+        resume: Retomar a aquisição a partir do checkpoint anterior
+        quality: Incluir a validação de qualidade dos dados
+        warehouse: Carregar os empenhos no warehouse (`file_settings.warehouse_db`)
+
+    Returns:
+        Executor configurado (chame `run()` para executar)
+    """
+    acquirer = GovHubDataAcquirer(config_path=config_path, resume=resume)
+    raw_dir = acquirer.output_dir
+    processed_dir = Path(
+        acquirer.config["file_settings"].get("processed_data_dir", "data/processed")
+    )
+    advanced = AdvancedDataIntegrator(str(raw_dir), str(processed_dir))
+    lock = threading.Lock()
+
+    def download_stage(source: str, download: Callable[[], bool]):
+        def run():
+            finished = acquirer.checkpoint.finished_entry(source)
+            if finished is not None and "files" in finished:
+                logger.info(f"♻️ {source.upper()} já concluído (checkpoint)")
+                paths = [Path(path) for path in finished["files"]]
+            elif finished is not None:
+                # Checkpoint sem a lista de arquivos (gravado por versões
+                # anteriores): usar os CSVs da fonte presentes no diretório
+                logger.info(
+                    f"♻️ {source.upper()} já concluído (checkpoint sem arquivos)"
+                )
+                paths = [
+                    path
+                    for path in sorted(raw_dir.glob("*.csv"))
+                    if advanced.detect_file_source(path.name) == source
+                ]
+            else:
+                success, paths = acquirer.collect_outputs(download)
+                if success:
+                    with lock:
+                        acquirer.checkpoint.mark_finished(
+                            source, files=[str(path) for path in paths]
+                        )
+
+            # Emitir apenas os CSVs produzidos por esta execução (baixados ou
+            # de amostra), não cópias antigas que estejam no diretório
+            for path in paths:
+                if path.exists():
+                    yield path
+
+        return run
+
+    def scan_raw_dir():
+        for path in sorted(raw_dir.glob("*.csv")):
+            if advanced.detect_file_source(path.name) == "unknown":
+                yield path
+
+    def parse(path: Path):
+        return path, advanced.process_file(path, max_large_file_rows)
+
+    def integrate(collected: Dict[str, List[Any]]) -> Optional[bool]:
+        all_data, summary_stats = {}, {}
+        for path, result in sorted(collected["parse"], key=lambda item: item[0]):
+            if result is not None:
+                key, df, stats = result
+                all_data[key] = df
+                summary_stats[path.name] = stats
+
+        if all_data:
+            advanced.save_integration_results(all_data, summary_stats)
+        else:
+            logger.warning("⚠️ Nenhum dado foi processado")
+
+        integrator = DataIntegrator(str(raw_dir), str(processed_dir))
+        # None não é emitido: a etapa só conta um item em caso de sucesso
+        return integrator.execute_complete_integration() or None
+
+    runner = PipelineRunner(
+        queue_size=queue_size, report_path=processed_dir / "pipeline_report.json"
+    )
+    downloads = [
+        ("siafi", acquirer.download_siafi_data),
+        ("compras", acquirer.download_compras_data),
+        ("transferegov", acquirer.download_transferegov_data),
+    ]
+    for source, download in downloads:
+        runner.add_stage(f"download_{source}", download_stage(source, download))
+    runner.add_stage("scan_raw_dir", scan_raw_dir)
+    runner.add_stage(
+        "parse",
+        parse,
+        inputs=[f"download_{source}" for source, _ in downloads] + ["scan_raw_dir"],
+        workers=parse_workers,
+    )
+    runner.add_stage("integrate", integrate, inputs=["parse"], gather=True)
+
+    if quality:
+        engine = DataQualityEngine(
+            default_rules(advanced.dictionary.tables.get("unidade_gestora"))
+        )
+
+        def quality_report(collected: Dict[str, List[Any]]) -> Path:
+            report = engine.new_report()
+            for file_report in collected["quality"]:
+                report.merge(file_report)
+            report.log_summary()
+            return report.save(processed_dir / "qualidade_dados.json")
+
+        runner.add_stage(
+            "quality",
+            engine.validate_csv,
+            inputs=[f"download_{source}" for source, _ in downloads] + ["scan_raw_dir"],
+            workers=parse_workers,
+        )
+        runner.add_stage("quality_report", quality_report, inputs=["quality"], gather=True)
+
+    if warehouse:
+        sink = WarehouseSink(
+            acquirer.config["file_settings"].get("warehouse_db", DEFAULT_WAREHOUSE_PATH)
+        )
+
+        # Só os arquivos do SIAFI têm empenhos; um worker (escritor único)
+        runner.add_stage("warehouse", sink.load_csv, inputs=["download_siafi"])
+        runner.add_cleanup(sink.close)
+    return runner
+
+
+def main():
+    """Função principal com interface de linha de comando."""
+    parser = argparse.ArgumentParser(
+        description="Gov-Hub Pipeline - aquisição, parsing e integração em paralelo"
+    )
+    parser.add_argument(
+        "--config",
+        default="config/config.json",
+        help="Caminho para arquivo de configuração (padrão: config/config.json)",
+    )
+    parser.add_argument(
+        "--parse-workers", type=int, default=2, help="Threads da etapa de parsing"
+    )
+    parser.add_argument(
+        "--queue-size", type=int, default=8, help="Capacidade das filas entre etapas"
+    )
+    parser.add_argument(
+        "--max-rows",
+        type=int,
+        default=1000,
+        help="Registros carregados de arquivos grandes (padrão: 1000)",
+    )
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="Retoma a aquisição anterior a partir do último checkpoint",
+    )
+    parser.add_argument(
+        "--no-quality",
+        action="store_true",
+        help="Não executa a validação de qualidade dos dados",
+    )
+    parser.add_argument(
+        "--no-warehouse",
+        action="store_true",
+        help="Não carrega os empenhos no warehouse",
+    )
+
+    args = parser.parse_args()
+
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s - %(levelname)s - [%(threadName)s] - %(message)s",
+    )
+
+    try:
+        runner = build_govhub_pipeline(
+            config_path=args.config,
+            parse_workers=args.parse_workers,
+            queue_size=args.queue_size,
+            max_large_file_rows=args.max_rows,
+            resume=args.resume,
+            quality=not args.no_quality,
+            warehouse=not args.no_warehouse,
+        )
+        report = runner.run()
+        return 0 if report["etapas"]["integrate"]["emitidos"] else 1
+
+    except KeyboardInterrupt:
+        logger.warning("⚠️ Interrompido pelo usuário")
+        logger.info("💡 Execute novamente com --resume para continuar")
+        return 1
+    except Exception as e:
+        logger.error(f"Erro crítico: {e}")
+        return 1
+
+
+if __name__ == "__main__":
+    import sys
+
+    sys.exit(main())
@@ -15,6 +15,9 @@ import pandas as pd
 from pathlib import Path
 from typing import Dict, List, Optional, Tuple
 
+from .dictionary import SiafiDictionary, siafi_categorical_dtypes
+from .documents import credor_dtypes, normalize_credor_columns
+
 logger = logging.getLogger(__name__)
 
 
@@ -25,18 +28,29 @@ class SiafiLargeFileProcessor:
     Handles large SIAFI files with different encoding and parsing configurations.
     """
     
-    def __init__(self, raw_data_dir: str = "data/raw", processed_data_dir: str = "data/processed"):
+    def __init__(
+        self,
+        raw_data_dir: str = "data/raw",
+        processed_data_dir: str = "data/processed",
+        reference_dir: str = "data/reference",
+    ):
         """
         Inicializa o processador de arquivos SIAFI.
 
         Args:
             raw_data_dir: Diretório com dados brutos
             processed_data_dir: Diretório para dados processados
+            reference_dir: Diretório do dicionário SIAFI persistente
         """
         self.raw_dir = Path(raw_data_dir)
         self.processed_dir = Path(processed_data_dir)
         self.processed_dir.mkdir(parents=True, exist_ok=True)
         
+        # Dicionário código→nome compartilhado entre arquivos
+        self.dictionary = SiafiDictionary(
+            str(Path(reference_dir) / "siafi_dicionario.json")
+        )
+        
         # Configurações de parsing para diferentes encodings
         self.parsing_configs = [
             {"sep": ";", "encoding": "utf-8", "quotechar": '"'},
@@ -127,11 +141,23 @@ class SiafiLargeFileProcessor:
                 logger.info(f"📊 Colunas encontradas: {len(df_sample.columns)}")
                 logger.info(f"📋 Primeiras colunas: {list(df_sample.columns)[:3]}")
                 
+                # Dimensões do SIAFI são carregadas como categóricas
+                dtypes = siafi_categorical_dtypes(df_sample.columns)
+                logger.info(f"🗂️ Colunas categóricas: {len(dtypes)}")
+                dtypes.update(credor_dtypes(df_sample.columns))
+                
                 # Se funcionou com sample, carregar arquivo com limite
                 logger.info(f"📥 Carregando arquivo completo (primeiros {max_rows} registros)...")
-                df_full = pd.read_csv(filepath, nrows=max_rows, **config)
+                df_full = pd.read_csv(filepath, nrows=max_rows, dtype=dtypes, **config)
                 
                 logger.info(f"✅ Sucesso! Carregados {len(df_full)} registros")
+                memory_mb = df_full.memory_usage(deep=True).sum() / (1024 * 1024)
+                logger.info(f"🧠 Memória em uso: {memory_mb:.1f} MB")
+                
+                # Registrar códigos/nomes no dicionário compartilhado
+                if self.dictionary.update_from_frame(df_full):
+                    self.dictionary.save()
+                normalize_credor_columns(df_full)
                 
                 # Executar análise dos dados
                 self._analyze_dataframe(df_full)
@@ -0,0 +1,554 @@
+#!/usr/bin/env python3
+"""
+Gov-Hub Data Quality Module
+Validação declarativa da qualidade dos dados processados.
+
+O `SystemValidator` verifica a estrutura do projeto, mas não os dados. Este
+módulo avalia regras declarativas (dígitos verificadores de CNPJ/CPF,
+formato do número de empenho, `valor_pago <= valor_liquidado <=
+valor_empenhado`, códigos de UG...) como expressões vetorizadas sobre
+colunas inteiras de cada bloco (chunk), sem laço em Python por linha. Um
+arquivo é validado em uma única leitura em blocos, e o relatório traz, por
+regra, a contagem de violações e algumas linhas de exemplo.
+
+Classes:
+    QualityRule: Regra de qualidade avaliada sobre um DataFrame
+    QualityReport: Contagens e amostras de violações por regra
+    DataQualityEngine: Avalia um conjunto de regras sobre DataFrames e CSVs
+"""
+
+import argparse
+import json
+import logging
+import sys
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence
+
+import pandas as pd
+
+from .documents import valid_documents
+
+logger = logging.getLogger(__name__)
+
+# Nomes de colunas das fontes brutas -> nome canônico usado pelas regras
+COLUMN_ALIASES: Dict[str, str] = {
+    "Valor Empenhado (R$)": "valor_empenhado",
+    "Valor Liquidado (R$)": "valor_liquidado",
+    "Valor Pago (R$)": "valor_pago",
+    "Código Unidade Gestora": "codigo_ug",
+    "Código Favorecido": "codigo_favorecido",
+}
+
+# Regras padrão, no formato aceito por `build_rule`
+DEFAULT_RULES: List[Dict[str, Any]] = [
+    {
+        "nome": "numero_empenho_formato",
+        "tipo": "padrao",
+        "coluna": "numero_empenho",
+        "padrao": r"\d{4}NE\d{6}",
+        "descricao": "Número de empenho no formato AAAANE999999",
+    },
+    {
+        "nome": "valores_execucao_ordenados",
+        "tipo": "ordenado",
+        "colunas": ["valor_pago", "valor_liquidado", "valor_empenhado"],
+        "descricao": "valor_pago <= valor_liquidado <= valor_empenhado",
+    },
+    {
+        "nome": "valor_empenhado_nao_negativo",
+        "tipo": "intervalo",
+        "coluna": "valor_empenhado",
+        "minimo": 0,
+        "descricao": "Valor empenhado não negativo",
+    },
+    {
+        "nome": "codigo_ug_formato",
+        "tipo": "padrao",
+        "coluna": "codigo_ug",
+        "padrao": r"\d{6}",
+        "descricao": "Código de UG com 6 dígitos",
+    },
+    {
+        "nome": "cnpj_credor_valido",
+        "tipo": "cnpj",
+        "coluna": "cnpj_credor",
+        "descricao": "CNPJ do credor com dígitos verificadores válidos",
+    },
+    {
+        "nome": "credor_documento_valido",
+        "tipo": "cnpj",
+        "coluna": "credor",
+        "aceita_cpf": True,
+        "descricao": "Documento do credor (CNPJ ou CPF) válido",
+    },
+    {
+        "nome": "cnpj_contratada_valido",
+        "tipo": "cnpj",
+        "coluna": "cnpj_contratada",
+        "descricao": "CNPJ da contratada com dígitos verificadores válidos",
+    },
+]
+
+
+def _as_text(series: pd.Series) -> pd.Series:
+    """Converte a coluna para texto (inteiros lidos como float perdem o ".0")."""
+    if pd.api.types.is_numeric_dtype(series):
+        return series.astype(str).str.replace(r"\.0$", "", regex=True)
+    return series.astype("string")
+
+
+def to_number(series: pd.Series) -> pd.Series:
+    """Converte valores (inclusive no formato brasileiro "1.234,56") para float."""
+    if pd.api.types.is_numeric_dtype(series):
+        return series.astype(float)
+    text = series.astype(str).str.replace('"', "", regex=False).str.strip()
+    brazilian = text.str.contains(",", regex=False)
+    text = text.where(
+        ~brazilian,
+        text.str.replace(".", "", regex=False).str.replace(",", ".", regex=False),
+    )
+    return pd.to_numeric(text, errors="coerce")
+
+
+class QualityRule:
+    """
+    Regra de qualidade avaliada de forma vetorizada.
+
+    A função `check` recebe o DataFrame do bloco e retorna uma série
+    booleana em que True indica linha válida. A regra só é aplicada quando
+    todas as suas colunas existem no bloco.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        columns: Sequence[str],
+        check: Callable[[pd.DataFrame], pd.Series],
+        description: str = "",
+    ):
+        """
+        Inicializa a regra.
+
+        Args:
+            name: Nome único da regra
+            columns: Colunas necessárias para avaliá-la
+            check: Expressão vetorizada (DataFrame -> série de válidos)
+            description: Descrição legível da regra
+        """
+        self.name = name
+        self.columns = list(columns)
+        self.check = check
+        self.description = description or name
+
+    def applies_to(self, df: pd.DataFrame) -> bool:
+        """Indica se o DataFrame tem as colunas da regra."""
+        return all(col in df.columns for col in self.columns)
+
+    def violations(self, df: pd.DataFrame) -> pd.Series:
+        """Retorna a máscara booleana das linhas que violam a regra."""
+        valid = self.check(df)
+        return ~valid.fillna(True).astype(bool)
+
+
+def _not_null_rule(spec: Dict[str, Any]) -> QualityRule:
+    column = spec["coluna"]
+    return QualityRule(
+        spec["nome"],
+        [column],
+        lambda df: df[column].notna() & (df[column].astype(str).str.strip() != ""),
+        spec.get("descricao", f"{column} preenchido"),
+    )
+
+
+def _pattern_rule(spec: Dict[str, Any]) -> QualityRule:
+    column, pattern = spec["coluna"], spec["padrao"]
+
+    def check(df: pd.DataFrame) -> pd.Series:
+        values = df[column]
+        # Nulos não violam regras de formato (use "nao_nulo" para isso)
+        return _as_text(values).str.strip().str.fullmatch(pattern) | values.isna()
+
+    return QualityRule(spec["nome"], [column], check, spec.get("descricao", ""))
+
+
+def _ordered_rule(spec: Dict[str, Any]) -> QualityRule:
+    columns = spec["colunas"]
+
+    def check(df: pd.DataFrame) -> pd.Series:
+        values = [to_number(df[col]) for col in columns]
+        valid = pd.Series(True, index=df.index)
+        for smaller, larger in zip(values, values[1:]):
+            # Comparações com NaN resultam em False: ausência não é violação
+            valid &= ~(smaller > larger)
+        return valid
+
+    return QualityRule(spec["nome"], columns, check, spec.get("descricao", ""))
+
+
+def _range_rule(spec: Dict[str, Any]) -> QualityRule:
+    column = spec["coluna"]
+    minimum, maximum = spec.get("minimo"), spec.get("maximo")
+
+    def check(df: pd.DataFrame) -> pd.Series:
+        values = to_number(df[column])
+        valid = pd.Series(True, index=df.index)
+        if minimum is not None:
+            valid &= ~(values < minimum)
+        if maximum is not None:
+            valid &= ~(values > maximum)
+        return valid
+
+    return QualityRule(spec["nome"], [column], check, spec.get("descricao", ""))
+
+
+def _cnpj_rule(spec: Dict[str, Any]) -> QualityRule:
+    column = spec["coluna"]
+    kind = "auto" if spec.get("aceita_cpf", False) else "cnpj"
+    return QualityRule(
+        spec["nome"],
+        [column],
+        lambda df: valid_documents(df[column], kind) | df[column].isna(),
+        spec.get("descricao", ""),
+    )
+
+
+def _in_set_rule(spec: Dict[str, Any]) -> QualityRule:
+    column = spec["coluna"]
+    allowed = pd.Index([str(value) for value in spec["valores"]])
+    return QualityRule(
+        spec["nome"],
+        [column],
+        lambda df: df[column].astype(str).str.strip().isin(allowed) | df[column].isna(),
+        spec.get("descricao", f"{column} em conjunto conhecido"),
+    )
+
+
+# Tipo de regra declarativa -> construtor
+RULE_TYPES: Dict[str, Callable[[Dict[str, Any]], QualityRule]] = {
+    "nao_nulo": _not_null_rule,
+    "padrao": _pattern_rule,
+    "ordenado": _ordered_rule,
+    "intervalo": _range_rule,
+    "cnpj": _cnpj_rule,
+    "conjunto": _in_set_rule,
+}
+
+
+def build_rule(spec: Dict[str, Any]) -> QualityRule:
+    """
+    Constrói uma regra a partir da sua especificação declarativa.
+
+    Args:
+        spec: Dicionário com "nome", "tipo" e os parâmetros do tipo
+
+    Returns:
+        Regra construída
+    """
+    builder = RULE_TYPES.get(spec.get("tipo"))
+    if builder is None:
+        raise ValueError(f"Tipo de regra desconhecido: {spec.get('tipo')}")
+    return builder(spec)
+
+
+def default_rules(valid_ug_codes: Optional[Iterable[str]] = None) -> List[QualityRule]:
+    """
+    Retorna as regras padrão do Gov-Hub.
+
+    Args:
+        valid_ug_codes: Códigos de UG conhecidos (ex.: do dicionário SIAFI);
+            quando informados, adiciona a regra "codigo_ug_conhecido"
+
+    Returns:
+        Lista de regras
+    """
+    specs = list(DEFAULT_RULES)
+    if valid_ug_codes:
+        specs.append(
+            {
+                "nome": "codigo_ug_conhecido",
+                "tipo": "conjunto",
+                "coluna": "codigo_ug",
+                "valores": list(valid_ug_codes),
+                "descricao": "Código de UG presente no dicionário SIAFI",
+            }
+        )
+    return [build_rule(spec) for spec in specs]
+
+
+class QualityReport:
+    """Contagens e amostras de violações por regra, acumuladas entre blocos."""
+
+    def __init__(self, rules: Sequence[QualityRule], sample_size: int = 5):
+        """
+        Inicializa o relatório.
+
+        Args:
+            rules: Regras avaliadas
+            sample_size: Linhas de exemplo guardadas por regra
+        """
+        self.sample_size = sample_size
+        self.total_records = 0
+        self.sources: List[str] = []
+        self.rules: Dict[str, Dict[str, Any]] = {
+            rule.name: {
+                "descricao": rule.description,
+                "colunas": rule.columns,
+                "verificados": 0,
+                "violacoes": 0,
+                "amostras": [],
+            }
+            for rule in rules
+        }
+
+    def record(self, rule: QualityRule, checked: int, violating: pd.DataFrame) -> None:
+        """Acumula o resultado de uma regra em um bloco."""
+        stats = self.rules[rule.name]
+        stats["verificados"] += checked
+        stats["violacoes"] += len(violating)
+
+        missing = self.sample_size - len(stats["amostras"])
+        if missing > 0 and len(violating):
+            sample = violating.head(missing).astype(object)
+            sample = sample.where(sample.notna(), None)
+            stats["amostras"].extend(sample.to_dict(orient="records"))
+
+    def merge(self, other: "QualityReport") -> "QualityReport":
+        """Combina o relatório de outro arquivo neste, in-place."""
+        self.total_records += other.total_records
+        self.sources.extend(other.sources)
+        for name, other_stats in other.rules.items():
+            stats = self.rules.get(name)
+            if stats is None:
+                self.rules[name] = {**other_stats, "amostras": list(other_stats["amostras"])}
+                continue
+            stats["verificados"] += other_stats["verificados"]
+            stats["violacoes"] += other_stats["violacoes"]
+            missing = self.sample_size - len(stats["amostras"])
+            stats["amostras"].extend(other_stats["amostras"][: max(missing, 0)])
+        return self
+
+    @property
+    def total_violations(self) -> int:
+        """Total de violações somando todas as regras."""
+        return sum(stats["violacoes"] for stats in self.rules.values())
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Resumo serializável do relatório."""
+        rules = {}
+        for name, stats in self.rules.items():
+            checked = stats["verificados"]
+            rules[name] = {
+                **stats,
+                "aplicada": checked > 0,
+                "taxa_violacao": stats["violacoes"] / checked if checked else 0.0,
+            }
+        return {
+            "timestamp": datetime.now().isoformat(),
+            "arquivos": self.sources,
+            "total_registros": self.total_records,
+            "total_violacoes": self.total_violations,
+            "regras": rules,
+        }
+
+    def save(self, path: Path) -> Path:
+        """Grava o relatório em JSON."""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.to_dict(), f, indent=2, ensure_ascii=False, default=str)
+        logger.info(f"✅ Relatório de qualidade salvo: {path}")
+        return path
+
+    def log_summary(self) -> None:
+        """Registra no log o resumo das violações por regra."""
+        logger.info(
+            f"🧪 Qualidade: {self.total_records:,} registros, "
+            f"{self.total_violations:,} violações"
+        )
+        for name, stats in self.rules.items():
+            if stats["verificados"]:
+                icon = "✅" if stats["violacoes"] == 0 else "⚠️"
+                logger.info(
+                    f"   {icon} {name}: {stats['violacoes']:,} de "
+                    f"{stats['verificados']:,} registros"
+                )
+
+
+class DataQualityEngine:
+    """
+    Avalia regras de qualidade sobre DataFrames ou CSVs lidos em blocos.
+
+    Cada regra é uma expressão vetorizada sobre colunas; o custo de validar
+    um arquivo é uma leitura em blocos mais uma operação de coluna por regra.
+    """
+
+    def __init__(
+        self,
+        rules: Optional[Sequence[QualityRule]] = None,
+        sample_size: int = 5,
+        column_aliases: Optional[Dict[str, str]] = None,
+    ):
+        """
+        Inicializa o motor de regras.
+
+        Args:
+            rules: Regras a avaliar (padrão: `default_rules()`)
+            sample_size: Linhas de exemplo guardadas por regra
+            column_aliases: Mapeamento coluna da fonte -> nome canônico
+        """
+        self.rules = list(rules) if rules is not None else default_rules()
+        self.sample_size = sample_size
+        self.column_aliases = COLUMN_ALIASES if column_aliases is None else column_aliases
+
+    @classmethod
+    def from_specs(cls, specs: Iterable[Dict[str, Any]], **kwargs) -> "DataQualityEngine":
+        """Cria o motor a partir de especificações declarativas (ex.: JSON)."""
+        return cls([build_rule(spec) for spec in specs], **kwargs)
+
+    def new_report(self) -> QualityReport:
+        """Cria um relatório vazio para as regras deste motor."""
+        return QualityReport(self.rules, self.sample_size)
+
+    def _canonical(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Renomeia colunas conhecidas para os nomes usados pelas regras."""
+        renames = {}
+        for col in df.columns:
+            clean = str(col).replace('"', "").strip()
+            target = self.column_aliases.get(clean, clean)
+            if target != col and target not in df.columns:
+                renames[col] = target
+        return df.rename(columns=renames) if renames else df
+
+    def check_frame(
+        self, df: pd.DataFrame, report: Optional[QualityReport] = None
+    ) -> QualityReport:
+        """
+        Avalia todas as regras aplicáveis sobre um DataFrame (ou bloco).
+
+        Args:
+            df: Dados a validar
+            report: Relatório a acumular (padrão: um novo)
+
+        Returns:
+            Relatório atualizado
+        """
+        report = report or self.new_report()
+        df = self._canonical(df)
+        report.total_records += len(df)
+
+        for rule in self.rules:
+            if not rule.applies_to(df):
+                continue
+            try:
+                mask = rule.violations(df)
+            except Exception as e:
+                logger.warning(f"⚠️ Regra '{rule.name}' não pôde ser avaliada: {e}")
+                continue
+            report.record(rule, len(df), df.loc[mask.to_numpy()])
+        return report
+
+    def _detect_format(self, path: Path) -> Optional[Dict[str, str]]:
+        """Detecta encoding e separador pelo cabeçalho."""
+        for encoding in ("utf-8", "latin-1"):
+            try:
+                with open(path, "r", encoding=encoding) as f:
+                    header = f.readline()
+            except UnicodeDecodeError:
+                continue
+            sep = ";" if header.count(";") >= header.count(",") else ","
+            return {"encoding": encoding, "sep": sep}
+        return None
+
+    def validate_csv(
+        self,
+        path: Path,
+        chunksize: int = 200_000,
+        report: Optional[QualityReport] = None,
+    ) -> QualityReport:
+        """
+        Valida um CSV inteiro em uma única leitura em blocos.
+
+        Todas as colunas são lidas como texto (preservando zeros à esquerda
+        de códigos e documentos); colunas de valor são convertidas pelas
+        regras que as usam.
+
+        Args:
+            path: Caminho do arquivo
+            chunksize: Registros por bloco
+            report: Relatório a acumular (padrão: um novo)
+
+        Returns:
+            Relatório atualizado
+        """
+        path = Path(path)
+        report = report or self.new_report()
+        fmt = self._detect_format(path)
+        if fmt is None:
+            logger.error(f"❌ Não foi possível detectar o formato de {path}")
+            return report
+
+        logger.info(f"🧪 Validando qualidade de {path.name}...")
+        reader = pd.read_csv(
+            path,
+            dtype=str,
+            chunksize=chunksize,
+            on_bad_lines="skip",
+            na_values=["Sem informação"],
+            **fmt,
+        )
+        for chunk in reader:
+            self.check_frame(chunk, report)
+
+        report.sources.append(path.name)
+        return report
+
+    def validate_files(self, paths: Iterable[Path], chunksize: int = 200_000) -> QualityReport:
+        """Valida vários arquivos, acumulando um único relatório."""
+        report = self.new_report()
+        for path in paths:
+            self.validate_csv(path, chunksize, report)
+        return report
+
+
+def main():
+    """Função principal com interface de linha de comando."""
+    parser = argparse.ArgumentParser(
+        description="Gov-Hub Data Quality - validação de regras sobre arquivos CSV"
+    )
+    parser.add_argument("files", nargs="+", type=Path, help="Arquivos CSV a validar")
+    parser.add_argument(
+        "--rules", type=Path, help="Arquivo JSON com a lista de regras (padrão: regras internas)"
+    )
+    parser.add_argument(
+        "--chunksize", type=int, default=200_000, help="Registros por bloco (padrão: 200000)"
+    )
+    parser.add_argument(
+        "--sample-size", type=int, default=5, help="Linhas de exemplo por regra (padrão: 5)"
+    )
+    parser.add_argument(
+        "--output",
+        type=Path,
+        default=Path("data/processed/qualidade_dados.json"),
+        help="Relatório JSON de saída",
+    )
+
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+
+    if args.rules:
+        with open(args.rules, "r", encoding="utf-8") as f:
+            engine = DataQualityEngine.from_specs(json.load(f), sample_size=args.sample_size)
+    else:
+        engine = DataQualityEngine(sample_size=args.sample_size)
+
+    report = engine.validate_files(args.files, args.chunksize)
+    report.log_summary()
+    report.save(args.output)
+
+    return 0 if report.total_violations == 0 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,322 @@
+#!/usr/bin/env python3
+"""
+Gov-Hub Records Module
+Representação compacta e tipada de linhas para a integração de dados.
+
+Em vez de um `dict` por linha (como produz `csv.DictReader`), cada tabela
+guarda um único esquema compartilhado e as linhas como tuplas. Colunas
+categóricas (órgão, UG, gestão, UASG...) têm suas strings internadas em um
+pool por tabela, e colunas de valor são convertidas para `float`. Linhas
+integradas referenciam as linhas de origem em vez de copiá-las.
+
+Classes:
+    RecordSchema: Esquema compartilhado (nomes, índices e conversores)
+    Record: Visão somente-leitura de uma linha, com API de mapeamento
+    RecordTable: Tabela de linhas compactas carregada de um CSV
+    JoinedRecord: Linha integrada que referencia as linhas de cada fonte
+"""
+
+import csv
+from pathlib import Path
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+)
+
+# Colunas com alta repetição cujas strings são internadas
+CATEGORICAL_FIELDS = frozenset(
+    {
+        "codigo_ug",
+        "orgao",
+        "gestao",
+        "funcao",
+        "uasg",
+        "modalidade",
+        "codigo_siafi",
+        "uf",
+        "programa",
+        "beneficiario",
+    }
+)
+
+
+def _to_float(value: str) -> Optional[float]:
+    """
+    Converte um valor monetário para float.
+
+    Aceita o formato brasileiro ("1.234,56") e o decimal com ponto
+    ("1234.56"). Vazios e valores não numéricos viram None, de modo que a
+    coluna nunca mistura números e strings.
+    """
+    if value is None or value == "":
+        return None
+    if "," in value:
+        value = value.replace(".", "").replace(",", ".")
+    try:
+        return float(value)
+    except ValueError:
+        return None
+
+
+def default_converter(field: str) -> Optional[Callable[[str], Any]]:
+    """Retorna o conversor padrão de uma coluna (None = manter string)."""
+    if field.lower().startswith("valor"):
+        return _to_float
+    return None
+
+
+class RecordSchema:
+    """Esquema compartilhado por todas as linhas de uma tabela."""
+
+    __slots__ = ("fields", "index", "converters", "categorical")
+
+    def __init__(
+        self,
+        fields: Sequence[str],
+        categorical: Iterable[str] = CATEGORICAL_FIELDS,
+        converters: Optional[Dict[str, Callable[[str], Any]]] = None,
+    ):
+        """
+        Inicializa o esquema.
+
+        Args:
+            fields: Nomes das colunas, na ordem do arquivo
+            categorical: Colunas cujas strings devem ser internadas
+            converters: Conversores por coluna (padrão: float para "valor*")
+        """
+        self.fields = tuple(fields)
+        self.index = {field: i for i, field in enumerate(self.fields)}
+        categorical = set(categorical)
+        self.categorical = tuple(f in categorical for f in self.fields)
+
+        if converters is None:
+            converters = {f: default_converter(f) for f in self.fields}
+        self.converters = tuple(converters.get(f) for f in self.fields)
+
+
+class Record:
+    """
+    Visão de uma linha compacta com a API de leitura de um `dict`.
+
+    Compatível com `csv.DictWriter` e com o código que usa `row.get(...)`.
+    """
+
+    __slots__ = ("schema", "values")
+
+    def __init__(self, schema: RecordSchema, values: Tuple[Any, ...]):
+        self.schema = schema
+        self.values = values
+
+    def __getitem__(self, key: str) -> Any:
+        return self.values[self.schema.index[key]]
+
+    def __contains__(self, key: object) -> bool:
+        return key in self.schema.index
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.schema.fields)
+
+    def __len__(self) -> int:
+        return len(self.schema.fields)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        i = self.schema.index.get(key)
+        return default if i is None else self.values[i]
+
+    def keys(self):
+        return self.schema.index.keys()
+
+    def items(self) -> Iterator[Tuple[str, Any]]:
+        return zip(self.schema.fields, self.values)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Materializa a linha como `dict` (use apenas quando necessário)."""
+        return dict(zip(self.schema.fields, self.values))
+
+
+class RecordTable:
+    """
+    Tabela de linhas compactas com esquema único e strings internadas.
+
+    As linhas são armazenadas como tuplas; `Record` é criado apenas como
+    visão durante a iteração.
+    """
+
+    __slots__ = ("name", "schema", "rows", "pool")
+
+    def __init__(self, name: str, schema: RecordSchema):
+        """
+        Inicializa uma tabela vazia.
+
+        Args:
+            name: Nome da tabela (fonte de dados)
+            schema: Esquema das linhas
+        """
+        self.name = name
+        self.schema = schema
+        self.rows: List[Tuple[Any, ...]] = []
+        self.pool: Dict[str, str] = {}
+
+    @classmethod
+    def from_csv(
+        cls,
+        filepath: Path,
+        name: Optional[str] = None,
+        encoding: str = "utf-8",
+        categorical: Iterable[str] = CATEGORICAL_FIELDS,
+    ) -> "RecordTable":
+        """
+        Carrega um CSV em uma tabela compacta.
+
+        Args:
+            filepath: Caminho do arquivo CSV
+            name: Nome da tabela (padrão: nome do arquivo)
+            encoding: Encoding do arquivo
+            categorical: Colunas cujas strings devem ser internadas
+
+        Returns:
+            Tabela carregada
+        """
+        with open(filepath, "r", encoding=encoding, newline="") as f:
+            reader = csv.reader(f)
+            header = next(reader, [])
+            table = cls(name or Path(filepath).stem, RecordSchema(header, categorical))
+            table.extend(reader)
+        return table
+
+    def _convert(self, raw: Sequence[str]) -> Tuple[Any, ...]:
+        """Converte uma linha bruta aplicando internação e conversores."""
+        pool = self.pool
+        schema = self.schema
+        values = []
+        for value, categorical, converter in zip(
+            raw, schema.categorical, schema.converters
+        ):
+            if categorical:
+                value = pool.setdefault(value, value)
+            elif converter is not None:
+                value = converter(value)
+            values.append(value)
+
+        # Linhas curtas são completadas com None, como no DictReader
+        missing = len(schema.fields) - len(values)
+        if missing > 0:
+            values.extend([None] * missing)
+        return tuple(values)
+
+    def extend(self, rows: Iterable[Sequence[str]]) -> None:
+        """Acrescenta linhas brutas (listas de strings) à tabela."""
+        convert = self._convert
+        self.rows.extend(convert(row) for row in rows)
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    def __iter__(self) -> Iterator[Record]:
+        schema = self.schema
+        return (Record(schema, values) for values in self.rows)
+
+    def column(self, field: str) -> List[Any]:
+        """Retorna os valores de uma coluna."""
+        i = self.schema.index[field]
+        return [values[i] for values in self.rows]
+
+
+class JoinedLayout:
+    """
+    Disposição das colunas de uma linha integrada.
+
+    Há uma disposição por combinação de fontes presentes (ex.: SIAFI +
+    Compras sem TransfereGov), compartilhada por todas as linhas com a mesma
+    combinação.
+    """
+
+    __slots__ = ("keys", "index")
+
+    def __init__(
+        self, schemas: Sequence[Optional[RecordSchema]], prefixes: Sequence[str]
+    ):
+        index: Dict[str, Tuple[int, int]] = {}
+        for part, (schema, prefix) in enumerate(zip(schemas, prefixes)):
+            if schema is None:
+                continue
+            for pos, field in enumerate(schema.fields):
+                index[f"{prefix}{field}"] = (part, pos)
+        self.index = index
+        self.keys = tuple(index)
+
+
+class JoinedRecord:
+    """
+    Linha integrada que referencia as linhas de origem sem copiá-las.
+
+    Expõe as colunas da primeira fonte sem prefixo e as demais com o prefixo
+    da fonte (ex.: `compras_valor_total`), como no formato de saída original.
+    As disposições são compartilhadas pelo cache `layouts` do chamador, que
+    deve viver apenas durante uma integração.
+    """
+
+    __slots__ = ("layout", "parts")
+
+    def __init__(
+        self,
+        parts: Sequence[Optional[Record]],
+        prefixes: Sequence[str],
+        layouts: Optional[Dict[Tuple[Any, ...], JoinedLayout]] = None,
+    ):
+        """
+        Cria a linha integrada.
+
+        Args:
+            parts: Linhas de cada fonte (None quando não houve correspondência)
+            prefixes: Prefixo de coluna de cada fonte
+            layouts: Cache de disposições da integração (None = sem cache)
+        """
+        schemas = tuple(part.schema if part is not None else None for part in parts)
+        key = (schemas, tuple(prefixes))
+        layout = layouts.get(key) if layouts is not None else None
+        if layout is None:
+            layout = JoinedLayout(schemas, prefixes)
+            if layouts is not None:
+                layouts[key] = layout
+
+        self.layout = layout
+        self.parts = tuple(
+            part.values if part is not None else None for part in parts
+        )
+
+    def __getitem__(self, key: str) -> Any:
+        part, pos = self.layout.index[key]
+        return self.parts[part][pos]
+
+    def __contains__(self, key: object) -> bool:
+        return key in self.layout.index
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.layout.keys)
+
+    def __len__(self) -> int:
+        return len(self.layout.keys)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        location = self.layout.index.get(key)
+        if location is None:
+            return default
+        return self.parts[location[0]][location[1]]
+
+    def keys(self):
+        return self.layout.index.keys()
+
+    def items(self) -> Iterator[Tuple[str, Any]]:
+        return ((key, self[key]) for key in self.layout.keys)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Materializa a linha como `dict` (use apenas quando necessário)."""
+        return dict(self.items())
@@ -0,0 +1,439 @@
+#!/usr/bin/env python3
+"""
+Gov-Hub Portal da Transparência Module
+Coleta assíncrona de endpoints do Portal da Transparência.
+
+Este módulo distribui as consultas por órgão e por mês com concorrência
+limitada, todas submetidas a um único limitador de taxa compartilhado, e
+grava os resultados de forma incremental (um arquivo JSONL por órgão).
+Com um `CheckpointStore`, cada página gravada é registrada e uma coleta
+interrompida pode ser retomada a partir da próxima página pendente.
+
+Classes:
+    AsyncRateLimiter: Limitador de taxa (token bucket) para corrotinas
+    AsyncTransparenciaCollector: Coletor assíncrono de cartões de pagamento
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from ..utils.checkpoint import CheckpointStore
+from ..utils.reference_cache import ReferenceCache
+
+logger = logging.getLogger(__name__)
+
+BASE_URL = "https://api.portaldatransparencia.gov.br/api-de-dados"
+
+
+class AsyncRateLimiter:
+    """
+    Limitador de taxa do tipo token bucket para uso com asyncio.
+
+    Todas as requisições de um coletor passam pelo mesmo limitador, de modo
+    que a cota da API (requisições por minuto) é respeitada independentemente
+    do número de tarefas concorrentes.
+    """
+
+    def __init__(self, requests_per_minute: int = 90, burst: Optional[int] = None):
+        """
+        Inicializa o limitador.
+
+        Args:
+            requests_per_minute: Número máximo de requisições por minuto
+            burst: Tamanho máximo da rajada (padrão: 1/10 da taxa por minuto)
+        """
+        self.rate = requests_per_minute / 60.0
+        self.capacity = float(burst or max(1, requests_per_minute // 10))
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self) -> None:
+        """Aguarda até que um token esteja disponível e o consome."""
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(
+                    self.capacity, self.tokens + (now - self.updated) * self.rate
+                )
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+
+class AsyncTransparenciaCollector:
+    """
+    Coletor assíncrono de dados do Portal da Transparência.
+
+    Distribui a coleta de `/cartoes` por todos os órgãos válidos e meses
+    informados, com número limitado de requisições simultâneas, e grava cada
+    página recebida em `<output_dir>/cartoes/<codigo_orgao>.jsonl`.
+    """
+
+    def __init__(
+        self,
+        output_dir: str = "data/poc_siafi/dados_brutos",
+        api_key: Optional[str] = None,
+        max_concurrency: int = 8,
+        requests_per_minute: int = 90,
+        page_size: int = 500,
+        max_pages: Optional[int] = None,
+        timeout: int = 30,
+        max_retries: int = 3,
+        checkpoint: Optional[CheckpointStore] = None,
+        reference_cache: Optional[ReferenceCache] = None,
+    ):
+        """
+        Inicializa o coletor assíncrono.
+
+        Args:
+            output_dir: Diretório onde os arquivos por órgão serão gravados
+            api_key: Chave da API (padrão: PORTAL_TRANSPARENCIA_API_KEY)
+            max_concurrency: Número máximo de requisições simultâneas
+            requests_per_minute: Cota de requisições por minuto da API
+            page_size: Registros por página (máximo da API: 500)
+            max_pages: Limite de páginas por órgão/mês (None = sem limite)
+            timeout: Timeout de cada requisição em segundos
+            max_retries: Tentativas por requisição em caso de erro ou 429
+            checkpoint: Registro de páginas concluídas para retomada
+            reference_cache: Cache de tabelas de referência (lista de órgãos)
+        """
+        self.output_dir = Path(output_dir)
+        self.cartoes_dir = self.output_dir / "cartoes"
+        self.cartoes_dir.mkdir(parents=True, exist_ok=True)
+
+        self.api_key = api_key or os.getenv("PORTAL_TRANSPARENCIA_API_KEY")
+        self.headers = {"chave-api-dados": self.api_key, "Accept": "application/json"}
+
+        self.max_concurrency = max_concurrency
+        self.requests_per_minute = requests_per_minute
+        self.page_size = page_size
+        self.max_pages = max_pages
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.checkpoint = checkpoint
+        self.reference_cache = reference_cache
+
+        # Sessão com pool de conexões dimensionado para a concorrência
+        self.session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=max_concurrency, pool_maxsize=max_concurrency
+        )
+        self.session.mount("https://", adapter)
+        self.session.headers.update(self.headers)
+
+        logger.info("AsyncTransparenciaCollector inicializado")
+        logger.info(f"Concorrência: {max_concurrency}, cota: {requests_per_minute}/min")
+
+    async def _get_json(
+        self, limiter: AsyncRateLimiter, endpoint: str, params: Optional[Dict] = None
+    ) -> Optional[List[Dict]]:
+        """
+        Executa uma requisição GET respeitando o limitador compartilhado.
+
+        Args:
+            limiter: Limitador de taxa compartilhado
+            endpoint: Endpoint relativo à URL base
+            params: Parâmetros da consulta
+
+        Returns:
+            Lista de registros, lista vazia se não houver dados ou None se falhou
+        """
+        url = f"{BASE_URL}/{endpoint}"
+
+        for attempt in range(1, self.max_retries + 1):
+            await limiter.acquire()
+            try:
+                response = await asyncio.to_thread(
+                    self.session.get, url, params=params, timeout=self.timeout
+                )
+            except requests.exceptions.RequestException as e:
+                logger.warning(f"Erro na requisição {endpoint} ({attempt}): {e}")
+                await asyncio.sleep(2**attempt)
+                continue
+
+            if response.status_code == 200:
+                return response.json()
+            elif response.status_code == 400:
+                return []
+            elif response.status_code == 429:
+                logger.warning(f"⏳ Rate limit atingido (429) em {endpoint}")
+                await asyncio.sleep(60 / max(1, self.requests_per_minute) * 10)
+                continue
+
+            logger.error(f"❌ Erro {response.status_code} em {endpoint}: {params}")
+            return None
+
+        logger.error(f"❌ Falha após {self.max_retries} tentativas: {endpoint}")
+        return None
+
+    async def get_orgaos_siafi(self, limiter: AsyncRateLimiter) -> List[Dict]:
+        """Coleta a lista de órgãos SIAFI, usando o cache de referência."""
+        cache = self.reference_cache
+        if cache is not None:
+            orgaos = cache.get("orgaos_siafi")
+            if orgaos is not None:
+                logger.info(f"📚 {len(orgaos)} órgãos SIAFI obtidos do cache")
+                return orgaos
+
+        orgaos = await self._get_json(limiter, "orgaos-siafi")
+        if cache is not None:
+            if orgaos:
+                cache.store("orgaos_siafi", orgaos, source="orgaos-siafi")
+            elif cache.age("orgaos_siafi") is not None:
+                logger.warning("⚠️ Usando lista de órgãos vencida do cache")
+                return cache.rows("orgaos_siafi")
+        return orgaos or []
+
+    def _append_page(self, path: Path, records: List[Dict]) -> int:
+        """
+        Acrescenta os registros de uma página ao arquivo JSONL do órgão.
+
+        Returns:
+            Tamanho do arquivo (offset) após a gravação
+        """
+        with open(path, "a", encoding="utf-8") as f:
+            for record in records:
+                f.write(json.dumps(record, ensure_ascii=False) + "\n")
+            return f.tell()
+
+    def _prepare_output(self, codigo: str, output_file: Path) -> None:
+        """
+        Prepara o arquivo de saída do órgão antes da coleta.
+
+        Sem retomada, o arquivo é truncado. Na retomada, é cortado no offset da
+        última página registrada, descartando uma página gravada pela metade.
+        """
+        if self.checkpoint is None or not self.checkpoint.resume:
+            output_file.write_bytes(b"")
+            return
+
+        offsets = [
+            entry.get("offset", 0)
+            for entry in self.checkpoint.entries("cartoes")
+            if entry["params"].get("codigoOrgao") == codigo
+        ]
+        if output_file.exists():
+            with open(output_file, "r+b") as f:
+                f.truncate(max(offsets, default=0))
+
+    async def collect_orgao(
+        self,
+        limiter: AsyncRateLimiter,
+        semaphore: asyncio.Semaphore,
+        orgao: Dict,
+        meses: List[str],
+    ) -> int:
+        """
+        Coleta todas as páginas de cartões de um órgão para os meses informados.
+
+        Args:
+            limiter: Limitador de taxa compartilhado
+            semaphore: Semáforo que limita requisições simultâneas
+            orgao: Registro do órgão (codigo, descricao)
+            meses: Períodos no formato MM/AAAA
+
+        Returns:
+            Número de registros do órgão no arquivo de saída, inclusive os das
+            páginas retomadas do checkpoint
+        """
+        codigo = orgao["codigo"]
+        nome = orgao.get("descricao", "")
+        output_file = self.cartoes_dir / f"{codigo}.jsonl"
+
+        await asyncio.to_thread(self._prepare_output, codigo, output_file)
+
+        # Páginas já gravadas em execuções anteriores contam no total: uma
+        # retomada completa não deve parecer uma coleta vazia
+        total = 0
+        if self.checkpoint:
+            total = sum(
+                entry.get("records", 0)
+                for entry in self.checkpoint.entries("cartoes")
+                if entry["params"].get("codigoOrgao") == codigo
+                and entry["params"].get("mesAno") in meses
+            )
+
+        for mes_ano in meses:
+            series = {"codigoOrgao": codigo, "mesAno": mes_ano}
+            if self.checkpoint and self.checkpoint.is_complete("cartoes", series):
+                continue
+
+            pagina = 1
+            while self.max_pages is None or pagina <= self.max_pages:
+                if self.checkpoint and self.checkpoint.is_done(
+                    "cartoes", series, pagina
+                ):
+                    pagina += 1
+                    continue
+
+                params = {
+                    "mesAnoInicio": mes_ano,
+                    "mesAnoFim": mes_ano,
+                    "codigoOrgao": codigo,
+                    "pagina": pagina,
+                    "tamanhoPagina": self.page_size,
+                }
+                async with semaphore:
+                    cartoes = await self._get_json(limiter, "cartoes", params)
+
+                if cartoes is None:
+                    break
+                if not cartoes:
+                    if self.checkpoint:
+                        self.checkpoint.mark_complete("cartoes", series)
+                    break
+
+                for cartao in cartoes:
+                    cartao["orgao_codigo"] = codigo
+                    cartao["orgao_nome"] = nome
+                    cartao["mes_ano"] = mes_ano
+
+                offset = await asyncio.to_thread(
+                    self._append_page, output_file, cartoes
+                )
+                total += len(cartoes)
+
+                if self.checkpoint:
+                    self.checkpoint.mark_page(
+                        "cartoes", series, pagina, output_file, len(cartoes),
+                        offset=offset,
+                    )
+
+                if len(cartoes) < self.page_size:
+                    if self.checkpoint:
+                        self.checkpoint.mark_complete("cartoes", series)
+                    break
+                pagina += 1
+
+        if total:
+            logger.info(f"✅ {codigo} - {nome}: {total:,} registros")
+        return total
+
+    async def collect_async(
+        self, meses: List[str], orgaos: Optional[List[Dict]] = None
+    ) -> Dict[str, int]:
+        """
+        Coleta cartões de todos os órgãos válidos em paralelo.
+
+        Args:
+            meses: Períodos no formato MM/AAAA
+            orgaos: Lista de órgãos (padrão: consulta `/orgaos-siafi`)
+
+        Returns:
+            Dicionário codigo_orgao -> número de registros coletados
+        """
+        limiter = AsyncRateLimiter(self.requests_per_minute)
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        if orgaos is None:
+            orgaos = await self.get_orgaos_siafi(limiter)
+
+        orgaos_validos = [
+            o for o in orgaos if "CODIGO INVALIDO" not in o.get("descricao", "")
+        ]
+        logger.info(
+            f"🏛️ {len(orgaos_validos)} órgãos válidos x {len(meses)} mês(es)"
+        )
+
+        tasks = [
+            self.collect_orgao(limiter, semaphore, orgao, meses)
+            for orgao in orgaos_validos
+        ]
+        totals = await asyncio.gather(*tasks, return_exceptions=True)
+
+        results = {}
+        for orgao, total in zip(orgaos_validos, totals):
+            if isinstance(total, BaseException):
+                logger.error(f"❌ Falha no órgão {orgao['codigo']}: {total}")
+                continue
+            results[orgao["codigo"]] = total
+
+        logger.info(f"📊 Total coletado: {sum(results.values()):,} registros")
+        return results
+
+    def collect(
+        self, meses: List[str], orgaos: Optional[List[Dict]] = None
+    ) -> Dict[str, int]:
+        """Versão síncrona de `collect_async`."""
+        try:
+            return asyncio.run(self.collect_async(meses, orgaos))
+        finally:
+            self.session.close()
+
+
+def main():
+    """Função principal com interface de linha de comando."""
+    parser = argparse.ArgumentParser(
+        description="Coleta assíncrona de cartões de pagamento por órgão"
+    )
+    parser.add_argument(
+        "--meses",
+        nargs="+",
+        default=["01/2024"],
+        help="Períodos no formato MM/AAAA (padrão: 01/2024)",
+    )
+    parser.add_argument(
+        "--output-dir",
+        default="data/poc_siafi/dados_brutos",
+        help="Diretório de saída (padrão: data/poc_siafi/dados_brutos)",
+    )
+    parser.add_argument(
+        "--concurrency", type=int, default=8, help="Requisições simultâneas"
+    )
+    parser.add_argument(
+        "--rpm", type=int, default=90, help="Cota de requisições por minuto"
+    )
+    parser.add_argument(
+        "--max-pages", type=int, default=None, help="Páginas por órgão/mês"
+    )
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="Retoma a coleta anterior a partir das páginas pendentes",
+    )
+
+    args = parser.parse_args()
+
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s - %(levelname)s - [%(name)s] - %(message)s",
+    )
+
+    try:
+        checkpoint = CheckpointStore(
+            "transparencia_cartoes",
+            checkpoint_dir=str(Path(args.output_dir) / "checkpoints"),
+            resume=args.resume,
+        )
+        collector = AsyncTransparenciaCollector(
+            output_dir=args.output_dir,
+            max_concurrency=args.concurrency,
+            requests_per_minute=args.rpm,
+            max_pages=args.max_pages,
+            checkpoint=checkpoint,
+            reference_cache=ReferenceCache(),
+        )
+        results = collector.collect(args.meses)
+        return 0 if results else 1
+
+    except Exception as e:
+        logger.error(f"Erro crítico: {e}")
+        return 1
+
+
+if __name__ == "__main__":
+    import sys
+
+    sys.exit(main())
@@ -0,0 +1,331 @@
+#!/usr/bin/env python3
+"""
+Gov-Hub Warehouse Module
+Carga dos empenhos processados em um banco embarcado (SQLite ou DuckDB).
+
+As saídas finais eram CSVs soltos e relatórios em texto, que qualquer
+consumidor precisava reprocessar. Aqui cada lote processado é gravado em
+massa na tabela `empenhos`, com tipos adequados (datas, valores, chave
+int64 do credor) e índices por UG, órgão, data e credor. A gravação é um
+upsert pelo número do empenho: recarregar o mesmo arquivo, ou uma versão
+corrigida dele, atualiza as linhas em vez de duplicá-las.
+
+O SQLite (biblioteca padrão) é o padrão; o DuckDB é usado com
+`backend="duckdb"` se estiver instalado.
+
+Classes:
+    WarehouseSink: Carga idempotente de empenhos no banco embarcado
+"""
+
+import argparse
+import logging
+import sqlite3
+import sys
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from ..utils.profiler import sniff_encoding
+from .documents import CREDOR_COLUMNS, credor_dtypes, parse_documents
+from .quality import to_number
+
+logger = logging.getLogger(__name__)
+
+# Banco padrão do warehouse
+DEFAULT_WAREHOUSE_PATH = "data/warehouse/govhub.db"
+
+# Coluna da tabela -> (tipo SQL, colunas de origem aceitas, em ordem de preferência)
+EMPENHO_COLUMNS: Dict[str, tuple] = {
+    "numero_empenho": ("VARCHAR", ("numero_empenho", "Código Empenho")),
+    "data_empenho": ("DATE", ("data_empenho", "Data Emissão", "data_emissao")),
+    "ano_exercicio": ("INTEGER", ("ano_exercicio", "Ano")),
+    "codigo_ug": ("VARCHAR", ("codigo_ug", "Código Unidade Gestora")),
+    "nome_ug": ("VARCHAR", ("nome_ug", "Nome Unidade Gestora", "Unidade Gestora")),
+    "codigo_orgao": (
+        "VARCHAR",
+        ("codigo_orgao", "orgao", "Código Órgão", "Código Órgão Superior"),
+    ),
+    "nome_orgao": ("VARCHAR", ("nome_orgao", "Nome Órgão Superior", "Órgão")),
+    "credor_documento": ("VARCHAR", CREDOR_COLUMNS),
+    "credor_chave": ("BIGINT", ()),
+    "nome_credor": ("VARCHAR", ("nome_credor", "Favorecido")),
+    "elemento_despesa": ("VARCHAR", ("elemento_despesa", "Código Elemento de Despesa")),
+    "fonte_recursos": ("VARCHAR", ("fonte_recursos", "Código Fonte Recursos")),
+    "valor_empenhado": ("DOUBLE", ("valor_empenhado", "Valor Empenhado (R$)")),
+    "valor_liquidado": ("DOUBLE", ("valor_liquidado", "Valor Liquidado (R$)")),
+    "valor_pago": ("DOUBLE", ("valor_pago", "Valor Pago (R$)")),
+    "arquivo_origem": ("VARCHAR", ()),
+    "carregado_em": ("TIMESTAMP", ()),
+}
+
+# Índices secundários da tabela de empenhos
+EMPENHO_INDEXES = ("codigo_ug", "codigo_orgao", "data_empenho", "credor_chave")
+
+# Escalares NumPy gravados como tipos nativos pelo sqlite3
+sqlite3.register_adapter(np.int64, int)
+sqlite3.register_adapter(np.float64, float)
+
+
+def _iso_dates(series: pd.Series) -> pd.Series:
+    """Converte datas ("2024-03-15" ou "15/03/2024") para o formato ISO."""
+    text = series.astype("string").str.strip()
+    iso = pd.to_datetime(text, format="%Y-%m-%d", errors="coerce")
+    brazilian = pd.to_datetime(text, format="%d/%m/%Y", errors="coerce")
+    return iso.fillna(brazilian).dt.strftime("%Y-%m-%d")
+
+
+class WarehouseSink:
+    """
+    Carga idempotente de empenhos em um banco embarcado.
+
+    Estrutura do banco:
+        empenhos(numero_empenho PK, data_empenho, codigo_ug, codigo_orgao,
+                 credor_chave, valores..., arquivo_origem, carregado_em)
+        cargas(arquivo, registros, carregado_em)
+    """
+
+    def __init__(self, db_path: str = DEFAULT_WAREHOUSE_PATH, backend: str = "sqlite"):
+        """
+        Inicializa o warehouse, criando tabelas e índices se necessário.
+
+        Args:
+            db_path: Caminho do banco
+            backend: "sqlite" ou "duckdb"
+        """
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.backend = backend
+        # Linhas descartadas por arquivo (sem número de empenho)
+        self.rejected: Dict[str, int] = {}
+
+        if backend == "sqlite":
+            self.conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+            self.conn.execute("PRAGMA journal_mode=WAL")
+            self.conn.execute("PRAGMA synchronous=NORMAL")
+        elif backend == "duckdb":
+            try:
+                import duckdb
+            except ImportError:
+                raise ImportError("DuckDB não instalado. Execute: pip install duckdb")
+            self.conn = duckdb.connect(str(self.db_path))
+        else:
+            raise ValueError(f"Backend não suportado: {backend}")
+
+        columns = ",\n".join(
+            f"{name} {sql_type}" + (" PRIMARY KEY" if name == "numero_empenho" else "")
+            for name, (sql_type, _) in EMPENHO_COLUMNS.items()
+        )
+        self.conn.execute(f"CREATE TABLE IF NOT EXISTS empenhos (\n{columns}\n)")
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS cargas ("
+            "arquivo VARCHAR, registros INTEGER, carregado_em TIMESTAMP)"
+        )
+        for column in EMPENHO_INDEXES:
+            self.conn.execute(
+                f"CREATE INDEX IF NOT EXISTS idx_empenhos_{column} ON empenhos ({column})"
+            )
+        self.conn.commit()
+
+    def close(self) -> None:
+        """Fecha a conexão com o banco."""
+        self.conn.close()
+
+    def __enter__(self) -> "WarehouseSink":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    @staticmethod
+    def _source_column(df: pd.DataFrame, candidates: Iterable[str]) -> Optional[str]:
+        by_normalized = {str(col).replace('"', "").strip(): col for col in df.columns}
+        for candidate in candidates:
+            if candidate in by_normalized:
+                return by_normalized[candidate]
+        return None
+
+    def prepare_frame(self, df: pd.DataFrame, source_file: str = "") -> pd.DataFrame:
+        """
+        Converte um lote para o esquema da tabela `empenhos`.
+
+        Args:
+            df: Lote de dados SIAFI (colunas do gerador ou do Portal)
+            source_file: Nome do arquivo de origem
+
+        Returns:
+            DataFrame tipado, com todas as linhas do lote (inclusive as sem
+            número de empenho, descartadas em `upsert_frame`)
+        """
+        out = pd.DataFrame(index=df.index)
+        for name, (sql_type, candidates) in EMPENHO_COLUMNS.items():
+            if name in out.columns:
+                continue
+            source = self._source_column(df, candidates)
+            if source is None:
+                out[name] = None
+                continue
+            values = df[source]
+            if name == "credor_documento":
+                parsed = parse_documents(values)
+                out[name] = parsed["documento"]
+                out["credor_chave"] = parsed["chave"]
+            elif sql_type == "DOUBLE":
+                out[name] = to_number(values)
+            elif sql_type == "INTEGER":
+                out[name] = pd.to_numeric(values, errors="coerce").astype("Int64")
+            elif sql_type == "DATE":
+                out[name] = _iso_dates(values)
+            else:
+                out[name] = values.astype("string").str.strip()
+
+        out["arquivo_origem"] = source_file
+        out["carregado_em"] = datetime.now().isoformat(sep=" ", timespec="seconds")
+        return out
+
+    def upsert_frame(self, df: pd.DataFrame, source_file: str = "") -> int:
+        """
+        Grava um lote na tabela `empenhos` (upsert pelo número do empenho).
+
+        Linhas sem número de empenho não podem ser gravadas: são descartadas,
+        contadas em `rejected[source_file]` e registradas no log.
+
+        Args:
+            df: Lote de dados SIAFI
+            source_file: Nome do arquivo de origem
+
+        Returns:
+            Número de empenhos gravados (o último registro de cada empenho)
+        """
+        prepared = self.prepare_frame(df, source_file)
+        keyed = prepared["numero_empenho"].notna() & (prepared["numero_empenho"] != "")
+        rejected = int((~keyed).sum())
+        if rejected:
+            self.rejected[source_file] = self.rejected.get(source_file, 0) + rejected
+            logger.warning(
+                f"⚠️ {source_file or 'lote'}: {rejected:,} de {len(prepared):,} linhas "
+                f"sem número de empenho descartadas"
+            )
+
+        prepared = prepared[keyed].drop_duplicates("numero_empenho", keep="last")
+        if prepared.empty:
+            return 0
+
+        columns = list(EMPENHO_COLUMNS)
+        updates = ", ".join(f"{c} = excluded.{c}" for c in columns if c != "numero_empenho")
+        sql = (
+            f"INSERT INTO empenhos ({', '.join(columns)}) "
+            f"VALUES ({', '.join('?' for _ in columns)}) "
+            f"ON CONFLICT (numero_empenho) DO UPDATE SET {updates}"
+        )
+        # Tipos nativos do Python (NA -> None) para o driver do banco
+        rows = prepared[columns].astype(object).where(prepared[columns].notna(), None)
+        self.conn.executemany(sql, rows.itertuples(index=False, name=None))
+        return len(prepared)
+
+    def load_csv(self, path: Path, chunksize: int = 200_000) -> int:
+        """
+        Carrega um CSV do SIAFI em blocos, em uma única transação.
+
+        Args:
+            path: Caminho do arquivo
+            chunksize: Registros por bloco
+
+        Returns:
+            Número de empenhos gravados
+        """
+        path = Path(path)
+        # Encoding pela amostra: o cabeçalho costuma ser ASCII mesmo em latin-1
+        encoding = sniff_encoding(path)
+        with open(path, "r", encoding=encoding) as f:
+            header = f.readline()
+        sep = ";" if header.count(";") > header.count(",") else ","
+        columns = [c.strip().strip('"') for c in header.lstrip("\ufeff").split(sep)]
+
+        logger.info(f"🏗️ Carregando {path.name} no warehouse...")
+        self.rejected.pop(path.name, None)
+        total = 0
+        try:
+            reader = pd.read_csv(
+                path,
+                sep=sep,
+                encoding=encoding,
+                dtype=credor_dtypes(columns),
+                chunksize=chunksize,
+                on_bad_lines="skip",
+                na_values=["Sem informação"],
+            )
+            for chunk in reader:
+                total += self.upsert_frame(chunk, path.name)
+
+            # Arquivo sem nenhum empenho (ex.: despesas por execução): falhar
+            # em vez de relatar uma carga vazia como sucesso
+            rejected = self.rejected.get(path.name, 0)
+            if not total and rejected:
+                raise ValueError(
+                    f"{path.name}: nenhuma das {rejected:,} linhas tem número de "
+                    f"empenho; o arquivo não contém empenhos"
+                )
+            self.conn.execute(
+                "INSERT INTO cargas VALUES (?, ?, ?)",
+                (path.name, total, datetime.now().isoformat(sep=" ", timespec="seconds")),
+            )
+            self.conn.commit()
+        except Exception:
+            self.conn.rollback()
+            raise
+
+        rejected = self.rejected.get(path.name, 0)
+        logger.info(
+            f"✅ {path.name}: {total:,} empenhos gravados"
+            + (f", {rejected:,} linhas sem número de empenho descartadas" if rejected else "")
+        )
+        return total
+
+    def load_files(self, paths: Iterable[Path], chunksize: int = 200_000) -> Dict[str, int]:
+        """Carrega vários arquivos; retorna empenhos gravados por arquivo."""
+        return {Path(path).name: self.load_csv(path, chunksize) for path in paths}
+
+    def count(self) -> int:
+        """Número de empenhos no warehouse."""
+        return self.conn.execute("SELECT COUNT(*) FROM empenhos").fetchone()[0]
+
+    def query(self, sql: str, params: tuple = ()) -> List[tuple]:
+        """Executa uma consulta somente leitura sobre o warehouse."""
+        return self.conn.execute(sql, params).fetchall()
+
+
+def main():
+    """Função principal com interface de linha de comando."""
+    parser = argparse.ArgumentParser(
+        description="Gov-Hub Warehouse - carga de empenhos em banco embarcado"
+    )
+    parser.add_argument("files", nargs="+", type=Path, help="Arquivos CSV do SIAFI")
+    parser.add_argument(
+        "--db", default=DEFAULT_WAREHOUSE_PATH, help=f"Banco (padrão: {DEFAULT_WAREHOUSE_PATH})"
+    )
+    parser.add_argument(
+        "--backend", choices=["sqlite", "duckdb"], default="sqlite", help="Banco embarcado"
+    )
+    parser.add_argument(
+        "--chunksize", type=int, default=200_000, help="Registros por bloco (padrão: 200000)"
+    )
+
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+
+    try:
+        with WarehouseSink(args.db, args.backend) as sink:
+            sink.load_files(args.files, args.chunksize)
+            logger.info(f"📊 Warehouse: {sink.count():,} empenhos em {args.db}")
+        return 0
+    except Exception as e:
+        logger.error(f"❌ Erro na carga do warehouse: {e}")
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,563 @@
+#!/usr/bin/env python3
+"""
+Gov-Hub Datasets Module
+API preguiçosa (lazy) sobre os datasets brutos e processados.
+
+Consumidores das saídas do Gov-Hub carregavam arquivos inteiros no pandas
+mesmo usando poucas colunas. Aqui cada operação apenas acrescenta um passo
+ao plano da consulta; nada é lido até `collect()`, `head()` ou `agg()`. Na
+execução, as colunas necessárias (projeção) e os filtros (predicados) são
+empurrados para a leitura: só as colunas usadas são lidas, partições
+(`coluna=valor/`) que não passam no filtro nem são abertas, e os arquivos
+são lidos em blocos, filtrados e agregados bloco a bloco.
+
+Uso:
+    from govhub import datasets
+    from govhub.datasets import col
+
+    (datasets.siafi()
+        .filter(col("valor_empenhado") > 100000)
+        .select("codigo_ug", "orgao", "valor_empenhado")
+        .groupby("orgao")
+        .agg(total=("valor_empenhado", "sum"), empenhos=("valor_empenhado", "count")))
+
+Classes:
+    Expr: Expressão de filtro sobre colunas
+    Dataset: Consulta preguiçosa sobre um conjunto de arquivos CSV
+    GroupedDataset: Agregação em fluxo de uma consulta
+"""
+
+import json
+import operator
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+import pandas as pd
+
+from .core.documents import credor_dtypes
+
+# Padrões de nome de arquivo por fonte (os mesmos do DataIntegrator)
+SOURCE_PATTERNS = {
+    "siafi": ("*siafi*.csv",),
+    "compras": ("*contrato*.csv", "*compras*.csv"),
+    "transferegov": ("*convenio*.csv", "*transfere*.csv"),
+}
+
+# Agregações suportadas em fluxo -> (agregação parcial, combinação das parciais)
+_AGGREGATIONS = {
+    "sum": ("sum", "sum"),
+    "count": ("count", "sum"),
+    "min": ("min", "min"),
+    "max": ("max", "max"),
+}
+
+
+class _UnknownPartition(Exception):
+    """O filtro não pode ser decidido pelo valor da partição (mantê-la)."""
+
+
+def _coerce_partition(text: str, value: Any) -> Any:
+    """
+    Converte o valor de partição (texto) para o tipo do valor do filtro.
+
+    Levanta `_UnknownPartition` quando a conversão não é possível, para que
+    a partição seja lida em vez de descartada.
+    """
+    if isinstance(value, str):
+        return text
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        try:
+            return type(value)(text)
+        except (TypeError, ValueError):
+            pass
+    raise _UnknownPartition(text)
+
+
+class Expr:
+    """
+    Expressão de filtro sobre colunas, combinável com `&`, `|` e `~`.
+
+    Cada expressão sabe quais colunas usa (para a projeção) e se avalia
+    sobre um DataFrame ou, quando usa apenas colunas de partição, sobre os
+    valores da partição (para descartar arquivos sem lê-los).
+    """
+
+    def __init__(self, columns: Iterable[str], evaluate: Callable[[Any], Any], text: str):
+        self.columns = frozenset(columns)
+        self._evaluate = evaluate
+        self.text = text
+
+    def evaluate(self, data: Any) -> Any:
+        """Avalia sobre um DataFrame (série booleana) ou um dict de partição (bool)."""
+        return self._evaluate(data)
+
+    def __and__(self, other: "Expr") -> "Expr":
+        return Expr(
+            self.columns | other.columns,
+            lambda d: self.evaluate(d) & other.evaluate(d),
+            f"({self.text} & {other.text})",
+        )
+
+    def __or__(self, other: "Expr") -> "Expr":
+        return Expr(
+            self.columns | other.columns,
+            lambda d: self.evaluate(d) | other.evaluate(d),
+            f"({self.text} | {other.text})",
+        )
+
+    def __invert__(self) -> "Expr":
+        def evaluate(d):
+            result = self.evaluate(d)
+            return not result if isinstance(d, dict) else ~result
+
+        return Expr(self.columns, evaluate, f"~{self.text}")
+
+    def __repr__(self) -> str:
+        return self.text
+
+
+class Column:
+    """Referência a uma coluna; comparações produzem expressões de filtro."""
+
+    def __init__(self, name: str):
+        self.name = name
+
+    def _compare(self, op: Callable, symbol: str, value: Any) -> Expr:
+        name = self.name
+
+        def evaluate(data):
+            column = data[name]
+            if isinstance(data, dict):
+                # Valores de partição são texto: comparar como o valor do filtro
+                column = _coerce_partition(column, value)
+            return op(column, value)
+
+        return Expr([name], evaluate, f"{name} {symbol} {value!r}")
+
+    def __eq__(self, value: Any) -> Expr:  # type: ignore[override]
+        return self._compare(operator.eq, "==", value)
+
+    def __ne__(self, value: Any) -> Expr:  # type: ignore[override]
+        return self._compare(operator.ne, "!=", value)
+
+    def __lt__(self, value: Any) -> Expr:
+        return self._compare(operator.lt, "<", value)
+
+    def __le__(self, value: Any) -> Expr:
+        return self._compare(operator.le, "<=", value)
+
+    def __gt__(self, value: Any) -> Expr:
+        return self._compare(operator.gt, ">", value)
+
+    def __ge__(self, value: Any) -> Expr:
+        return self._compare(operator.ge, ">=", value)
+
+    def isin(self, values: Iterable[Any]) -> Expr:
+        """Filtro de pertinência a um conjunto de valores."""
+        values = list(values)
+        name = self.name
+
+        def evaluate(data):
+            if isinstance(data, dict):
+                unknown = False
+                for value in values:
+                    try:
+                        if _coerce_partition(data[name], value) == value:
+                            return True
+                    except _UnknownPartition:
+                        unknown = True
+                if unknown:
+                    raise _UnknownPartition(data[name])
+                return False
+            return data[name].isin(values)
+
+        return Expr([name], evaluate, f"{name} in {values!r}")
+
+    def contains(self, text: str) -> Expr:
+        """Filtro de substring (sem diferenciar maiúsculas)."""
+        name = self.name
+
+        def evaluate(data):
+            if isinstance(data, dict):
+                return text.lower() in str(data[name]).lower()
+            return data[name].astype(str).str.contains(text, case=False, regex=False)
+
+        return Expr([name], evaluate, f"{name} contém {text!r}")
+
+    __hash__ = None  # type: ignore[assignment]
+
+
+def col(name: str) -> Column:
+    """Cria uma referência de coluna para filtros (ex.: `col("orgao") == "26291"`)."""
+    return Column(name)
+
+
+def _detect_format(path: Path) -> Dict[str, Any]:
+    """Detecta encoding, separador e dtypes de leitura pelo cabeçalho."""
+    for encoding in ("utf-8", "latin-1"):
+        try:
+            with open(path, "r", encoding=encoding) as f:
+                header = f.readline()
+        except UnicodeDecodeError:
+            continue
+        sep = ";" if header.count(";") > header.count(",") else ","
+        # Colunas de credor como texto, preservando zeros à esquerda
+        columns = [c.strip().strip('"') for c in header.lstrip("\ufeff").split(sep)]
+        fmt = {"encoding": encoding, "sep": sep, "dtype": credor_dtypes(columns)}
+        if sep == ";":
+            # Arquivos do Portal: números no formato brasileiro
+            fmt.update(decimal=",", thousands=".")
+        return fmt
+    return {"encoding": "latin-1", "sep": ","}
+
+
+def _partition_values(path: Path, root: Optional[Path]) -> Dict[str, str]:
+    """Valores de partição (`coluna=valor`) no caminho do arquivo."""
+    parts = path.relative_to(root).parts[:-1] if root else ()
+    return dict(part.split("=", 1) for part in parts if "=" in part)
+
+
+class Dataset:
+    """
+    Consulta preguiçosa sobre um conjunto de arquivos CSV.
+
+    Cada método devolve um novo `Dataset` com o plano acrescido; a leitura
+    só acontece em `collect()`, `head()`, `iter_chunks()` ou `agg()`.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        files: Sequence[Path],
+        root: Optional[Path] = None,
+        predicates: Sequence[Expr] = (),
+        columns: Optional[Sequence[str]] = None,
+        limit: Optional[int] = None,
+        chunksize: int = 100_000,
+        partition_values: Optional[Dict[str, List[str]]] = None,
+    ):
+        """
+        Inicializa a consulta.
+
+        Args:
+            name: Nome do dataset (para `explain`)
+            files: Arquivos CSV do dataset
+            root: Raiz de um dataset particionado (`coluna=valor/part-*.csv`)
+            predicates: Filtros acumulados
+            columns: Colunas selecionadas (None = todas)
+            limit: Número máximo de linhas
+            chunksize: Linhas por bloco de leitura
+            partition_values: Diretório de partição -> valores brutos
+                gravados nele (do manifesto); sem ele, vale o nome do
+                diretório
+        """
+        self.name = name
+        self.files = [Path(f) for f in files]
+        self.root = Path(root) if root else None
+        self.predicates = list(predicates)
+        self.columns = list(columns) if columns is not None else None
+        self.limit = limit
+        self.chunksize = chunksize
+        self.partition_values = partition_values or {}
+
+    def _replace(self, **changes) -> "Dataset":
+        state = {
+            "name": self.name,
+            "files": self.files,
+            "root": self.root,
+            "predicates": self.predicates,
+            "columns": self.columns,
+            "limit": self.limit,
+            "chunksize": self.chunksize,
+            "partition_values": self.partition_values,
+        }
+        state.update(changes)
+        return Dataset(**state)
+
+    # ---- Construção do plano -------------------------------------------
+
+    def filter(self, *predicates: Expr, **equals: Any) -> "Dataset":
+        """Acrescenta filtros (`col(...)` ou igualdades `coluna=valor`)."""
+        extra = list(predicates) + [col(name) == value for name, value in equals.items()]
+        return self._replace(predicates=self.predicates + extra)
+
+    def select(self, *columns: str) -> "Dataset":
+        """Seleciona as colunas do resultado."""
+        return self._replace(columns=list(columns))
+
+    def limit_rows(self, n: int) -> "Dataset":
+        """Limita o número de linhas lidas."""
+        return self._replace(limit=n if self.limit is None else min(n, self.limit))
+
+    def groupby(self, *keys: str) -> "GroupedDataset":
+        """Agrupa a consulta pelas colunas informadas."""
+        return GroupedDataset(self, list(keys))
+
+    # ---- Execução ----------------------------------------------------------
+
+    def _required_columns(self, extra: Iterable[str] = ()) -> Optional[set]:
+        """
+        Colunas a ler: seleção, colunas extras e filtros (None = todas).
+
+        Sem `select()`, as colunas extras (chaves de agrupamento e entradas
+        das agregações) bastam para definir a projeção.
+        """
+        extra = set(extra)
+        if self.columns is None and not extra:
+            return None
+        needed = set(self.columns or ()) | extra
+        for predicate in self.predicates:
+            needed |= predicate.columns
+        return needed
+
+    def _partitions(self, path: Path) -> List[Dict[str, str]]:
+        """Valores brutos de partição possíveis para as linhas do arquivo."""
+        partition = _partition_values(path, self.root)
+        if not partition:
+            return []
+        raw = self.partition_values.get(path.parent.relative_to(self.root).as_posix())
+        if raw is None or len(partition) != 1:
+            return [partition]
+        (name,) = partition
+        return [{name: value} for value in raw]
+
+    def _may_match(self, partitions: List[Dict[str, str]]) -> bool:
+        """Indica se algum valor de partição pode passar nos filtros."""
+        if not partitions:
+            return True
+        for partition in partitions:
+            keep = True
+            for predicate in self.predicates:
+                if not predicate.columns <= set(partition):
+                    continue
+                try:
+                    keep = bool(predicate.evaluate(partition))
+                except _UnknownPartition:
+                    continue
+                if not keep:
+                    break
+            if keep:
+                return True
+        return False
+
+    def _pruned_files(self) -> List[Tuple[Path, List[Dict[str, str]]]]:
+        """Arquivos que podem conter linhas do resultado (poda por partição)."""
+        selected = []
+        for path in self.files:
+            partitions = self._partitions(path)
+            if self._may_match(partitions):
+                selected.append((path, partitions))
+        return selected
+
+    def iter_chunks(self, extra_columns: Iterable[str] = ()) -> Iterator[pd.DataFrame]:
+        """
+        Executa o plano em blocos, já filtrados e projetados.
+
+        Args:
+            extra_columns: Colunas adicionais necessárias (ex.: de agregações)
+
+        Yields:
+            DataFrames com no máximo `chunksize` linhas
+
+        Raises:
+            KeyError: Se um arquivo não tem alguma coluna usada pelo plano
+                (filtro, seleção ou agregação); um filtro nunca é ignorado
+        """
+        needed = self._required_columns(extra_columns)
+        # Colunas que todo arquivo deve ter (as dos filtros, mesmo sem projeção)
+        expected = set(needed or ())
+        for predicate in self.predicates:
+            expected |= predicate.columns
+        remaining = self.limit
+
+        for path, partitions in self._pruned_files():
+            # Colunas de partição ausentes do arquivo, com valor inequívoco
+            implied = {}
+            for name in partitions[0] if partitions else ():
+                values = {partition[name] for partition in partitions}
+                if len(values) == 1 and (needed is None or name in needed):
+                    implied[name] = values.pop()
+
+            usecols = None if needed is None else (lambda c: c in needed)
+            reader = pd.read_csv(
+                path,
+                usecols=usecols,
+                chunksize=self.chunksize,
+                on_bad_lines="skip",
+                **_detect_format(path),
+            )
+            for chunk in reader:
+                for name, value in implied.items():
+                    if name not in chunk.columns:
+                        chunk[name] = value
+                missing = expected - set(chunk.columns)
+                if missing:
+                    reader.close()
+                    names = ", ".join(sorted(missing))
+                    raise KeyError(f"{path.name}: colunas ausentes do arquivo: {names}")
+                for predicate in self.predicates:
+                    chunk = chunk[predicate.evaluate(chunk).fillna(False).to_numpy(bool)]
+                if self.columns is not None:
+                    chunk = chunk[self.columns]
+
+                if remaining is not None:
+                    chunk = chunk.head(remaining)
+                    remaining -= len(chunk)
+                if len(chunk):
+                    yield chunk
+                if remaining is not None and remaining <= 0:
+                    reader.close()
+                    return
+
+    def collect(self) -> pd.DataFrame:
+        """Executa o plano e devolve o resultado completo."""
+        chunks = list(self.iter_chunks())
+        if not chunks:
+            return pd.DataFrame(columns=self.columns or [])
+        return pd.concat(chunks, ignore_index=True)
+
+    def head(self, n: int = 5) -> pd.DataFrame:
+        """Lê apenas as primeiras `n` linhas do resultado."""
+        return self.limit_rows(n).collect()
+
+    def explain(self) -> str:
+        """Descreve o plano de execução (arquivos, colunas e filtros)."""
+        files = self._pruned_files()
+        needed = self._required_columns()
+        lines = [
+            f"Dataset: {self.name}",
+            f"  Arquivos: {len(files)} de {len(self.files)} (após poda por partição)",
+            f"  Colunas lidas: {sorted(needed) if needed is not None else 'todas'}",
+            f"  Filtros: {', '.join(p.text for p in self.predicates) or 'nenhum'}",
+            f"  Limite: {self.limit if self.limit is not None else 'nenhum'}",
+            f"  Blocos de: {self.chunksize:,} linhas",
+        ]
+        return "\n".join(lines)
+
+    def __repr__(self) -> str:
+        return self.explain()
+
+
+class GroupedDataset:
+    """Agregação em fluxo: parciais por bloco, combinadas ao final."""
+
+    def __init__(self, dataset: Dataset, keys: List[str]):
+        self.dataset = dataset
+        self.keys = keys
+
+    def agg(self, **aggregations: Tuple[str, str]) -> pd.DataFrame:
+        """
+        Agrega as colunas por grupo, bloco a bloco.
+
+        Args:
+            aggregations: Nome do resultado -> (coluna, função), com função
+                em "sum", "count", "min", "max" ou "mean"
+
+        Returns:
+            DataFrame com uma linha por grupo
+        """
+        partial_specs: Dict[str, Tuple[str, str]] = {}
+        finals: Dict[str, Tuple[str, ...]] = {}
+        for out, (column, func) in aggregations.items():
+            if func == "mean":
+                partial_specs[f"{out}__sum"] = (column, "sum")
+                partial_specs[f"{out}__count"] = (column, "count")
+                finals[out] = ("mean", f"{out}__sum", f"{out}__count")
+            elif func in _AGGREGATIONS:
+                partial_specs[out] = (column, _AGGREGATIONS[func][0])
+                finals[out] = (_AGGREGATIONS[func][1], out)
+            else:
+                raise ValueError(f"Agregação não suportada em fluxo: {func}")
+
+        value_columns = {column for column, _ in aggregations.values()}
+        partials = [
+            chunk.groupby(self.keys, dropna=False, observed=True).agg(**partial_specs)
+            for chunk in self.dataset.iter_chunks(set(self.keys) | value_columns)
+        ]
+        if not partials:
+            return pd.DataFrame(columns=self.keys + list(aggregations))
+
+        combined = pd.concat(partials)
+        merged = combined.groupby(level=self.keys, dropna=False).agg(_combine_specs(finals))
+
+        result = pd.DataFrame(index=merged.index)
+        for out, final in finals.items():
+            if final[0] == "mean":
+                result[out] = merged[final[1]] / merged[final[2]]
+            else:
+                result[out] = merged[final[1]]
+        return result.reset_index()
+
+    def sum(self, *columns: str) -> pd.DataFrame:
+        """Soma das colunas por grupo."""
+        return self.agg(**{c: (c, "sum") for c in columns})
+
+    def count(self, column: Optional[str] = None) -> pd.DataFrame:
+        """Número de linhas (valores não nulos de `column`) por grupo."""
+        column = column or self.keys[0]
+        return self.agg(registros=(column, "count"))
+
+
+def _combine_specs(finals: Dict[str, Tuple[str, ...]]) -> Dict[str, str]:
+    """Função de combinação de cada coluna parcial."""
+    specs = {}
+    for final in finals.values():
+        if final[0] == "mean":
+            specs[final[1]] = "sum"
+            specs[final[2]] = "sum"
+        else:
+            specs[final[1]] = final[0]
+    return specs
+
+
+# ---- Datasets do Gov-Hub ----------------------------------------------------
+
+
+def read_csv(paths: Iterable[Path], name: str = "csv", chunksize: int = 100_000) -> Dataset:
+    """Cria um dataset preguiçoso sobre arquivos CSV quaisquer."""
+    return Dataset(name, sorted(Path(p) for p in paths), chunksize=chunksize)
+
+
+def _source(source: str, raw_dir: str, latest: bool) -> Dataset:
+    files = sorted(
+        {path for pattern in SOURCE_PATTERNS[source] for path in Path(raw_dir).glob(pattern)}
+    )
+    if latest and files:
+        # Mesmo critério do DataIntegrator: maior nome de arquivo
+        files = [max(files, key=lambda p: p.name.lower())]
+    return Dataset(source, files)
+
+
+def siafi(raw_dir: str = "data/raw", latest: bool = True) -> Dataset:
+    """Dataset do SIAFI (arquivo mais recente, ou todos com `latest=False`)."""
+    return _source("siafi", raw_dir, latest)
+
+
+def compras(raw_dir: str = "data/raw", latest: bool = True) -> Dataset:
+    """Dataset de contratos do Compras.gov.br."""
+    return _source("compras", raw_dir, latest)
+
+
+def transferegov(raw_dir: str = "data/raw", latest: bool = True) -> Dataset:
+    """Dataset de convênios do TransfereGov."""
+    return _source("transferegov", raw_dir, latest)
+
+
+def integrado(processed_dir: str = "data/processed") -> Dataset:
+    """
+    Dataset integrado particionado (`govhub integrate --external`).
+
+    Filtros sobre a coluna de particionamento descartam partições inteiras.
+    """
+    root = Path(processed_dir) / "integrado"
+    manifest_path = root / "_manifest.json"
+    if manifest_path.exists():
+        with open(manifest_path, "r", encoding="utf-8") as f:
+            manifest = json.load(f)
+        partitions = manifest.get("particoes", {})
+        files = [p for part in partitions for p in sorted((root / part).glob("part-*.csv"))]
+        values = manifest.get("valores_particao")
+    else:
+        files = sorted(root.glob("**/part-*.csv"))
+        values = None
+    return Dataset("integrado", files, root=root, partition_values=values)
@@ -3,15 +3,67 @@ Gov-Hub Utilities Module
 Módulo de utilitários para o sistema Gov-Hub.
 
 Este módulo contém classes e funções utilitárias para validação,
-logging, helpers e outras funcionalidades de suporte.
+logging, helpers e outras funcionalidades de suporte. As classes são
+importadas sob demanda (PEP 562).
 
 Módulos:
     validation: Sistema de validação completa do projeto
+    checkpoint: Checkpoints para coletas paginadas retomáveis
+    reference_cache: Cache persistente de tabelas de referência com TTL
+    sketches: Estruturas probabilísticas para dados em fluxo
+    profiler: Perfil de arquivos CSV em uma única passada
 """
 
+import importlib
+from typing import TYPE_CHECKING
+
 __version__ = "1.0.0"
 __author__ = "Gov-Hub Team"
 
-from .validation import SystemValidator
+_LAZY_ATTRIBUTES = {
+    "SystemValidator": ".validation",
+    "CheckpointStore": ".checkpoint",
+    "ReferenceCache": ".reference_cache",
+    "HyperLogLog": ".sketches",
+    "CountMinSketch": ".sketches",
+    "SpaceSaving": ".sketches",
+    "TDigest": ".sketches",
+    "FileProfile": ".profiler",
+    "profile_csv": ".profiler",
+    "sniff_encoding": ".profiler",
+}
+
+if TYPE_CHECKING:
+    from .validation import SystemValidator
+    from .checkpoint import CheckpointStore
+    from .reference_cache import ReferenceCache
+    from .sketches import CountMinSketch, HyperLogLog, SpaceSaving, TDigest
+    from .profiler import FileProfile, profile_csv, sniff_encoding
+
+__all__ = [
+    "SystemValidator",
+    "CheckpointStore",
+    "ReferenceCache",
+    "HyperLogLog",
+    "CountMinSketch",
+    "SpaceSaving",
+    "TDigest",
+    "FileProfile",
+    "profile_csv",
+    "sniff_encoding",
+]
+
+
+def __getattr__(name: str):
+    """Importa o módulo da classe pedida no primeiro acesso."""
+    module_name = _LAZY_ATTRIBUTES.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
+
 
-__all__ = ["SystemValidator"]
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_ATTRIBUTES))
@@ -0,0 +1,247 @@
+#!/usr/bin/env python3
+"""
+Gov-Hub Checkpoint Module
+Armazenamento de checkpoints para coletas paginadas retomáveis.
+
+Cada página concluída é registrada como uma tupla (endpoint, params, página)
+em um log JSONL somente-anexação, e os registros da página são gravados em um
+segmento próprio. Uma execução interrompida (Ctrl+C, erro ou cota esgotada)
+pode então ser retomada com `--resume` sem repetir requisições já feitas.
+Um mesmo armazenamento pode ser compartilhado entre threads (ex.: etapas de
+download concorrentes do pipeline): toda escrita no log é serializada.
+
+Classes:
+    CheckpointStore: Registro persistente de páginas concluídas
+"""
+
+import hashlib
+import json
+import logging
+import os
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class CheckpointStore:
+    """
+    Registro persistente de páginas concluídas e seus segmentos de saída.
+
+    Estrutura em disco:
+        <checkpoint_dir>/<nome>/checkpoint.jsonl  - log de páginas concluídas
+        <checkpoint_dir>/<nome>/segments/*.json   - registros de cada página
+    """
+
+    def __init__(
+        self,
+        name: str,
+        checkpoint_dir: str = "data/checkpoints",
+        resume: bool = False,
+    ):
+        """
+        Inicializa o armazenamento de checkpoints.
+
+        Args:
+            name: Nome da execução (ex.: "siafi_despesas_2024_12")
+            checkpoint_dir: Diretório base dos checkpoints
+            resume: Se False, descarta checkpoints anteriores com o mesmo nome
+        """
+        self.base_dir = Path(checkpoint_dir) / name
+        self.segments_dir = self.base_dir / "segments"
+        self.log_path = self.base_dir / "checkpoint.jsonl"
+        self.resume = resume
+        self._lock = threading.RLock()
+
+        if not resume:
+            self.clear()
+
+        self.segments_dir.mkdir(parents=True, exist_ok=True)
+        self._entries: Dict[str, Dict[str, Any]] = self._load_log()
+
+        if resume and self._entries:
+            logger.info(
+                f"♻️ Retomando '{name}': {len(self._entries)} página(s) já concluída(s)"
+            )
+
+    @staticmethod
+    def _key(endpoint: str, params: Optional[Dict], page: Any) -> str:
+        """Gera a chave canônica de uma tupla (endpoint, params, página)."""
+        canonical = json.dumps(
+            [endpoint, params or {}, page], sort_keys=True, ensure_ascii=False
+        )
+        return hashlib.sha1(canonical.encode("utf-8")).hexdigest()
+
+    @staticmethod
+    def _series_key(endpoint: str, params: Optional[Dict]) -> str:
+        """Gera a chave de uma série de páginas (endpoint + params)."""
+        return CheckpointStore._key(endpoint, params, None)
+
+    def _load_log(self) -> Dict[str, Dict[str, Any]]:
+        """Lê o log de checkpoints, ignorando uma última linha truncada."""
+        entries = {}
+        if not self.log_path.exists():
+            return entries
+
+        with open(self.log_path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    logger.warning("⚠️ Linha de checkpoint truncada ignorada")
+                    continue
+                entries[entry["key"]] = entry
+        return entries
+
+    def _append_log(self, entry: Dict[str, Any]) -> None:
+        """Acrescenta uma entrada ao log de forma durável (seguro entre threads)."""
+        line = json.dumps(entry, ensure_ascii=False) + "\n"
+        with self._lock:
+            with open(self.log_path, "a", encoding="utf-8") as f:
+                f.write(line)
+                f.flush()
+                os.fsync(f.fileno())
+            self._entries[entry["key"]] = entry
+
+    def is_done(self, endpoint: str, params: Optional[Dict], page: Any) -> bool:
+        """Verifica se a página já foi concluída."""
+        return self._key(endpoint, params, page) in self._entries
+
+    def is_complete(self, endpoint: str, params: Optional[Dict]) -> bool:
+        """Verifica se a série (todas as páginas) já foi concluída."""
+        return self._series_key(endpoint, params) in self._entries
+
+    def record_page(
+        self,
+        endpoint: str,
+        params: Optional[Dict],
+        page: Any,
+        records: List[Dict],
+    ) -> Path:
+        """
+        Grava o segmento de uma página e a registra como concluída.
+
+        O segmento é escrito em arquivo temporário e renomeado antes de a
+        entrada ir para o log, de modo que nenhuma página é marcada como
+        concluída sem que seus dados estejam em disco.
+
+        Args:
+            endpoint: Endpoint consultado
+            params: Parâmetros da consulta (sem a página)
+            page: Número (ou identificador) da página
+            records: Registros retornados pela página
+
+        Returns:
+            Caminho do segmento gravado
+        """
+        segment = self.segments_dir / f"{self._key(endpoint, params, page)}.json"
+        tmp = segment.with_suffix(".tmp")
+
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(records, f, ensure_ascii=False)
+        os.replace(tmp, segment)
+
+        self.mark_page(endpoint, params, page, segment, len(records))
+        return segment
+
+    def mark_page(
+        self,
+        endpoint: str,
+        params: Optional[Dict],
+        page: Any,
+        segment: Optional[Path] = None,
+        records: int = 0,
+        **extra: Any,
+    ) -> None:
+        """
+        Registra uma página concluída cujo segmento foi gravado pelo chamador.
+
+        Args:
+            endpoint: Endpoint consultado
+            params: Parâmetros da consulta (sem a página)
+            page: Número (ou identificador) da página
+            segment: Arquivo de saída onde os registros foram gravados
+            records: Número de registros da página
+            **extra: Metadados adicionais (ex.: offset no arquivo de saída)
+        """
+        entry = {
+            "key": self._key(endpoint, params, page),
+            "endpoint": endpoint,
+            "params": params or {},
+            "page": page,
+            "segment": str(segment) if segment else None,
+            "records": records,
+            "timestamp": datetime.now().isoformat(),
+        }
+        entry.update(extra)
+        self._append_log(entry)
+
+    def mark_complete(
+        self, endpoint: str, params: Optional[Dict], **extra: Any
+    ) -> None:
+        """Registra que a série não possui mais páginas (com metadados extras)."""
+        with self._lock:
+            if self.is_complete(endpoint, params):
+                return
+            entry = {
+                "key": self._series_key(endpoint, params),
+                "endpoint": endpoint,
+                "params": params or {},
+                "page": None,
+                "complete": True,
+                "timestamp": datetime.now().isoformat(),
+            }
+            entry.update(extra)
+            self._append_log(entry)
+
+    def load_page(
+        self, endpoint: str, params: Optional[Dict], page: Any
+    ) -> Optional[List[Dict]]:
+        """Carrega os registros de uma página concluída (None se ausente)."""
+        entry = self._entries.get(self._key(endpoint, params, page))
+        if not entry or not entry.get("segment"):
+            return None
+
+        segment = Path(entry["segment"])
+        try:
+            with open(segment, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            logger.warning(f"⚠️ Segmento ausente ou corrompido: {segment.name}")
+            with self._lock:
+                self._entries.pop(entry["key"], None)
+            return None
+
+    def entries(self, endpoint: str) -> List[Dict[str, Any]]:
+        """Lista as entradas de páginas concluídas de um endpoint."""
+        with self._lock:
+            return [
+                entry
+                for entry in self._entries.values()
+                if entry["endpoint"] == endpoint and entry["page"] is not None
+            ]
+
+    def is_finished(self, step: str) -> bool:
+        """Verifica se uma etapa nomeada (sem paginação) foi concluída."""
+        return self.is_complete(step, None)
+
+    def mark_finished(self, step: str, **extra: Any) -> None:
+        """Registra a conclusão de uma etapa nomeada (sem paginação)."""
+        self.mark_complete(step, None, **extra)
+
+    def finished_entry(self, step: str) -> Optional[Dict[str, Any]]:
+        """Retorna a entrada de conclusão de uma etapa (None se pendente)."""
+        with self._lock:
+            return self._entries.get(self._series_key(step, None))
+
+    def clear(self) -> None:
+        """Remove todos os checkpoints e segmentos desta execução."""
+        with self._lock:
+            if self.segments_dir.exists():
+                for segment in self.segments_dir.iterdir():
+                    segment.unlink()
+            if self.log_path.exists():
+                self.log_path.unlink()
+            self._entries = {}
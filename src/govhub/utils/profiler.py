@@ -0,0 +1,383 @@
+#!/usr/bin/env python3
+"""
+Gov-Hub File Profiler Module
+Perfil de arquivos CSV em uma única passada.
+
+Relatórios e amostras eram gerados relendo o mesmo arquivo várias vezes
+(cabeçalho, contagem de linhas, amostra, relatório). O `profile_csv` lê os
+bytes do arquivo uma única vez e produz, de forma incremental: contagem de
+registros, colunas, taxa de nulos por coluna, mínimo/máximo/soma das colunas
+de valor, os órgãos mais frequentes (sketch Space-Saving), contagens de
+distintos (HyperLogLog), quantis das colunas de valor (t-digest) e uma
+amostra aleatória uniforme (reservoir sampling). Todos os relatórios e
+geradores de amostra consomem esse mesmo perfil, e perfis de arquivos ou
+partições diferentes podem ser combinados com `FileProfile.merge`.
+
+Classes:
+    FileProfile: Resultado do perfil de um arquivo
+"""
+
+import codecs
+import csv
+import logging
+import random
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+from .sketches import HyperLogLog, SpaceSaving, TDigest
+
+logger = logging.getLogger(__name__)
+
+# Bytes lidos do início do arquivo para detectar o encoding
+ENCODING_SAMPLE_SIZE = 4 * 1024 * 1024
+
+# Coluna usada para os órgãos mais frequentes
+DEFAULT_TOP_K_COLUMN = "Nome Órgão Superior"
+
+# Colunas com contagem aproximada de distintos (as presentes no arquivo)
+DEFAULT_DISTINCT_COLUMNS = (
+    "Código Órgão Superior",
+    "Código Unidade Gestora",
+    "Código Favorecido",
+    "codigo_ug",
+    "orgao",
+    "credor",
+    "cnpj_credor",
+)
+
+# Valores tratados como nulos
+NULL_VALUES = frozenset({"", "Sem informação"})
+
+
+def _normalize(column: str) -> str:
+    """Normaliza o nome de coluna (aspas e espaços) para comparação."""
+    return column.replace('"', "").strip()
+
+
+def parse_brazilian_number(value: str) -> Optional[float]:
+    """
+    Converte um número no formato brasileiro ("1.234,56") para float.
+
+    Returns:
+        Valor convertido ou None se vazio/inválido
+    """
+    value = value.replace('"', "").strip()
+    if not value:
+        return None
+    if "," in value:
+        value = value.replace(".", "").replace(",", ".")
+    try:
+        return float(value)
+    except ValueError:
+        return None
+
+
+class FileProfile:
+    """Perfil de um arquivo CSV produzido por `profile_csv`."""
+
+    def __init__(self, path: Path, columns: List[str], encoding: str, delimiter: str):
+        self.path = Path(path)
+        self.columns = columns
+        self.encoding = encoding
+        self.delimiter = delimiter
+        self.size_mb = self.path.stat().st_size / 1024 / 1024
+        self.total_lines = 0
+        self.total_records = 0
+        self.null_counts = [0] * len(columns)
+        self.value_stats: Dict[str, Dict[str, Any]] = {}
+        self.top_k_column: Optional[str] = None
+        self.heavy_hitters: Optional[SpaceSaving] = None
+        self.distinct: Dict[str, HyperLogLog] = {}
+        self.digests: Dict[str, TDigest] = {}
+        self.sample: List[List[str]] = []
+        self.created_at = datetime.now().isoformat()
+
+    @property
+    def clean_columns(self) -> List[str]:
+        """Nomes das colunas sem aspas."""
+        return [_normalize(col) for col in self.columns]
+
+    def null_rate(self) -> Dict[str, float]:
+        """Retorna a fração de valores nulos por coluna."""
+        total = self.total_records or 1
+        return {
+            col: count / total
+            for col, count in zip(self.clean_columns, self.null_counts)
+        }
+
+    def value_summary(self, column: str) -> Dict[str, Any]:
+        """Retorna as estatísticas de uma coluna de valor (nome sem aspas)."""
+        column = _normalize(column)
+        stats = self.value_stats.get(column)
+        if not stats:
+            return {"total_registros": 0, "soma": 0.0, "media": 0.0, "minimo": 0.0, "maximo": 0.0}
+
+        count = stats["count"]
+        summary = {
+            "total_registros": count,
+            "soma": stats["sum"],
+            "media": stats["sum"] / count if count else 0.0,
+            "minimo": stats["min"] if count else 0.0,
+            "maximo": stats["max"] if count else 0.0,
+        }
+        if count and column in self.digests:
+            summary.update(self.digests[column].quantiles((0.5, 0.9, 0.99)))
+        return summary
+
+    def distinct_counts(self) -> Dict[str, int]:
+        """Retorna a contagem aproximada de distintos por coluna monitorada."""
+        return {col: hll.count() for col, hll in self.distinct.items()}
+
+    def top_k(self, k: int = 10) -> Dict[str, int]:
+        """Retorna os k valores mais frequentes da coluna monitorada."""
+        if self.heavy_hitters is None:
+            return {}
+        return dict(self.heavy_hitters.top(k))
+
+    def write_sample(self, output_path: Path, encoding: str = "utf-8") -> int:
+        """
+        Grava a amostra (com cabeçalho) em CSV, na ordem original das linhas.
+
+        Args:
+            output_path: Arquivo de destino
+            encoding: Encoding do arquivo de destino
+
+        Returns:
+            Número de registros gravados
+        """
+        with open(output_path, "w", encoding=encoding, newline="") as f:
+            writer = csv.writer(f, delimiter=self.delimiter, quoting=csv.QUOTE_ALL)
+            writer.writerow(self.clean_columns)
+            writer.writerows(self.sample)
+        return len(self.sample)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Resumo serializável do perfil."""
+        return {
+            "arquivo": self.path.name,
+            "tamanho_mb": self.size_mb,
+            "encoding": self.encoding,
+            "separador": self.delimiter,
+            "colunas": self.clean_columns,
+            "total_colunas": len(self.columns),
+            "total_linhas": self.total_lines,
+            "total_registros": self.total_records,
+            "taxa_nulos": self.null_rate(),
+            "valores": {col: self.value_summary(col) for col in self.value_stats},
+            "top_k_coluna": self.top_k_column,
+            "top_k": self.top_k(),
+            "distintos": self.distinct_counts(),
+            "amostra_registros": len(self.sample),
+            "timestamp_processamento": self.created_at,
+        }
+
+    def merge(self, other: "FileProfile") -> "FileProfile":
+        """
+        Combina o perfil de outro arquivo/partição com o mesmo cabeçalho.
+
+        Contagens, nulos, estatísticas de valor e sketches são combinados; a
+        amostra mantida é a deste perfil.
+
+        Args:
+            other: Perfil a combinar
+
+        Returns:
+            Este perfil, atualizado
+        """
+        if other.clean_columns != self.clean_columns:
+            raise ValueError("Perfis com colunas diferentes não podem ser combinados")
+
+        self.total_lines += other.total_lines
+        self.total_records += other.total_records
+        self.size_mb += other.size_mb
+        self.null_counts = [a + b for a, b in zip(self.null_counts, other.null_counts)]
+
+        for col, stats in other.value_stats.items():
+            mine = self.value_stats[col]
+            mine["count"] += stats["count"]
+            mine["sum"] += stats["sum"]
+            mine["min"] = min(mine["min"], stats["min"])
+            mine["max"] = max(mine["max"], stats["max"])
+
+        if self.heavy_hitters is not None and other.heavy_hitters is not None:
+            self.heavy_hitters.merge(other.heavy_hitters)
+        for col, hll in other.distinct.items():
+            if col in self.distinct:
+                self.distinct[col].merge(hll)
+        for col, digest in other.digests.items():
+            if col in self.digests:
+                self.digests[col].merge(digest)
+        return self
+
+
+def sniff_encoding(path: Path, sample_size: int = ENCODING_SAMPLE_SIZE) -> str:
+    """
+    Detecta o encoding (UTF-8 ou latin-1) por uma amostra do arquivo.
+
+    O cabeçalho dos arquivos do SIAFI costuma ser ASCII mesmo quando os
+    nomes de órgãos e favorecidos estão em latin-1, por isso a decisão usa
+    os primeiros `sample_size` bytes, e não apenas a primeira linha.
+
+    Args:
+        path: Caminho do arquivo
+        sample_size: Bytes lidos do início do arquivo
+
+    Returns:
+        "utf-8" se a amostra for UTF-8 válido, senão "latin-1"
+    """
+    with open(path, "rb") as f:
+        sample = f.read(sample_size)
+    try:
+        # Decodificador incremental: a amostra pode cortar um caractere ao meio
+        codecs.getincrementaldecoder("utf-8")().decode(sample, final=False)
+    except UnicodeDecodeError:
+        return "latin-1"
+    return "utf-8"
+
+
+def _decode_lines(raw_lines: Iterator[bytes], state: Dict[str, str]) -> Iterator[str]:
+    """
+    Decodifica as linhas em fluxo, trocando para latin-1 na primeira falha.
+
+    O encoding efetivo fica em `state["encoding"]`.
+    """
+    for raw in raw_lines:
+        if state["encoding"] == "utf-8":
+            try:
+                yield raw.decode("utf-8")
+                continue
+            except UnicodeDecodeError:
+                state["encoding"] = "latin-1"
+        yield raw.decode("latin-1")
+
+
+def profile_csv(
+    path: Path,
+    sample_size: int = 1000,
+    top_k_column: str = DEFAULT_TOP_K_COLUMN,
+    top_k_capacity: int = 100,
+    distinct_columns: Iterable[str] = DEFAULT_DISTINCT_COLUMNS,
+    seed: Optional[int] = 42,
+) -> FileProfile:
+    """
+    Gera o perfil de um CSV em uma única passada sobre os bytes.
+
+    Colunas cujo nome contém "valor" são tratadas como numéricas (formato
+    brasileiro). O separador (";" ou ",") é detectado pelo cabeçalho e o
+    encoding começa como UTF-8, trocando para latin-1 se necessário.
+
+    Args:
+        path: Caminho do arquivo CSV
+        sample_size: Tamanho da amostra aleatória (reservoir sampling)
+        top_k_column: Coluna cujos valores mais frequentes são estimados
+        top_k_capacity: Contadores mantidos pelo sketch de frequência
+        distinct_columns: Colunas com contagem aproximada de distintos
+        seed: Semente da amostragem (None = aleatória)
+
+    Returns:
+        Perfil do arquivo
+    """
+    path = Path(path)
+    rng = random.Random(seed)
+    state = {"encoding": "utf-8"}
+
+    with open(path, "rb") as f:
+        lines = _decode_lines(f, state)
+        header_line = next(lines, "").lstrip("\ufeff")
+        delimiter = ";" if header_line.count(";") >= header_line.count(",") else ","
+        columns = next(csv.reader([header_line], delimiter=delimiter), [])
+
+        profile = FileProfile(path, columns, state["encoding"], delimiter)
+        clean = profile.clean_columns
+        n_columns = len(columns)
+
+        value_indexes = [i for i, col in enumerate(clean) if "valor" in col.lower()]
+        for i in value_indexes:
+            profile.value_stats[clean[i]] = {
+                "count": 0,
+                "sum": 0.0,
+                "min": float("inf"),
+                "max": float("-inf"),
+            }
+            profile.digests[clean[i]] = TDigest()
+        value_columns = [
+            (i, profile.value_stats[clean[i]], profile.digests[clean[i]])
+            for i in value_indexes
+        ]
+
+        distinct_indexes = []
+        for col in distinct_columns:
+            if col in clean:
+                profile.distinct[col] = HyperLogLog()
+                distinct_indexes.append((clean.index(col), profile.distinct[col]))
+
+        top_k_index = clean.index(top_k_column) if top_k_column in clean else None
+        if top_k_index is not None:
+            profile.top_k_column = top_k_column
+            profile.heavy_hitters = SpaceSaving(top_k_capacity)
+
+        # Contar linhas físicas enquanto o csv.reader consome o fluxo
+        line_counter = [1 if header_line else 0]
+
+        def counted(source: Iterator[str]) -> Iterator[str]:
+            for line in source:
+                line_counter[0] += 1
+                yield line
+
+        null_counts = profile.null_counts
+        sample = profile.sample
+        records = 0
+
+        for row in csv.reader(counted(lines), delimiter=delimiter):
+            if not row:
+                continue
+            records += 1
+
+            for i in range(min(n_columns, len(row))):
+                if row[i].strip() in NULL_VALUES:
+                    null_counts[i] += 1
+            for i in range(len(row), n_columns):
+                null_counts[i] += 1
+
+            for i, stats, digest in value_columns:
+                if i < len(row):
+                    number = parse_brazilian_number(row[i])
+                    if number is not None:
+                        digest.add(number)
+                        stats["count"] += 1
+                        stats["sum"] += number
+                        if number < stats["min"]:
+                            stats["min"] = number
+                        if number > stats["max"]:
+                            stats["max"] = number
+
+            for i, hll in distinct_indexes:
+                if i < len(row):
+                    key = row[i].strip()
+                    if key not in NULL_VALUES:
+                        hll.add(key)
+
+            if top_k_index is not None and top_k_index < len(row):
+                key = row[top_k_index].strip()
+                if key not in NULL_VALUES:
+                    profile.heavy_hitters.add(key)
+
+            # Reservoir sampling (algoritmo R), guardando a posição original
+            if len(sample) < sample_size:
+                sample.append((records, row))
+            else:
+                j = rng.randrange(records)
+                if j < sample_size:
+                    sample[j] = (records, row)
+
+    profile.total_records = records
+    profile.total_lines = line_counter[0]
+    profile.encoding = state["encoding"]
+    profile.sample = [row for _, row in sorted(sample, key=lambda item: item[0])]
+
+    logger.info(
+        f"🔎 Perfil de {path.name}: {records:,} registros, "
+        f"{n_columns} colunas, encoding {profile.encoding}"
+    )
+    return profile
@@ -0,0 +1,260 @@
+#!/usr/bin/env python3
+"""
+Gov-Hub Reference Cache Module
+Cache persistente de tabelas de referência (órgãos, UGs, funções...).
+
+Tabelas de apoio como `/orgaos-siafi` mudam raramente, mas eram consultadas
+novamente a cada execução e regravadas em novas cópias JSON+CSV com
+timestamp. Este módulo as armazena uma única vez em um banco SQLite indexado
+por código, com prazo de validade (TTL) por tabela: a API só é consultada
+quando a tabela está vencida, e qualquer etapa do processamento pode obter
+o nome de um código em O(1).
+
+Classes:
+    ReferenceCache: Cache SQLite de tabelas código→descrição com TTL
+"""
+
+import json
+import logging
+import sqlite3
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Validade padrão das tabelas de referência (7 dias)
+DEFAULT_TTL_SECONDS = 7 * 24 * 3600
+
+
+class ReferenceCache:
+    """
+    Cache SQLite de tabelas de referência com validade (TTL).
+
+    Estrutura do banco:
+        tabelas(nome, atualizado_em, fonte, registros)
+        entradas(tabela, codigo, descricao, dados)  - chave (tabela, codigo)
+    """
+
+    def __init__(
+        self,
+        db_path: str = "data/reference/referencia.db",
+        ttl_seconds: int = DEFAULT_TTL_SECONDS,
+    ):
+        """
+        Inicializa o cache, criando o banco se necessário.
+
+        Args:
+            db_path: Caminho do banco SQLite
+            ttl_seconds: Validade padrão das tabelas, em segundos
+        """
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.ttl_seconds = ttl_seconds
+        self._lookups: Dict[str, Dict[str, str]] = {}
+
+        self.conn = sqlite3.connect(str(self.db_path))
+        self.conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS tabelas (
+                nome TEXT PRIMARY KEY,
+                atualizado_em REAL NOT NULL,
+                fonte TEXT,
+                registros INTEGER NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS entradas (
+                tabela TEXT NOT NULL,
+                codigo TEXT NOT NULL,
+                descricao TEXT,
+                dados TEXT NOT NULL,
+                PRIMARY KEY (tabela, codigo)
+            ) WITHOUT ROWID;
+            """
+        )
+
+    def close(self) -> None:
+        """Fecha a conexão com o banco."""
+        self.conn.close()
+
+    def __enter__(self) -> "ReferenceCache":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def age(self, table: str) -> Optional[float]:
+        """Retorna a idade da tabela em segundos (None se nunca gravada)."""
+        row = self.conn.execute(
+            "SELECT atualizado_em FROM tabelas WHERE nome = ?", (table,)
+        ).fetchone()
+        return None if row is None else time.time() - row[0]
+
+    def is_stale(self, table: str, ttl_seconds: Optional[int] = None) -> bool:
+        """Indica se a tabela está ausente ou vencida."""
+        age = self.age(table)
+        ttl = self.ttl_seconds if ttl_seconds is None else ttl_seconds
+        return age is None or age > ttl
+
+    def store(
+        self,
+        table: str,
+        rows: List[Dict],
+        code_field: str = "codigo",
+        name_field: str = "descricao",
+        source: Optional[str] = None,
+    ) -> int:
+        """
+        Substitui o conteúdo de uma tabela.
+
+        Args:
+            table: Nome da tabela (ex.: "orgaos_siafi")
+            rows: Registros retornados pela API
+            code_field: Campo com o código (chave)
+            name_field: Campo com a descrição
+            source: Origem dos dados (ex.: endpoint)
+
+        Returns:
+            Número de registros gravados
+        """
+        entries = [
+            (
+                table,
+                str(row[code_field]),
+                row.get(name_field),
+                json.dumps(row, ensure_ascii=False),
+            )
+            for row in rows
+            if row.get(code_field) is not None
+        ]
+
+        with self.conn:
+            self.conn.execute("DELETE FROM entradas WHERE tabela = ?", (table,))
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO entradas VALUES (?, ?, ?, ?)", entries
+            )
+            self.conn.execute(
+                "INSERT OR REPLACE INTO tabelas VALUES (?, ?, ?, ?)",
+                (table, time.time(), source, len(entries)),
+            )
+
+        self._lookups.pop(table, None)
+        logger.info(f"💾 Tabela de referência '{table}': {len(entries)} registros")
+        return len(entries)
+
+    def store_mapping(
+        self, table: str, mapping: Dict[str, str], source: Optional[str] = None
+    ) -> int:
+        """
+        Substitui o conteúdo de uma tabela a partir de um mapeamento código→nome.
+
+        Args:
+            table: Nome da tabela (ex.: "unidades_gestoras")
+            mapping: Dicionário código→descrição
+            source: Origem dos dados
+
+        Returns:
+            Número de registros gravados
+        """
+        rows = [
+            {"codigo": code, "descricao": name} for code, name in mapping.items()
+        ]
+        return self.store(table, rows, source=source)
+
+    def rows(self, table: str) -> List[Dict]:
+        """Retorna os registros completos de uma tabela, ordenados por código."""
+        cursor = self.conn.execute(
+            "SELECT dados FROM entradas WHERE tabela = ? ORDER BY codigo", (table,)
+        )
+        return [json.loads(dados) for (dados,) in cursor]
+
+    def get(self, table: str, ttl_seconds: Optional[int] = None) -> Optional[List[Dict]]:
+        """Retorna os registros da tabela se ela estiver válida, senão None."""
+        if self.is_stale(table, ttl_seconds):
+            return None
+        return self.rows(table)
+
+    def get_or_fetch(
+        self,
+        table: str,
+        fetch: Callable[[], Optional[List[Dict]]],
+        code_field: str = "codigo",
+        name_field: str = "descricao",
+        ttl_seconds: Optional[int] = None,
+        force: bool = False,
+        source: Optional[str] = None,
+    ) -> Optional[List[Dict]]:
+        """
+        Retorna a tabela do cache, consultando a fonte apenas se vencida.
+
+        Se a consulta falhar (retorno vazio ou exceção), uma cópia vencida
+        (quando existir) é usada.
+
+        Args:
+            table: Nome da tabela
+            fetch: Função que consulta a fonte e retorna os registros
+            code_field: Campo com o código (chave)
+            name_field: Campo com a descrição
+            ttl_seconds: Validade específica desta tabela
+            force: Ignora o cache e consulta a fonte
+            source: Origem dos dados (ex.: endpoint)
+
+        Returns:
+            Registros da tabela ou None se indisponível
+        """
+        if not force:
+            rows = self.get(table, ttl_seconds)
+            if rows is not None:
+                logger.info(f"📚 '{table}' obtida do cache ({len(rows)} registros)")
+                return rows
+
+        try:
+            fetched = fetch()
+        except Exception as e:
+            logger.warning(f"⚠️ Erro ao consultar '{table}': {e}")
+            fetched = None
+        if fetched:
+            self.store(table, fetched, code_field, name_field, source)
+            return fetched
+
+        if self.age(table) is not None:
+            logger.warning(f"⚠️ Falha ao atualizar '{table}'; usando cópia vencida")
+            return self.rows(table)
+        return None
+
+    def lookup(self, table: str) -> Dict[str, str]:
+        """
+        Retorna o mapeamento código→descrição da tabela, mantido em memória.
+
+        Args:
+            table: Nome da tabela
+
+        Returns:
+            Dicionário código→descrição (vazio se a tabela não existir)
+        """
+        mapping = self._lookups.get(table)
+        if mapping is None:
+            cursor = self.conn.execute(
+                "SELECT codigo, descricao FROM entradas WHERE tabela = ?", (table,)
+            )
+            mapping = dict(cursor.fetchall())
+            self._lookups[table] = mapping
+        return mapping
+
+    def name(self, table: str, code) -> Optional[str]:
+        """Retorna a descrição de um código (None se desconhecido)."""
+        return self.lookup(table).get(str(code))
+
+    def tables(self) -> List[Dict]:
+        """Lista as tabelas armazenadas com data de atualização e tamanho."""
+        cursor = self.conn.execute(
+            "SELECT nome, atualizado_em, fonte, registros FROM tabelas ORDER BY nome"
+        )
+        return [
+            {
+                "nome": nome,
+                "atualizado_em": atualizado_em,
+                "fonte": fonte,
+                "registros": registros,
+            }
+            for nome, atualizado_em, fonte, registros in cursor
+        ]
@@ -0,0 +1,330 @@
+#!/usr/bin/env python3
+"""
+Gov-Hub Sketches Module
+Estruturas probabilísticas de memória limitada para dados em fluxo.
+
+Permitem estatísticas aproximadas sobre arquivos inteiros (um ano de SIAFI,
+por exemplo) com memória fixa, independentemente do volume. Todas aceitam
+atualização em blocos (`update`, com qualquer iterável, inclusive uma
+`pd.Series` de um chunk) e podem ser combinadas (`merge`) entre arquivos e
+partições processadas separadamente.
+
+Classes:
+    HyperLogLog: Contagem aproximada de valores distintos
+    CountMinSketch: Frequência aproximada de qualquer item
+    SpaceSaving: Itens mais frequentes (heavy hitters) com k contadores
+    TDigest: Quantis aproximados de valores numéricos
+"""
+
+import hashlib
+import math
+from typing import Dict, Hashable, Iterable, List, Optional, Tuple
+
+
+def _hash64(item: Hashable, salt: bytes = b"") -> int:
+    """Hash estável de 64 bits (independente de PYTHONHASHSEED)."""
+    digest = hashlib.blake2b(
+        str(item).encode("utf-8"), digest_size=8, salt=salt
+    ).digest()
+    return int.from_bytes(digest, "big")
+
+
+class HyperLogLog:
+    """
+    HyperLogLog para contagem aproximada de valores distintos.
+
+    Usa 2**precision registradores de um byte (16 KB com precision=14), com
+    erro padrão de aproximadamente 1.04 / sqrt(2**precision) (~0,8%).
+    """
+
+    def __init__(self, precision: int = 14):
+        """
+        Inicializa o sketch.
+
+        Args:
+            precision: Bits usados para escolher o registrador (4 a 18)
+        """
+        if not 4 <= precision <= 18:
+            raise ValueError("precision deve estar entre 4 e 18")
+        self.precision = precision
+        self.m = 1 << precision
+        self.registers = bytearray(self.m)
+        self._rest_bits = 64 - precision
+        self._rest_mask = (1 << self._rest_bits) - 1
+
+    def add(self, item: Hashable) -> None:
+        """Registra um item."""
+        x = _hash64(item)
+        index = x >> self._rest_bits
+        rank = self._rest_bits - (x & self._rest_mask).bit_length() + 1
+        if rank > self.registers[index]:
+            self.registers[index] = rank
+
+    def update(self, items: Iterable[Hashable]) -> None:
+        """Registra todos os itens de um bloco."""
+        for item in items:
+            self.add(item)
+
+    def count(self) -> int:
+        """Estima o número de itens distintos."""
+        m = self.m
+        alpha = 0.7213 / (1 + 1.079 / m)
+        estimate = alpha * m * m / sum(2.0 ** -r for r in self.registers)
+
+        # Correção para cardinalidades pequenas (linear counting)
+        zeros = self.registers.count(0)
+        if estimate <= 2.5 * m and zeros:
+            estimate = m * math.log(m / zeros)
+        return int(round(estimate))
+
+    def merge(self, other: "HyperLogLog") -> "HyperLogLog":
+        """Combina outro sketch (mesma precisão) neste, in-place."""
+        if other.precision != self.precision:
+            raise ValueError("Não é possível combinar HyperLogLog de precisões diferentes")
+        self.registers = bytearray(map(max, self.registers, other.registers))
+        return self
+
+
+class CountMinSketch:
+    """
+    Count-Min Sketch para frequência aproximada de itens.
+
+    A estimativa nunca é menor que a frequência real e, com probabilidade
+    1 - e**-depth, excede-a em no máximo (e / width) * total.
+    """
+
+    def __init__(self, width: int = 2048, depth: int = 4):
+        """
+        Inicializa o sketch.
+
+        Args:
+            width: Contadores por linha
+            depth: Número de linhas (funções de hash)
+        """
+        self.width = width
+        self.depth = depth
+        self.table = [[0] * width for _ in range(depth)]
+        self.total = 0
+
+    def _indexes(self, item: Hashable) -> List[int]:
+        """Índices do item em cada linha (hashing duplo)."""
+        h1 = _hash64(item)
+        h2 = _hash64(item, salt=b"cms") | 1
+        return [(h1 + i * h2) % self.width for i in range(self.depth)]
+
+    def add(self, item: Hashable, count: int = 1) -> None:
+        """Registra `count` ocorrências do item."""
+        self.total += count
+        for row, index in zip(self.table, self._indexes(item)):
+            row[index] += count
+
+    def update(self, items: Iterable[Hashable]) -> None:
+        """Registra todos os itens de um bloco."""
+        for item in items:
+            self.add(item)
+
+    def estimate(self, item: Hashable) -> int:
+        """Estima a frequência do item (limite superior)."""
+        return min(row[index] for row, index in zip(self.table, self._indexes(item)))
+
+    def merge(self, other: "CountMinSketch") -> "CountMinSketch":
+        """Combina outro sketch (mesmas dimensões) neste, in-place."""
+        if (other.width, other.depth) != (self.width, self.depth):
+            raise ValueError("Não é possível combinar Count-Min de dimensões diferentes")
+        for row, other_row in zip(self.table, other.table):
+            for i, value in enumerate(other_row):
+                row[i] += value
+        self.total += other.total
+        return self
+
+
+class SpaceSaving:
+    """
+    Algoritmo Space-Saving para os k itens mais frequentes.
+
+    Mantém no máximo `capacity` contadores. Quando um item novo chega com a
+    tabela cheia, ele substitui o item de menor contagem e herda essa
+    contagem como erro máximo. Todo item com frequência real maior que
+    N / capacity está garantidamente presente.
+    """
+
+    def __init__(self, capacity: int = 100):
+        """
+        Inicializa o sketch.
+
+        Args:
+            capacity: Número de contadores mantidos
+        """
+        self.capacity = capacity
+        self.counts: Dict[Hashable, int] = {}
+        self.errors: Dict[Hashable, int] = {}
+        self.total = 0
+
+    def add(self, item: Hashable, count: int = 1) -> None:
+        """Registra uma ocorrência (ou `count` ocorrências) do item."""
+        self.total += count
+        if item in self.counts:
+            self.counts[item] += count
+        elif len(self.counts) < self.capacity:
+            self.counts[item] = count
+            self.errors[item] = 0
+        else:
+            victim = min(self.counts, key=self.counts.__getitem__)
+            floor = self.counts.pop(victim)
+            self.errors.pop(victim)
+            self.counts[item] = floor + count
+            self.errors[item] = floor
+
+    def update(self, items: Iterable[Hashable]) -> None:
+        """Registra todos os itens de um bloco."""
+        for item in items:
+            self.add(item)
+
+    def top(self, k: int = 10) -> List[Tuple[Hashable, int]]:
+        """Retorna os k itens mais frequentes com suas contagens estimadas."""
+        return sorted(self.counts.items(), key=lambda item: item[1], reverse=True)[:k]
+
+    def error(self, item: Hashable) -> int:
+        """Retorna o erro máximo (superestimação) da contagem de um item."""
+        return self.errors.get(item, 0)
+
+    def _floor(self) -> int:
+        """Contagem máxima de um item ausente (0 se a tabela não encheu)."""
+        if len(self.counts) < self.capacity:
+            return 0
+        return min(self.counts.values())
+
+    def merge(self, other: "SpaceSaving") -> "SpaceSaving":
+        """
+        Combina outro sketch neste, in-place.
+
+        Um item ausente em um dos lados recebe, desse lado, a menor contagem
+        mantida (o máximo que ele poderia ter), somada também ao erro.
+        """
+        floor_self, floor_other = self._floor(), other._floor()
+        counts: Dict[Hashable, int] = {}
+        errors: Dict[Hashable, int] = {}
+        for item in set(self.counts) | set(other.counts):
+            counts[item] = self.counts.get(item, floor_self) + other.counts.get(
+                item, floor_other
+            )
+            errors[item] = self.errors.get(item, floor_self) + other.errors.get(
+                item, floor_other
+            )
+
+        kept = sorted(counts, key=counts.__getitem__, reverse=True)[: self.capacity]
+        self.counts = {item: counts[item] for item in kept}
+        self.errors = {item: errors[item] for item in kept}
+        self.total += other.total
+        return self
+
+
+class TDigest:
+    """
+    t-digest (variante com fusão) para quantis aproximados.
+
+    Resume a distribuição em centróides (média, peso) pequenos nas caudas e
+    maiores no centro, o que dá boa precisão para p1/p99 com memória
+    proporcional a `compression`.
+    """
+
+    def __init__(self, compression: int = 100):
+        """
+        Inicializa o sketch.
+
+        Args:
+            compression: Controla o número de centróides (precisão x memória)
+        """
+        self.compression = compression
+        self.centroids: List[Tuple[float, float]] = []
+        self.count = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+        self._buffer: List[Tuple[float, float]] = []
+        self._buffer_size = compression * 5
+
+    def add(self, value: float, weight: float = 1.0) -> None:
+        """Registra um valor."""
+        self._buffer.append((value, weight))
+        self.count += weight
+        if value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+        if len(self._buffer) >= self._buffer_size:
+            self._compress()
+
+    def update(self, values: Iterable[float]) -> None:
+        """Registra todos os valores de um bloco (ignorando NaN/None)."""
+        for value in values:
+            if value is not None and value == value:
+                self.add(float(value))
+
+    def _compress(self) -> None:
+        """Funde buffer e centróides respeitando o limite de tamanho por quantil."""
+        if not self._buffer:
+            return
+        items = sorted(self.centroids + self._buffer)
+        self._buffer = []
+
+        total = self.count
+        merged: List[Tuple[float, float]] = []
+        mean, weight = items[0]
+        weight_before = 0.0
+        for next_mean, next_weight in items[1:]:
+            q = (weight_before + (weight + next_weight) / 2) / total
+            limit = 4 * total * q * (1 - q) / self.compression
+            if weight + next_weight <= limit:
+                weight += next_weight
+                mean += (next_mean - mean) * next_weight / weight
+            else:
+                merged.append((mean, weight))
+                weight_before += weight
+                mean, weight = next_mean, next_weight
+        merged.append((mean, weight))
+        self.centroids = merged
+
+    def quantile(self, q: float) -> Optional[float]:
+        """
+        Estima o quantil q (0 a 1).
+
+        Returns:
+            Valor estimado ou None se nenhum valor foi registrado
+        """
+        self._compress()
+        if not self.centroids:
+            return None
+        if q <= 0:
+            return self.min
+        if q >= 1:
+            return self.max
+
+        target = q * self.count
+        cumulative = 0.0
+        prev_mean, prev_pos = self.min, 0.0
+        for mean, weight in self.centroids:
+            pos = cumulative + weight / 2
+            if target < pos:
+                if pos == prev_pos:
+                    return mean
+                return prev_mean + (mean - prev_mean) * (target - prev_pos) / (pos - prev_pos)
+            prev_mean, prev_pos = mean, pos
+            cumulative += weight
+
+        if self.count <= prev_pos:
+            return self.max
+        return prev_mean + (self.max - prev_mean) * (target - prev_pos) / (self.count - prev_pos)
+
+    def quantiles(self, qs: Iterable[float] = (0.5, 0.9, 0.99)) -> Dict[str, Optional[float]]:
+        """Retorna vários quantis, rotulados como "p50", "p90"..."""
+        return {f"p{q * 100:g}": self.quantile(q) for q in qs}
+
+    def merge(self, other: "TDigest") -> "TDigest":
+        """Combina outro sketch neste, in-place."""
+        self._buffer.extend(other.centroids)
+        self._buffer.extend(other._buffer)
+        self.count += other.count
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        self._compress()
+        return self
@@ -21,6 +21,7 @@
 from markdown.treeprocessors import Treeprocessor
 from mkdocs.structure.pages import Page
 from mkdocs.utils import get_relative_url
+from urllib.parse import urlsplit
 from xml.etree.ElementTree import Element
 
 # -----------------------------------------------------------------------------
@@ -56,3 +57,40 @@ class ExcerptTreeprocessor(Treeprocessor):
 
             # Main headline has been seen
             main = False
+
+# -----------------------------------------------------------------------------
+
+# Relocation tree processor - excerpts are rendered once relative to the root
+# of the site, and then included in many views at different locations, which
+# is why all relative links are marked, so they can be relocated to each view
+class RelocationTreeprocessor(Treeprocessor):
+
+    # Transform HTML after Markdown processing
+    def run(self, root: Element):
+        for el in root.iter():
+            if el.tag == "a":
+                key = "href"
+            elif el.tag == "img":
+                key = "src"
+            else:
+                continue
+
+            # Skip elements without link
+            url = el.get(key)
+            if not url:
+                continue
+
+            # Mark link, so it can be relocated, but skip links with scheme or
+            # host, absolute links and anchors, as they're independent of views
+            scheme, netloc, path, *_ = urlsplit(url)
+            if not scheme and not netloc and path and not path.startswith("/"):
+                el.set(key, f"{relocation_start}{url}{relocation_end}")
+
+# -----------------------------------------------------------------------------
+# Data
+# -----------------------------------------------------------------------------
+
+# Markers for relocatable links - characters from the private use area, as
+# Markdown itself uses control characters for its placeholders
+relocation_start = "\ue000"
+relocation_end   = "\ue001"
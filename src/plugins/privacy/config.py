@@ -40,4 +40,6 @@ class PrivacyConfig(Config):
     assets = Type(bool, default = True)
     assets_fetch = Type(bool, default = True)
     assets_fetch_dir = Type(str, default = "assets/external")
+    assets_fetch_timeout = Type(int, default = 30)
+    assets_fetch_max_size = Type(int, default = 64 * 1024 * 1024)
     assets_expr_map = DictOfItems(Type(str), default = {})
@@ -20,13 +20,14 @@
 
 from __future__ import annotations
 
-import errno
+import json
 import logging
 import os
 import posixpath
 import re
 import requests
 import sys
+import threading
 
 from colorama import Fore, Style
 from concurrent.futures import Future, ThreadPoolExecutor, wait
@@ -36,13 +37,14 @@ from mkdocs.config.defaults import MkDocsConfig
 from mkdocs.exceptions import PluginError
 from mkdocs.plugins import BasePlugin, event_priority
 from mkdocs.structure.files import File, Files
+from html import escape
 from mkdocs.utils import is_error_template
 from re import Match
+from requests.adapters import HTTPAdapter
 from urllib.parse import ParseResult as URL, urlparse, unquote
-from xml.etree.ElementTree import Element, tostring
 
 from .config import PrivacyConfig
-from .parser import FragmentParser
+from .parser import iter_tags
 
 # -----------------------------------------------------------------------------
 # Classes
@@ -61,6 +63,36 @@ class PrivacyPlugin(BasePlugin[PrivacyConfig]):
         self.pool = ThreadPoolExecutor(self.config.concurrency)
         self.pool_jobs: list[Future] = []
 
+        # Initialize jobs for external assets, keyed by path, and lock
+        self.jobs: dict[str, Future] = {}
+        self.lock = threading.Lock()
+
+        # Initialize map of URLs of external assets to files, which allows to
+        # resolve URLs that were already fetched without computing their path
+        self.files: dict[str, File] = {}
+
+        # Initialize session with a connection pool that is bounded by the
+        # number of concurrent jobs, as connections are reused across jobs
+        self.session = requests.Session()
+        self.session.headers["User-Agent"] = user_agent
+        adapter = HTTPAdapter(
+            pool_connections = self.config.concurrency,
+            pool_maxsize = self.config.concurrency
+        )
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+        # Load cache manifest, mapping external assets to files in the cache
+        # directory together with the validators for revalidation
+        self.manifest: dict[str, dict] = {}
+        path = os.path.join(self.config.cache_dir, "manifest.json")
+        if os.path.isfile(path):
+            try:
+                with open(path, encoding = "utf-8") as f:
+                    self.manifest = json.load(f)
+            except ValueError:
+                log.debug(f"Ignoring invalid cache manifest: {path}")
+
         # Initialize collections of external assets
         self.assets = Files([])
         self.assets_expr_map = {
@@ -89,7 +121,7 @@ class PrivacyPlugin(BasePlugin[PrivacyConfig]):
             # downloaded. Create and enqueue a job for each external asset.
             for url in self._parse_media(initiator):
                 if not self._is_excluded(url, initiator):
-                    file = self._queue(url, config, concurrent = True)
+                    file = self._queue(url, config, initiator)
 
                     # If site URL is not given, ensure that Mermaid.js is always
                     # present. This is a special case, as Material for MkDocs
@@ -103,14 +135,15 @@ class PrivacyPlugin(BasePlugin[PrivacyConfig]):
             # The local asset references at least one external asset, which
             # means we must download and replace them later
             if file:
-                self.assets.append(initiator)
+                with self.lock:
+                    self.assets.append(initiator)
                 files.remove(initiator)
 
         # Process external style sheet files
         for path in config.extra_css:
             url = urlparse(path)
             if not self._is_excluded(url):
-                self._queue(url, config, concurrent = True)
+                self._queue(url, config)
 
         # Process external script files
         for script in config.extra_javascript:
@@ -120,7 +153,7 @@ class PrivacyPlugin(BasePlugin[PrivacyConfig]):
             # Enqueue a job if the script needs to downloaded
             url = urlparse(script.path)
             if not self._is_excluded(url):
-                self._queue(url, config, concurrent = True)
+                self._queue(url, config)
 
     # Process external images in page (run latest) - this stage is the earliest
     # we can start processing external images, since images are the most common
@@ -136,16 +169,14 @@ class PrivacyPlugin(BasePlugin[PrivacyConfig]):
             return
 
         # Find all external images and download them if not excluded
-        for match in re.findall(
-            r"<img[^>]+src=['\"]?http[^>]+>",
-            html, flags = re.I | re.M
-        ):
-            el = self._parse_fragment(match)
+        for tag in iter_tags(html, {"img"}):
+            if "src" not in tag.attrs:
+                continue
 
             # Create and enqueue job to fetch external image
-            url = urlparse(el.get("src"))
+            url = urlparse(tag.get("src"))
             if not self._is_excluded(url, page.file):
-                self._queue(url, config, concurrent = True)
+                self._queue(url, config, page.file)
 
     # Sync all concurrent jobs
     def on_env(self, env, *, config, files):
@@ -153,7 +184,7 @@ class PrivacyPlugin(BasePlugin[PrivacyConfig]):
             return
 
         # Wait until all jobs until now are finished
-        wait(self.pool_jobs)
+        self._wait()
 
     # Process external assets in template (run later)
     @event_priority(-50)
@@ -186,7 +217,7 @@ class PrivacyPlugin(BasePlugin[PrivacyConfig]):
 
         # Reconcile concurrent jobs and clear thread pool, as we will reuse the
         # same thread pool for patching all links to external assets
-        wait(self.pool_jobs)
+        self._wait()
         self.pool_jobs.clear()
 
         # Spawn concurrent job to patch all links to dependent external asset
@@ -206,6 +237,32 @@ class PrivacyPlugin(BasePlugin[PrivacyConfig]):
         # in the build process always have a consistent state to work with
         wait(self.pool_jobs)
         self.pool.shutdown()
+        self.session.close()
+
+        # Persist cache manifest for subsequent builds
+        if self.manifest:
+            self._save_to_file(
+                os.path.join(self.config.cache_dir, "manifest.json"),
+                json.dumps(self.manifest, indent = 2, sort_keys = True)
+            )
+
+    # -------------------------------------------------------------------------
+
+    # Wait until all concurrent jobs are finished - jobs might spawn further
+    # jobs for dependent external assets, e.g., fonts referenced in style
+    # sheets, which are resolved level by level until no new jobs appear
+    def _wait(self):
+        while True:
+            jobs = [job for job in self.pool_jobs if not job.done()]
+            if not jobs:
+                break
+
+            # Wait for current level of jobs
+            wait(jobs)
+
+        # Raise errors of failed jobs
+        for job in self.pool_jobs:
+            job.result()
 
     # -------------------------------------------------------------------------
 
@@ -242,25 +299,6 @@ class PrivacyPlugin(BasePlugin[PrivacyConfig]):
 
     # -------------------------------------------------------------------------
 
-    # Parse a fragment
-    def _parse_fragment(self, fragment: str):
-        parser = FragmentParser()
-        parser.feed(fragment)
-        parser.close()
-
-        # Check parse result and return element
-        if isinstance(parser.result, Element):
-            return parser.result
-
-        # Otherwise, raise a plugin error - if the author accidentally used
-        # invalid HTML inside of the tag, e.g., forget a opening or closing
-        # quote, we need to catch this here, as we're using pretty basic
-        # regular expression based extraction
-        raise PluginError(
-            f"Could not parse due to possible syntax error in HTML: \n\n"
-            + fragment
-        )
-
     # Parse and extract all external assets from a media file using a preset
     # regular expression, and return all URLs found.
     def _parse_media(self, initiator: File) -> list[URL]:
@@ -285,6 +323,10 @@ class PrivacyPlugin(BasePlugin[PrivacyConfig]):
     # still exist external assets that were added by third-party plugins.
     def _parse_html(self, output: str, initiator: File, config: MkDocsConfig):
 
+        # Skip documents without any external links
+        if "http" not in output:
+            return output
+
         # Resolve callback
         def resolve(file: File):
             if is_error_template(initiator.src_uri):
@@ -293,178 +335,233 @@ class PrivacyPlugin(BasePlugin[PrivacyConfig]):
             else:
                 return file.url_relative_to(initiator)
 
-        # Replace callback
-        def replace(match: Match):
-            el = self._parse_fragment(match.group())
+        # Collect all replacements in a single pass over the document, as
+        # tuples of start and end of the span to replace, and the URL of the
+        # external asset, or nothing if the span should be removed
+        replacements: list[tuple[int, int, str | None]] = []
+        for tag in iter_tags(output, {"link", "script", "img", "image"}):
+            name = "src" if tag.name in ("script", "img") else "href"
+            if name not in tag.spans:
+                continue
+
+            # Skip tags that don't reference an external asset
+            value = tag.get(name)
+            if value.partition("#")[0] not in self.files:
+                if self._is_excluded(urlparse(value), initiator):
+                    continue
 
             # Handle external style sheet or preconnect hint
-            if el.tag == "link":
-                url = urlparse(el.get("href"))
-                if not self._is_excluded(url, initiator):
-                    rel = el.get("rel", "")
-
-                    # Replace external preconnect hint
-                    if rel == "preconnect":
-                        return ""
-
-                    # Replace external favicon, preload hint or style sheet
-                    if rel in ("icon", "preload", "stylesheet"):
-                        file = self._queue(url, config)
-                        el.set("href", resolve(file))
-
-            # Handle external script or image
-            if el.tag == "script" or el.tag == "img":
-                url = urlparse(el.get("src"))
-                if not self._is_excluded(url, initiator):
-                    file = self._queue(url, config)
-                    el.set("src", resolve(file))
-
-            # Handle external image in SVG
-            if el.tag == "image":
-                url = urlparse(el.get("href"))
-                if not self._is_excluded(url, initiator):
-                    file = self._queue(url, config)
-                    el.set("href", resolve(file))
+            if tag.name == "link":
+                rel = tag.get("rel", "")
+
+                # Remove external preconnect hint
+                if rel == "preconnect":
+                    replacements.append((tag.start, tag.end, None))
+                    continue
+
+                # Skip everything but favicons, preload hints and style sheets
+                if rel not in ("icon", "preload", "stylesheet"):
+                    continue
+
+            # Replace external favicon, preload hint, style sheet, script,
+            # image or image in SVG
+            start, end = tag.spans[name]
+            replacements.append((start, end, value))
+
+        # Enqueue jobs for all external assets that were not fetched yet, which
+        # were most likely added by third-party plugins, so they are fetched
+        # concurrently, and not one after another
+        jobs: dict[str, Future] = {}
+        for _, _, value in replacements:
+            if not value:
+                continue
+
+            # Map URLs without hash fragments, as they reference the same file
+            key, _, _ = value.partition("#")
+            if key not in self.files and key not in jobs:
+                jobs[key] = self._queue(urlparse(key), config, initiator)
+
+        # Wait for jobs, and map URLs to files
+        for key, job in jobs.items():
+            self.files[key] = job.result()
+
+        # Splice replacements into the document
+        parts: list[str] = []
+        offset = 0
+        for start, end, value in replacements:
+            parts.append(output[offset:start])
+            if value:
+                key, _, fragment = value.partition("#")
+                url = resolve(self.files[key])
+
+                # If the URL of the external asset includes a hash fragment,
+                # retain it, e.g., for dark/light images - see https://t.ly/7b16Y
+                if fragment:
+                    url += f"#{fragment}"
+
+                # Switch external asset URL to local path, and quote it if the
+                # attribute value was not quoted, as the path might be spaced
+                if output[start - 1] in "\"'":
+                    parts.append(escape(url))
+                else:
+                    parts.append(f"\"{escape(url)}\"")
 
-            # Return element as string
-            return self._print(el)
+            # Continue after replaced span
+            offset = end
 
-        # Find and replace all external asset URLs in current page
-        return re.sub(
-            r"<(?:(?:a|link|image)[^>]+href|(?:script|img)[^>]+src)=['\"]?http[^>]+>",
-            replace, output, flags = re.I | re.M
-        )
+        # Return document with replacements
+        parts.append(output[offset:])
+        return "".join(parts)
 
     # -------------------------------------------------------------------------
 
-    # Print element as string - what could possibly go wrong? We're parsing
-    # HTML5 with an XML parser, and XML doesn't allow for boolean attributes,
-    # which is why we must add a dummy value to all attributes that are not
-    # strings before printing the element as string.
-    def _print(self, el: Element):
-        temp = "__temp__"
-        for name in el.attrib:
-            if not isinstance(el.attrib[name], str):
-                el.attrib[name] = temp
-
-        # Return void or opening tag as string, strip closing tag
-        data = tostring(el, encoding = "unicode")
-        return data.replace(" />", ">").replace(f"=\"{temp}\"", "")
-
-    # Enqueue external asset for download, if not already done
-    def _queue(self, url: URL, config: MkDocsConfig, concurrent = False):
+    # Enqueue external asset for download, if not already done - the initiator
+    # is the file referencing the external asset, if any, for error reporting
+    def _queue(
+        self, url: URL, config: MkDocsConfig, initiator: File | None = None
+    ):
         path = self._path_from_url(url)
         full = posixpath.join(self.config.assets_fetch_dir, path)
 
-        # Try to retrieve existing file
-        file = self.assets.get_file_from_path(full)
-        if not file:
-
-            # Compute path to external asset, which is sourced from the cache
-            # directory, and generate file to register it with MkDocs as soon
-            # as it was downloaded. This allows other plugins to apply
-            # additional processing.
-            file = self._path_to_file(path, config)
-            file.url = url.geturl()
-
-            # Spawn concurrent job to fetch external asset if the extension is
-            # known and the concurrent flag is set. In that case, this function
-            # is called in a context where no replacements are carried out, so
-            # the caller must only ensure to reconcile the concurrent jobs.
-            _, extension = posixpath.splitext(url.path)
-            if extension and concurrent:
-                self.pool_jobs.append(self.pool.submit(
-                    self._fetch, file, config
-                ))
+        # Try to retrieve existing job - jobs are keyed by path, so that every
+        # external asset is only fetched once, even when it's referenced from
+        # several concurrent jobs at the same time
+        with self.lock:
+            job = self.jobs.get(full)
+            if not job:
+
+                # Compute path to external asset, which is sourced from the
+                # cache directory, and generate file to register it with MkDocs
+                # as soon as it was downloaded. This allows other plugins to
+                # apply additional processing.
+                file = self._path_to_file(path, config)
+                file.url = url.geturl()
+
+                # Spawn concurrent job to fetch external asset - callers that
+                # need the file wait for the job, all others must only ensure
+                # to reconcile the concurrent jobs. This also holds for assets
+                # without extension, as the job resolves to the file with the
+                # extension determined after downloading.
+                job = self.pool.submit(self._fetch, file, config, initiator)
+                self.pool_jobs.append(job)
+
+                # Register job
+                self.jobs[full] = job
+
+        # Return job
+        return job
 
-            # Fetch external asset synchronously, as it either has no extension
-            # or is fetched from a context in which replacements are done
-            else:
-                self._fetch(file, config)
+    # Fetch external asset referenced through the given file
+    def _fetch(
+        self, file: File, config: MkDocsConfig, initiator: File | None = None
+    ):
+        base = os.path.abspath(self.config.cache_dir)
+        entry = self.manifest.get(file.src_uri, {})
+
+        # Resolve cached external asset, if any
+        path = file.abs_src_path
+        if "path" in entry:
+            path = os.path.join(base, entry["path"])
+
+        # Check if external asset needs to be downloaded or revalidated
+        cached = "path" in entry and os.path.isfile(path)
+        if not cached or not self.config.cache:
+            res = self._download(file.url, entry if cached else {}, initiator)
+
+            # External asset was modified (or never downloaded)
+            if res:
+                headers, content = res
+                path = file.abs_src_path
+
+                # Compute expected file extension and append if missing
+                mime = headers.get("content-type", "").split(";")[0]
+                extension = extensions.get(mime)
+                if extension and not path.endswith(extension):
+                    path += extension
+
+                # Save to file and remember validators for revalidation
+                self._save_to_file(path, content)
+                with self.lock:
+                    self.manifest[file.src_uri] = {
+                        "path": os.path.relpath(path, base).replace(os.sep, "/"),
+                        "etag": headers.get("etag"),
+                        "last_modified": headers.get("last-modified")
+                    }
+
+        # Point file to external asset in cache directory, and append the file
+        # extension to the destination if it was not part of the URL
+        file.abs_src_path = path
+        _, extension = os.path.splitext(path)
+        if not file.abs_dest_path.endswith(extension):
+            file.src_uri += extension
+
+            # Compute destination file system path
+            file.dest_uri += extension
+            file.abs_dest_path += extension
+
+        # Compute destination URL
+        file.url = file.dest_uri
 
-            # Register external asset as file - it might have already been
-            # registered, and since MkDocs 1.6, trigger a deprecation warning
+        # Register external asset as file
+        with self.lock:
             if not self.assets.get_file_from_path(file.src_uri):
                 self.assets.append(file)
 
-        # If the URL of the external asset includes a hash fragment, add it to
-        # the returned file, e.g. for dark/light images - see https://t.ly/7b16Y
-        if url.fragment:
-            file.url += f"#{url.fragment}"
+        # Parse and enqueue dependent external assets
+        for url in self._parse_media(file):
+            if not self._is_excluded(url, file):
+                self._queue(url, config, file)
 
-        # Return file associated with external asset
+        # Return file
         return file
 
-    # Fetch external asset referenced through the given file
-    def _fetch(self, file: File, config: MkDocsConfig):
-
-        # Check if external asset needs to be downloaded
-        if not os.path.isfile(file.abs_src_path) or not self.config.cache:
-            path = file.abs_src_path
-
-            # Download external asset
-            log.info(f"Downloading external file: {file.url}")
-            res = requests.get(file.url, headers = {
-
-                # Set user agent explicitly, so Google Fonts gives us *.woff2
-                # files, which according to caniuse.com is the only format we
-                # need to download as it covers the entire range of browsers
-                # we're officially supporting.
-                "User-Agent": " ".join([
-                    "Mozilla/5.0 (Windows NT 10.0; Win64; x64)",
-                    "AppleWebKit/537.36 (KHTML, like Gecko)",
-                    "Chrome/98.0.4758.102 Safari/537.36"
-                ])
-            })
-
-            # Compute expected file extension and append if missing
-            mime = res.headers["content-type"].split(";")[0]
-            extension = extensions.get(mime)
-            if extension and not path.endswith(extension):
-                path += extension
-
-            # Save to file and create symlink if no extension was present
-            self._save_to_file(path, res.content)
-            if path != file.abs_src_path:
-
-                # Creating symlinks might fail on Windows. Thus, we just print
-                # a warning and continue - see https://bit.ly/3xYFzcZ
-                try:
-                    os.symlink(os.path.basename(path), file.abs_src_path)
-                except OSError as e:
-                    if e.errno != errno.EEXIST:
-                        log.warning(
-                            f"Couldn't create symbolic link: {file.src_uri}"
+    # Download external asset, revalidating it with the given validators, if
+    # any - returns nothing if the external asset was not modified
+    def _download(self, url: str, entry: dict, initiator: File | None = None):
+        source = initiator.src_uri if initiator else "mkdocs.yml"
+        headers = {}
+        if entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+
+        # Download external asset, streaming the response, so downloads that
+        # exceed the maximum size can be aborted early
+        log.info(f"Downloading external file: {url}")
+        try:
+            with self.session.get(
+                url, headers = headers, stream = True,
+                timeout = self.config.assets_fetch_timeout
+            ) as res:
+                if res.status_code == 304:
+                    log.debug(f"External file not modified: {url}")
+                    return None
+
+                # Ensure that the download succeeded, so error pages are not
+                # cached as external assets
+                res.raise_for_status()
+
+                # Read content, ensuring it doesn't exceed the maximum size
+                content = bytearray()
+                for chunk in res.iter_content(chunk_size = 64 * 1024):
+                    content += chunk
+                    if len(content) > self.config.assets_fetch_max_size:
+                        raise PluginError(
+                            f"External file exceeds maximum size of "
+                            f"{self.config.assets_fetch_max_size} bytes: {url} "
+                            f"(referenced in '{source}')"
                         )
 
-                    # Fall back for when the symlink could not be created. This
-                    # means that the plugin will download the original file on
-                    # every build, as the content type cannot be resolved from
-                    # the file extension.
-                    file.abs_src_path = path
-
-        # Resolve destination if file points to a symlink
-        _, extension = os.path.splitext(file.abs_src_path)
-        if os.path.isfile(file.abs_src_path):
-            file.abs_src_path = os.path.realpath(file.abs_src_path)
-            _, extension = os.path.splitext(file.abs_src_path)
+                # Return headers and content
+                return res.headers, bytes(content)
 
-            # If the symlink could not be created, we already set the correct
-            # extension, so we need to make sure not to append it again
-            if not file.abs_dest_path.endswith(extension):
-                file.src_uri += extension
-
-                # Compute destination file system path
-                file.dest_uri += extension
-                file.abs_dest_path += extension
-
-        # Compute destination URL
-        file.url = file.dest_uri
-
-        # Parse and enqueue dependent external assets
-        for url in self._parse_media(file):
-            if not self._is_excluded(url, file):
-                self._queue(url, config, concurrent = True)
+        # Report failed downloads (HTTP errors, timeouts, connection errors)
+        # together with the file that referenced the external asset
+        except requests.exceptions.RequestException as e:
+            raise PluginError(
+                f"Couldn't download external file: {url} "
+                f"(referenced in '{source}'): {e}"
+            ) from e
 
     # Patch all links to external assets in the given file
     def _patch(self, initiator: File):
@@ -478,14 +575,11 @@ class PrivacyPlugin(BasePlugin[PrivacyConfig]):
                 path = self._path_from_url(urlparse(value))
                 full = posixpath.join(self.config.assets_fetch_dir, path)
 
-                # Try to retrieve existing file
-                file = self.assets.get_file_from_path(full)
-                if not file:
-                    name = os.readlink(os.path.join(self.config.cache_dir, full))
-                    full = posixpath.join(posixpath.dirname(full), name)
-
-                    # Try again after resolving symlink
-                    file = self.assets.get_file_from_path(full)
+                # Retrieve file from job - the file's path might differ from
+                # the URL's path, e.g., if the extension was appended
+                file = None
+                if full in self.jobs:
+                    file = self.jobs[full].result()
 
                 # This can theoretically never happen, as we're sure that we
                 # only replace files that we successfully extracted. However,
@@ -567,6 +661,15 @@ class PrivacyPlugin(BasePlugin[PrivacyConfig]):
 # Set up logging
 log = logging.getLogger("mkdocs.material.privacy")
 
+# User agent - set explicitly, so Google Fonts gives us *.woff2 files, which
+# according to caniuse.com is the only format we need to download as it covers
+# the entire range of browsers we're officially supporting.
+user_agent = " ".join([
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64)",
+    "AppleWebKit/537.36 (KHTML, like Gecko)",
+    "Chrome/98.0.4758.102 Safari/537.36"
+])
+
 # Expected file extensions
 extensions = {
     "application/javascript": ".js",
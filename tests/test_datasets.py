@@ -0,0 +1,66 @@
+"""
+Execução dos planos preguiçosos de `govhub.datasets`.
+
+Um plano filtrado nunca pode devolver linhas sem o filtro aplicado: colunas
+ausentes do arquivo são um erro, não um filtro ignorado.
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("pandas")
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from govhub import datasets  # noqa: E402
+from govhub.datasets import col  # noqa: E402
+
+SAMPLE_CSV = (
+    "codigo_ug,orgao,numero_empenho,valor_empenhado\n"
+    "153978,26000,2024NE000001,1500.5\n"
+    "170013,25000,2024NE000002,320.0\n"
+    "153978,26000,2024NE000003,99.9\n"
+)
+
+PORTAL_CSV = (
+    '"Código Empenho";"Código Unidade Gestora";"Valor Empenhado (R$)"\n'
+    '"2024NE000001";"153978";"1.500,50"\n'
+    '"2024NE000002";"170013";"320,00"\n'
+)
+
+
+@pytest.fixture
+def raw_dir(tmp_path):
+    def write(content, encoding="utf-8"):
+        (tmp_path / "siafi_empenhos.csv").write_text(content, encoding=encoding)
+        return str(tmp_path)
+
+    return write
+
+
+def test_filter_and_select(raw_dir):
+    result = (
+        datasets.siafi(raw_dir(SAMPLE_CSV))
+        .filter(col("valor_empenhado") > 100)
+        .select("numero_empenho", "valor_empenhado")
+        .collect()
+    )
+
+    assert list(result.columns) == ["numero_empenho", "valor_empenhado"]
+    assert list(result["numero_empenho"]) == ["2024NE000001", "2024NE000002"]
+
+
+def test_filter_on_missing_column_raises(raw_dir):
+    dataset = datasets.siafi(raw_dir(PORTAL_CSV, "latin-1")).filter(codigo_ug="153978")
+
+    with pytest.raises(KeyError, match="codigo_ug"):
+        dataset.collect()
+
+
+def test_select_of_unknown_column_raises(raw_dir):
+    dataset = datasets.siafi(raw_dir(SAMPLE_CSV)).select("codigo_ug", "nome_ug")
+
+    with pytest.raises(KeyError, match="nome_ug"):
+        dataset.collect()
@@ -0,0 +1,71 @@
+"""
+Orçamento de tempo de importação da CLI do Gov-Hub.
+
+`govhub --help` e invocações curtas (cron) não devem carregar pandas,
+numpy nem requests; os módulos pesados só são importados pelo subcomando.
+"""
+
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+SRC_DIR = Path(__file__).resolve().parents[1] / "src"
+
+# Orçamento do import de govhub.cli (tempo cumulativo, em microssegundos)
+IMPORT_BUDGET_US = 100_000
+
+HEAVY_MODULES = ("pandas", "numpy", "requests")
+
+
+def _run(*args, cwd=None):
+    env = dict(os.environ, PYTHONPATH=str(SRC_DIR))
+    return subprocess.run(
+        [sys.executable, *args],
+        cwd=cwd,
+        env=env,
+        capture_output=True,
+        text=True,
+        timeout=60,
+    )
+
+
+def _import_times(module):
+    """Retorna {módulo: tempo cumulativo em µs} via `-X importtime`."""
+    result = _run("-X", "importtime", "-c", f"import {module}")
+    assert result.returncode == 0, result.stderr
+
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line[len("import time:") :].split("|")
+        try:
+            times[name.strip()] = int(cumulative)
+        except ValueError:
+            continue  # cabeçalho
+    return times
+
+
+def test_cli_import_skips_heavy_modules():
+    times = _import_times("govhub.cli")
+
+    loaded = [name for name in times if name.split(".")[0] in HEAVY_MODULES]
+    assert not loaded, f"govhub.cli importou módulos pesados: {loaded}"
+
+
+def test_cli_import_within_budget():
+    times = _import_times("govhub.cli")
+
+    assert times["govhub.cli"] < IMPORT_BUDGET_US, (
+        f"import govhub.cli levou {times['govhub.cli']} µs "
+        f"(orçamento: {IMPORT_BUDGET_US} µs)"
+    )
+
+
+def test_help_does_not_run_argless_command(tmp_path):
+    result = _run("-m", "govhub", "validate", "--help", cwd=tmp_path)
+
+    assert result.returncode == 0, result.stderr
+    assert "usage: govhub validate" in result.stdout
+    assert not (tmp_path / "validation_report.txt").exists()
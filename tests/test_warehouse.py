@@ -0,0 +1,80 @@
+"""
+Carga de CSVs do SIAFI no warehouse embarcado.
+
+Cobre os dois formatos de cabeçalho aceitos: o dos dados de exemplo gerados
+por `DataAcquisition` e o do Portal da Transparência.
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("pandas")
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from govhub.core.warehouse import WarehouseSink  # noqa: E402
+
+SAMPLE_CSV = (
+    "codigo_ug,orgao,gestao,numero_empenho,valor_empenhado,credor,data_empenho,funcao\n"
+    "153978,26000,00001,2024NE000001,1500.5,Fornecedor A,2024-01-15,Educação\n"
+    "170013,25000,00001,2024NE000002,320.0,Fornecedor B,2024-02-03,Saúde\n"
+)
+
+PORTAL_CSV = (
+    '"Código Empenho";"Código Unidade Gestora";"Nome Unidade Gestora";'
+    '"Código Órgão Superior";"Nome Órgão Superior";"Favorecido";'
+    '"Valor Empenhado (R$)"\n'
+    '"153978000012024NE000001";"153978";"UNIVERSIDADE FEDERAL";'
+    '"26000";"Ministério da Educação";"FORNECEDOR A";"1.500,50"\n'
+)
+
+DESPESAS_CSV = (
+    '"Código Unidade Gestora";"Código Órgão Superior";"Valor Liquidado (R$)"\n'
+    '"153978";"26000";"10,00"\n'
+    '"170013";"25000";"20,00"\n'
+)
+
+
+@pytest.fixture
+def sink(tmp_path):
+    with WarehouseSink(tmp_path / "warehouse.db") as sink:
+        yield sink
+
+
+@pytest.mark.parametrize(
+    "content, encoding", [(SAMPLE_CSV, "utf-8"), (PORTAL_CSV, "latin-1")]
+)
+def test_load_fills_ug_and_orgao(sink, tmp_path, content, encoding):
+    path = tmp_path / "empenhos.csv"
+    path.write_text(content, encoding=encoding)
+
+    assert sink.load_csv(path) == content.count("\n") - 1
+    missing = sink.query(
+        "SELECT COUNT(*) FROM empenhos "
+        "WHERE codigo_ug IS NULL OR codigo_orgao IS NULL OR numero_empenho IS NULL"
+    )
+    assert missing == [(0,)]
+
+
+def test_portal_names_are_loaded(sink, tmp_path):
+    path = tmp_path / "empenhos.csv"
+    path.write_text(PORTAL_CSV, encoding="latin-1")
+
+    sink.load_csv(path)
+
+    assert sink.query("SELECT nome_ug, nome_orgao FROM empenhos") == [
+        ("UNIVERSIDADE FEDERAL", "Ministério da Educação")
+    ]
+
+
+def test_file_without_empenho_numbers_fails(sink, tmp_path):
+    path = tmp_path / "despesas.csv"
+    path.write_text(DESPESAS_CSV, encoding="latin-1")
+
+    with pytest.raises(ValueError, match="número de empenho"):
+        sink.load_csv(path)
+
+    assert sink.rejected == {"despesas.csv": 2}
+    assert sink.query("SELECT COUNT(*) FROM cargas") == [(0,)]